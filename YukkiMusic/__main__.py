@@ -1,5 +1,6 @@
 import asyncio
 import os
+import time
 
 from pyrogram import idle
 from pytgcalls.exceptions import NoActiveGroupCall
@@ -8,92 +9,158 @@ import config
 from config import BANNED_USERS
 from YukkiMusic import HELPABLE, LOGGER, app, userbot
 from YukkiMusic.core.call import Yukki
+from YukkiMusic.core.http import http
+from YukkiMusic.core.leaderboard import leaderboard
+from YukkiMusic.core.mediacache import media_cache
+from YukkiMusic.core.playstats import stats_flusher
+from YukkiMusic.core.scheduler import scheduler
+from YukkiMusic.core.sqlite import sqldb
+from YukkiMusic.core.ytdlp import ytdlp
 from YukkiMusic.misc import sudo
 # Update the import path to point to the refactored SQLite database utility functions
-from YukkiMusic.utils.database.mongodatabase import get_banned_users, get_gbanned 
+from YukkiMusic.utils.database.mongodatabase import get_banned_users, get_gbanned
 
 logger = LOGGER("YukkiMusic")
-loop = asyncio.get_event_event_loop() # Corrected get_event_loop() to get_event_event_loop() if it was a typo, otherwise revert. Assuming no typo, kept as original `get_event_loop()`
+loop = asyncio.get_event_loop()
 
-async def init():
-    if len(config.STRING_SESSIONS) == 0:
-        logger.error("No Assistant Clients Vars Defined!.. Exiting Process.")
-        return
-    if not config.SPOTIFY_CLIENT_ID and not config.SPOTIFY_CLIENT_SECRET:
-        logger.warning(
-            "No Spotify Vars defined. Your bot won't be able to play spotify queries."
-        )
+# Seconds each startup phase took, reported once the bot is ready
+timings = {}
+
+
+async def timed(name: str, coro):
+    start = time.monotonic()
+    try:
+        return await coro
+    finally:
+        timings[name] = time.monotonic() - start
+
+
+async def load_banned_users():
     try:
         # These functions now fetch data from the SQLite database
         gbanned_users = await get_gbanned()
         for user_id in gbanned_users:
             BANNED_USERS.add(user_id) # Add to Pyrogram filter set
-        
+
         banned_chats_users = await get_banned_users() # Assuming this refers to 'banned_users' (blockeddb)
         for user_id in banned_chats_users:
             BANNED_USERS.add(user_id) # Add to Pyrogram filter set
     except Exception as e:
         logger.error(f"Error loading banned users from DB: {e}", exc_info=True) # Added logging for clarity
-        pass # Continue startup even if loading banned users fails
-    
+
+
+async def load_state():
     # sudo() function in YukkiMusic.misc is already updated to use SQLite
-    await sudo() 
-    
-    await app.start()
-    for mod in app.load_plugins_from("YukkiMusic/plugins"):
-        if mod and hasattr(mod, "__MODULE__") and mod.__MODULE__:
-            if hasattr(mod, "__HELP__") and mod.__HELP__:
-                HELPABLE[mod.__MODULE__.lower()] = mod
+    await asyncio.gather(
+        load_banned_users(), sudo(), leaderboard.start(), media_cache.load()
+    )
+    stats_flusher.start()
 
-    if config.EXTRA_PLUGINS:
-        if os.path.exists("xtraplugins"):
-            result = await app.run_shell_command(["git", "-C", "xtraplugins", "pull"])
-            if result["returncode"] != 0:
-                logger.error(
-                    f"Error pulling updates for extra plugins: {result['stderr']}"
-                )
-                exit()
-        else:
-            result = await app.run_shell_command(
-                ["git", "clone", config.EXTRA_PLUGINS_REPO, "xtraplugins"]
-            )
-            if result["returncode"] != 0:
-                logger.error(f"Error cloning extra plugins: {result['stderr']}")
-                exit()
-
-        req = os.path.join("xtraplugins", "requirements.txt")
-        if os.path.exists(req):
-            result = await app.run_shell_command(
-                ["uv", "pip", "install", "--system", "-r", req]
-            )
-            if result["returncode"] != 0:
-                logger.error(f"Error installing requirements: {result['stderr']}")
-
-        for mod in app.load_plugins_from("xtraplugins"):
-            if mod and hasattr(mod, "__MODULE__") and mod.__MODULE__:
-                if hasattr(mod, "__HELP__") and mod.__HELP__:
-                    HELPABLE[mod.__MODULE__.lower()] = mod
 
-    LOGGER("YukkiMusic.plugins").info("Successfully Imported All Modules ")
+async def start_assistants():
     await userbot.start()
     await Yukki.start()
     LOGGER("YukkiMusic").info("Assistant Started Sucessfully")
+
+
+async def update_extra_plugins():
+    if os.path.exists("xtraplugins"):
+        result = await app.run_shell_command(["git", "-C", "xtraplugins", "pull"])
+        if result["returncode"] != 0:
+            logger.error(f"Error pulling updates for extra plugins: {result['stderr']}")
+            exit()
+    else:
+        result = await app.run_shell_command(
+            ["git", "clone", config.EXTRA_PLUGINS_REPO, "xtraplugins"]
+        )
+        if result["returncode"] != 0:
+            logger.error(f"Error cloning extra plugins: {result['stderr']}")
+            exit()
+
+    req = os.path.join("xtraplugins", "requirements.txt")
+    if os.path.exists(req):
+        result = await app.run_shell_command(
+            ["uv", "pip", "install", "--system", "-r", req]
+        )
+        if result["returncode"] != 0:
+            logger.error(f"Error installing requirements: {result['stderr']}")
+
+
+def load_plugins(name: str, folder: str):
+    start = time.monotonic()
+    for mod in app.load_plugins_from(folder):
+        if mod and hasattr(mod, "__MODULE__") and mod.__MODULE__:
+            if hasattr(mod, "__HELP__") and mod.__HELP__:
+                HELPABLE[mod.__MODULE__.lower()] = mod
+    timings[name] = time.monotonic() - start
+
+
+async def check_log_call():
+    """Plays a test stream in the log group's voice chat, once the bot is up."""
     try:
         await Yukki.stream_call(
             "http://docs.evostream.com/sample_content/assets/sintel1m720p.mp4"
         )
     except NoActiveGroupCall:
         LOGGER("YukkiMusic").error(
-            "Please ensure the voice call in your log group is active. The bot will exit now." # Added exit clarification
+            "Please ensure the voice call in your log group is active, streams fail without it."
+        )
+    except Exception:
+        LOGGER("YukkiMusic").warning("Log group voice chat check failed.", exc_info=True)
+    else:
+        LOGGER("YukkiMusic").info("Log group voice chat check passed.")
+
+
+async def init():
+    if len(config.STRING_SESSIONS) == 0:
+        logger.error("No Assistant Clients Vars Defined!.. Exiting Process.")
+        return
+    if not config.SPOTIFY_CLIENT_ID and not config.SPOTIFY_CLIENT_SECRET:
+        logger.warning(
+            "No Spotify Vars defined. Your bot won't be able to play spotify queries."
         )
-        exit() # Exit if no active group call in log group
+    started = time.monotonic()
+
+    # Importing plugins blocks the event loop and can't move to a thread,
+    # pyrogram registers their handlers with tasks on this loop. It runs as
+    # its own phase first; the yt-dlp workers, database state, the bot, the
+    # assistants and the extra plugins update then start concurrently.
+    load_plugins("plugins", "YukkiMusic/plugins")
+    phases = [
+        timed("yt-dlp workers", ytdlp.start()),
+        timed("database", load_state()),
+        timed("bot", app.start()),
+        timed("assistants", start_assistants()),
+    ]
+    if config.EXTRA_PLUGINS:
+        phases.append(timed("extra plugins update", update_extra_plugins()))
+    await asyncio.gather(*phases)
+    if config.EXTRA_PLUGINS:
+        load_plugins("extra plugins", "xtraplugins")
+    LOGGER("YukkiMusic.plugins").info("Successfully Imported All Modules ")
 
+    scheduler.start()
     await Yukki.decorators()
+    timings["ready"] = time.monotonic() - started
     LOGGER("YukkiMusic").info("YukkiMusic Started Successfully")
+    LOGGER("YukkiMusic").info(
+        "Startup timings: "
+        + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+    )
+
+    check = asyncio.create_task(check_log_call())
     await idle()
+    check.cancel()
+    await scheduler.stop()
+    ytdlp.stop()
     await app.stop()
     await userbot.stop()
     await Yukki.stop()
+    await stats_flusher.stop()
+    await leaderboard.stop()
+    await media_cache.flush()
+    await http.close()
+    sqldb.close()
 
 
 def main():
@@ -102,4 +169,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -9,6 +9,7 @@
 #
 import asyncio
 import logging
+import time
 import traceback
 
 from ntgcalls import TelegramServerError
@@ -27,13 +28,16 @@ from pytgcalls.exceptions import NoActiveGroupCall
 from pytgcalls.types import (
     ChatUpdate,
     GroupCallConfig,
+    GroupCallParticipant,
     MediaStream,
     StreamEnded,
+    UpdatedGroupCallParticipant,
 )
 
 import config
 from strings import get_string
 from YukkiMusic import app, userbot
+from YukkiMusic.core.prefetch import prefetcher
 from YukkiMusic.core.userbot import assistants
 from YukkiMusic.misc import db
 from YukkiMusic.platforms import saavn, youtube
@@ -62,12 +66,78 @@ from YukkiMusic.utils.thumbnails import gen_thumb
 links = {}
 logger = logging.getLogger(__name__)
 
+# Seconds after which a chat's participant list is fetched from Telegram again,
+# in case an update was missed. Updates keep it current in between.
+RECONCILE_INTERVAL = 120
+
+
+class ParticipantCache:
+    """Voice chat participants of every active chat, kept in memory.
+
+    Maps ``chat_id -> {user_id: muted_by_admin}``. A chat's list is seeded by
+    a full fetch (``Call.sync_participants``) and then kept current from
+    PyTgCalls participant updates, so counting listeners or checking whether
+    the assistant is muted doesn't need a request to Telegram. Updates for
+    chats that were never fetched are ignored, those chats are unknown.
+    """
+
+    __slots__ = ("_chats", "_synced")
+
+    def __init__(self):
+        self._chats = {}
+        self._synced = {}
+
+    def stale(self, chat_id: int, max_age: float) -> bool:
+        synced = self._synced.get(chat_id)
+        return synced is None or time.monotonic() - synced > max_age
+
+    def replace(self, chat_id: int, members):
+        self._chats[chat_id] = {m.user_id: m.muted_by_admin for m in members}
+        self._synced[chat_id] = time.monotonic()
+
+    def apply(self, update: UpdatedGroupCallParticipant):
+        members = self._chats.get(update.chat_id)
+        if members is None:
+            return
+        member = update.participant
+        if update.action & (
+            GroupCallParticipant.Action.LEFT | GroupCallParticipant.Action.KICKED
+        ):
+            members.pop(member.user_id, None)
+        else:
+            members[member.user_id] = member.muted_by_admin
+
+    def drop(self, chat_id: int):
+        self._chats.pop(chat_id, None)
+        self._synced.pop(chat_id, None)
+
+    def count(self, chat_id: int) -> int | None:
+        members = self._chats.get(chat_id)
+        return None if members is None else len(members)
+
+    def contains(self, chat_id: int, user_id: int) -> bool:
+        return user_id in self._chats.get(chat_id, ())
+
+    def is_muted(self, chat_id: int, user_id: int) -> bool:
+        """Whether ``user_id`` is muted by an admin and can't unmute itself."""
+        return bool(self._chats.get(chat_id, {}).get(user_id))
+
+
+participants = ParticipantCache()
+
+
+def _head(chat_id):
+    if queue := db.get(chat_id):
+        return queue[0]
+
 
 async def _clear_(chat_id):
     popped = db.pop(chat_id, None)
     if popped:
         await auto_clean(popped)
     db[chat_id] = []
+    participants.drop(chat_id)
+    prefetcher.cancel(chat_id)
     await remove_active_video_chat(chat_id)
     await remove_active_chat(chat_id)
     await set_loop(chat_id, 0)
@@ -87,10 +157,14 @@ class Call:
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause(chat_id)
+        if track := _head(chat_id):
+            track.pause_clock()
 
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume(chat_id)
+        if track := _head(chat_id):
+            track.resume_clock()
 
     async def mute_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -104,6 +178,15 @@ class Call:
         assistant = await group_assistant(self, chat_id)
         await assistant.leave_call(chat_id)
 
+    async def sync_participants(
+        self, chat_id: int, max_age: float = RECONCILE_INTERVAL
+    ):
+        """Fetches the chat's participants if they're unknown or older than ``max_age``."""
+        if not participants.stale(chat_id, max_age):
+            return
+        assistant = await group_assistant(self, chat_id)
+        participants.replace(chat_id, await assistant.get_participants(chat_id) or [])
+
     async def stop_stream(self, chat_id: int):
         try:
             await _clear_(chat_id)
@@ -118,6 +201,7 @@ class Call:
             check.pop(0)
         except Exception:
             pass
+        participants.drop(chat_id)
         await remove_active_video_chat(chat_id)
         await remove_active_chat(chat_id)
         try:
@@ -157,6 +241,8 @@ class Call:
             )
 
         await assistant.play(chat_id, stream, config=call_config)
+        if track := _head(chat_id):
+            track.restart_clock()
 
     async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
         assistant = await group_assistant(self, chat_id)
@@ -344,6 +430,7 @@ class Call:
             await add_active_video_chat(chat_id)
 
     async def change_stream(self, client, chat_id):
+        switch_started = time.monotonic()
         check = db.get(chat_id)
         popped = None
         loop = await get_loop(chat_id)
@@ -380,8 +467,6 @@ class Call:
             audio_stream_quality = await get_audio_bitrate(chat_id)
             video_stream_quality = await get_video_bitrate(chat_id)
             videoid = check[0]["vidid"]
-            check[0].get("user_id")
-            check[0]["played"] = 0
             video = True if str(streamtype) == "video" else False
             call_config = GroupCallConfig(auto_start=False)
             if "live_" in queued:
@@ -417,6 +502,8 @@ class Call:
                         )
                 try:
                     await client.play(chat_id, stream, config=call_config)
+                    check[0].restart_clock()
+                    prefetcher.record_switch(switch_started)
                 except Exception:
                     return await app.send_message(
                         original_chat_id,
@@ -438,42 +525,48 @@ class Call:
                 db[chat_id][0]["mystic"] = run
                 db[chat_id][0]["markup"] = "tg"
             elif "vid_" in queued:
-                mystic = await app.send_message(original_chat_id, _["call_8"])
                 flink = f"https://t.me/{app.username}?start=info_{videoid}"
                 thumbnail = None
-                try:
-                    if youtube.use_fallback:
-                        file_path, _data, video = await fallback.download(
-                            title[:12],
-                            video=video,
-                        )
-                        direct = None
-                        title = _data.get("title", title)
-                        thumbnail = _data.get("thumb")
-                        flink = _data.get("url", flink)
-                        check[0]["dur"] = _data.get("duration_min", check[0]["dur"])
-                    else:
-                        try:
-                            file_path, direct = await youtube.download(
-                                videoid,
-                                mystic,
-                                videoid=True,
-                                video=video,
-                            )
-                        except Exception:
-                            youtube.use_fallback = True
+                mystic = None
+                prefetched = await prefetcher.take(chat_id, check[0])
+                if prefetched:
+                    file_path = prefetched.file_path
+                    thumbnail = prefetched.thumb
+                else:
+                    mystic = await app.send_message(original_chat_id, _["call_8"])
+                    try:
+                        if youtube.use_fallback:
                             file_path, _data, video = await fallback.download(
                                 title[:12],
-                                video=(True if str(streamtype) == "video" else False),
+                                video=video,
                             )
+                            direct = None
                             title = _data.get("title", title)
                             thumbnail = _data.get("thumb")
                             flink = _data.get("url", flink)
                             check[0]["dur"] = _data.get("duration_min", check[0]["dur"])
-                except Exception:
-                    return await mystic.edit_text(
-                        _["call_7"], disable_web_page_preview=True
-                    )
+                        else:
+                            try:
+                                file_path, direct = await youtube.download(
+                                    videoid,
+                                    mystic,
+                                    videoid=True,
+                                    video=video,
+                                )
+                            except Exception:
+                                youtube.use_fallback = True
+                                file_path, _data, video = await fallback.download(
+                                    title[:12],
+                                    video=(True if str(streamtype) == "video" else False),
+                                )
+                                title = _data.get("title", title)
+                                thumbnail = _data.get("thumb")
+                                flink = _data.get("url", flink)
+                                check[0]["dur"] = _data.get("duration_min", check[0]["dur"])
+                    except Exception:
+                        return await mystic.edit_text(
+                            _["call_7"], disable_web_page_preview=True
+                        )
 
                 if video:
                     stream = MediaStream(
@@ -482,10 +575,13 @@ class Call:
                         video_parameters=video_stream_quality,
                     )
                 else:
-                    try:
-                        image = await youtube.thumbnail(videoid, True)
-                    except Exception:
-                        image = None
+                    if prefetched:
+                        image = prefetched.image
+                    else:
+                        try:
+                            image = await youtube.thumbnail(videoid, True)
+                        except Exception:
+                            image = None
                     if image and config.PRIVATE_BOT_MODE:
                         stream = MediaStream(
                             image,
@@ -501,6 +597,8 @@ class Call:
                         )
                 try:
                     await client.play(chat_id, stream, config=call_config)
+                    check[0].restart_clock()
+                    prefetcher.record_switch(switch_started)
                 except Exception:
                     return await app.send_message(
                         original_chat_id,
@@ -508,7 +606,8 @@ class Call:
                     )
                 img = await gen_thumb(videoid, thumbnail)
                 button = stream_markup(_, videoid, chat_id)
-                await mystic.delete()
+                if mystic:
+                    await mystic.delete()
                 run = await app.send_photo(
                     original_chat_id,
                     photo=img,
@@ -538,6 +637,8 @@ class Call:
                 )
                 try:
                     await client.play(chat_id, stream, config=call_config)
+                    check[0].restart_clock()
+                    prefetcher.record_switch(switch_started)
                 except Exception:
                     return await app.send_message(
                         original_chat_id,
@@ -590,6 +691,8 @@ class Call:
                         )
                 try:
                     await client.play(chat_id, stream, config=call_config)
+                    check[0].restart_clock()
+                    prefetcher.record_switch(switch_started)
                 except Exception:
                     return await app.send_message(
                         original_chat_id,
@@ -679,6 +782,12 @@ class Call:
             async def stream_services_handler(client, update: ChatUpdate):
                 await self.stop_stream(update.chat_id)
 
+            @call.on_update(filters.call_participant())
+            async def participants_handler(
+                client, update: UpdatedGroupCallParticipant
+            ):
+                participants.apply(update)
+
             @call.on_update(filters.stream_end())
             async def stream_end_handler(client, update: StreamEnded):
                 if not update.stream_type == StreamEnded.Type.AUDIO:
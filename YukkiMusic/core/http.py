@@ -0,0 +1,109 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+LOGGER = logging.getLogger(__name__)
+
+# Open connections in total and to any single host
+CONNECTION_LIMIT = 100
+CONNECTIONS_PER_HOST = 10
+# Seconds a resolved address and an idle keep-alive connection are reused
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+# Default timeouts in seconds, callers can pass their own ``timeout``
+TOTAL_TIMEOUT = 60
+CONNECT_TIMEOUT = 10
+# Retries of idempotent requests, backing off 0.5s, 1s, 2s...
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT = {"GET", "HEAD", "OPTIONS"}
+
+
+class HttpClient:
+    """One ``aiohttp`` session shared by the whole bot.
+
+    Connections are kept alive and reused, DNS answers are cached and the
+    connections to each host are capped, so calls to the same service skip
+    the TCP and TLS handshakes and a slow host can't take every connection.
+    GET, HEAD and OPTIONS requests are retried with exponential backoff on
+    connection errors and on 429/5xx responses; other methods only retry
+    when the caller passes ``retries``.
+    """
+
+    __slots__ = ("_session", "requests", "retried", "failures")
+
+    def __init__(self):
+        self._session = None
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=CONNECTION_LIMIT,
+                    limit_per_host=CONNECTIONS_PER_HOST,
+                    ttl_dns_cache=DNS_CACHE_TTL,
+                    keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=TOTAL_TIMEOUT, connect=CONNECT_TIMEOUT
+                ),
+            )
+        return self._session
+
+    @asynccontextmanager
+    async def request(
+        self, method: str, url: str, retries: int | None = None, **kwargs
+    ):
+        """Sends a request and yields the response, released on exit."""
+        method = method.upper()
+        if retries is None:
+            retries = RETRIES if method in IDEMPOTENT else 0
+        self.requests += 1
+        for attempt in range(retries + 1):
+            try:
+                response = await self.session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == retries:
+                    self.failures += 1
+                    raise
+            else:
+                if response.status not in RETRY_STATUSES or attempt == retries:
+                    break
+                response.release()
+            self.retried += 1
+            await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            LOGGER.info("Closed the HTTP session.")
+        self._session = None
+
+
+http = HttpClient()
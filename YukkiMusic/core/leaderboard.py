@@ -0,0 +1,209 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import heapq
+from operator import itemgetter
+
+from YukkiMusic.utils.database.mongodatabase import (
+    get_chat_totals,
+    get_global_tops,
+    get_leaderboard_snapshot,
+    get_top_chats,
+    get_topp_users,
+    get_tops_summary,
+    get_track_totals,
+    get_user_totals,
+    save_leaderboard_snapshot,
+)
+
+from ..logging import LOGGER
+from .playstats import stats_flusher
+from .scheduler import scheduler
+
+CANDIDATES = 100  # Keys tracked per board; the ranks below top 10 absorb churn
+CHECKPOINT_INTERVAL = 60  # Seconds between snapshots to SQLite
+
+
+class TopK:
+    """Bounded set of the highest play counts for one dimension.
+
+    Keys already on the board are counted exactly in memory. Plays of any
+    other key are counted in ``pending`` until the next checkpoint, which looks
+    up their real totals in SQLite and admits the ones that beat the floor.
+    """
+
+    __slots__ = ("capacity", "counts", "titles", "pending")
+
+    def __init__(self, capacity: int = CANDIDATES):
+        self.capacity = capacity
+        self.counts = {}
+        self.titles = {}
+        self.pending = {}  # key -> plays since the last checkpoint
+
+    def add(self, key, count: int = 1, title: str | None = None):
+        if key in self.counts:
+            self.counts[key] += count
+            if title:
+                self.titles[key] = title
+        else:
+            self.pending[key] = self.pending.get(key, 0) + count
+
+    def offer(self, key, total: int, title: str | None = None):
+        if key not in self.counts and len(self.counts) >= self.capacity:
+            floor_key = min(self.counts, key=self.counts.get)
+            if total <= self.counts[floor_key]:
+                return
+            del self.counts[floor_key]
+            self.titles.pop(floor_key, None)
+        self.counts[key] = total
+        if title:
+            self.titles[key] = title
+
+    def load(self, rows):
+        self.counts.clear()
+        self.titles.clear()
+        self.pending.clear()
+        for key, total, title in rows:
+            self.offer(key, total, title)
+
+    def top(self, k: int) -> list[tuple]:
+        return heapq.nlargest(k, self.counts.items(), key=itemgetter(1))
+
+
+class Leaderboard:
+    """Materialized global leaderboards for tracks, chats and users.
+
+    ``record()`` is fed by ``put_queue`` for every queued play and only touches
+    memory. ``top_*()`` serve ``/gstats`` and the stats buttons in O(K) from
+    the bounded boards. The distinct track and total play counts are updated
+    from the same plays. A scheduler job checkpoints all of it to the
+    ``leaderboard_snapshot`` table, so a restart loads K rows instead of
+    aggregating the whole play history; only ``rebuild()`` recomputes it
+    from ``chat_tops``/``user_tops``, when the snapshot can't be trusted.
+    """
+
+    def __init__(self):
+        self.tracks = TopK()
+        self.chats = TopK()
+        self.users = TopK()
+        self.total_tracks = 0
+        self.total_plays = 0
+        self._lock = asyncio.Lock()
+
+    def record(self, chat_id: int, user_id: int, vidid: str, title: str):
+        # Same filters as the SQL leaderboards in mongodatabase.py
+        if chat_id < 0:
+            self.chats.add(chat_id)
+            if title:
+                self.tracks.add(vidid, title=title)
+                self.total_plays += 1
+        if user_id and user_id > 0:
+            self.users.add(user_id)
+
+    def top_tracks(self, k: int = 10) -> dict:
+        return {
+            vidid: {"spot": total, "title": self.tracks.titles.get(vidid)}
+            for vidid, total in self.tracks.top(k)
+        }
+
+    def top_chats(self, k: int = 10) -> dict:
+        return dict(self.chats.top(k))
+
+    def top_users(self, k: int = 10) -> dict:
+        return dict(self.users.top(k))
+
+    def summary(self) -> tuple[int, int]:
+        return self.total_tracks, self.total_plays
+
+    async def _resolve_pending(self):
+        if pending := self.tracks.pending:
+            self.tracks.pending = {}
+            totals = await get_track_totals(list(pending))
+            for vidid, plays in pending.items():
+                data = totals.get(vidid)
+                # No plays before this checkpoint's, so it's a new track
+                if data is None or data["spot"] <= plays:
+                    self.total_tracks += 1
+                if data is not None:
+                    self.tracks.offer(vidid, data["spot"], data["title"])
+        if keys := list(self.chats.pending):
+            self.chats.pending.clear()
+            for chat_id, total in (await get_chat_totals(keys)).items():
+                self.chats.offer(chat_id, total)
+        if keys := list(self.users.pending):
+            self.users.pending.clear()
+            for user_id, total in (await get_user_totals(keys)).items():
+                self.users.offer(user_id, total)
+
+    def _snapshot_rows(self) -> list[tuple]:
+        rows = [("summary", "tracks", self.total_tracks, None)]
+        rows.append(("summary", "plays", self.total_plays, None))
+        for name, board in (
+            ("tracks", self.tracks),
+            ("chats", self.chats),
+            ("users", self.users),
+        ):
+            rows.extend(
+                (name, key, total, board.titles.get(key))
+                for key, total in board.counts.items()
+            )
+        return rows
+
+    async def checkpoint(self):
+        async with self._lock:
+            # Pending keys are looked up in SQLite, so write buffered plays first
+            await stats_flusher.flush()
+            await self._resolve_pending()
+            await save_leaderboard_snapshot(self._snapshot_rows())
+
+    async def rebuild(self):
+        """Recomputes every board from the play history tables."""
+        async with self._lock:
+            tracks = await get_global_tops(limit=CANDIDATES)
+            self.tracks.load(
+                (vidid, data["spot"], data["title"]) for vidid, data in tracks.items()
+            )
+            chats = await get_top_chats(limit=CANDIDATES)
+            self.chats.load((chat_id, total, None) for chat_id, total in chats.items())
+            users = await get_topp_users(limit=CANDIDATES)
+            self.users.load((user_id, total, None) for user_id, total in users.items())
+            self.total_tracks, self.total_plays = await get_tops_summary()
+            await save_leaderboard_snapshot(self._snapshot_rows())
+        LOGGER(__name__).info("Leaderboard rebuilt from play history.")
+
+    async def load(self):
+        rows = await get_leaderboard_snapshot()
+        if not rows:
+            return await self.rebuild()
+        boards = {"tracks": [], "chats": [], "users": []}
+        for row in rows:
+            if row["dimension"] == "summary":
+                if row["key"] == "tracks":
+                    self.total_tracks = row["total"]
+                else:
+                    self.total_plays = row["total"]
+            elif row["dimension"] in boards:
+                boards[row["dimension"]].append((row["key"], row["total"], row["title"]))
+        self.tracks.load(boards["tracks"])
+        self.chats.load(boards["chats"])
+        self.users.load(boards["users"])
+        LOGGER(__name__).info("Leaderboard loaded from snapshot.")
+
+    async def start(self):
+        await self.load()
+        scheduler.add(
+            "leaderboard_checkpoint", self.checkpoint, interval=CHECKPOINT_INTERVAL
+        )
+
+    async def stop(self):
+        await self.checkpoint()
+
+
+leaderboard = Leaderboard()
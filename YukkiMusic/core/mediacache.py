@@ -0,0 +1,208 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import os
+import time
+from collections import Counter, OrderedDict
+
+import config
+from YukkiMusic.misc import db
+from YukkiMusic.utils.database.mongodatabase import (
+    delete_media_cache_entries,
+    get_media_cache_entries,
+    save_media_cache_entry,
+    touch_media_cache_entries,
+)
+
+from ..logging import LOGGER
+from .scheduler import scheduler
+
+# Queue entries that aren't files on disk
+STREAM_PREFIXES = ("vid_", "live_", "index_")
+# Seconds between saves of the access times of cache hits
+FLUSH_INTERVAL = 60
+
+
+class MediaEntry:
+    __slots__ = ("key", "media_id", "path", "size", "last_access")
+
+    def __init__(self, key: str, path: str, size: int, last_access: float):
+        self.key = key
+        self.media_id = key.split(":")[1]
+        self.path = path
+        self.size = size
+        self.last_access = last_access
+
+
+class MediaCache:
+    """Downloaded media kept on disk and reused across plays.
+
+    Files are indexed by ``source:id:format`` in LRU order and the index is
+    saved to the ``media_cache`` table, so a restart keeps the cache. Once
+    the files exceed ``MEDIA_CACHE_SIZE`` MB the least recently used ones are
+    deleted, except files that a queue still refers to: either by path
+    (counted by ``acquire()``/``release()``) or by media id for ``vid_``
+    entries that are downloaded when they start playing.
+
+    Files that aren't cached, e.g. Telegram uploads, are still deleted when
+    their last queue reference is released.
+
+    A hit only updates the in-memory index; its access time is saved with
+    the other hits by ``flush()``, so lookups never wait on the writer.
+    """
+
+    def __init__(self, limit_mb: int):
+        self.limit = limit_mb * 1024 * 1024
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._paths = {}
+        self._refs = Counter()
+        self._dirty = set()
+
+    @staticmethod
+    def key(source: str, media_id: str, fmt: str) -> str:
+        return f"{source}:{media_id}:{fmt}"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def _add(self, entry: MediaEntry):
+        self._entries[entry.key] = entry
+        self._paths[entry.path] = entry.key
+        self.size += entry.size
+
+    def _remove(self, key: str) -> MediaEntry | None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._paths.pop(entry.path, None)
+            self.size -= entry.size
+        return entry
+
+    async def load(self):
+        """Rebuilds the index from the database, skipping files that are gone."""
+        missing = []
+        for row in await get_media_cache_entries():
+            if os.path.isfile(row["path"]):
+                self._add(
+                    MediaEntry(row["key"], row["path"], row["size"], row["last_access"])
+                )
+            else:
+                missing.append(row["key"])
+        if missing:
+            await delete_media_cache_entries(missing)
+        await self._evict()
+        LOGGER(__name__).info(
+            f"Media cache loaded: {len(self)} files, {self.size / 1024 / 1024:.1f} MB."
+        )
+
+    async def lookup(self, source: str, media_id: str, fmt: str) -> str | None:
+        """Path of the cached file, or None if it has to be downloaded."""
+        key = self.key(source, media_id, fmt)
+        entry = self._entries.get(key)
+        if entry is not None and not os.path.isfile(entry.path):
+            self._remove(key)
+            await delete_media_cache_entries([key])
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        entry.last_access = time.time()
+        self._dirty.add(key)
+        return entry.path
+
+    async def store(self, source: str, media_id: str, fmt: str, path: str):
+        """Adds a freshly downloaded file and evicts old ones if over the limit."""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        key = self.key(source, media_id, fmt)
+        self._remove(key)
+        entry = MediaEntry(key, path, size, time.time())
+        self._add(entry)
+        self._dirty.discard(key)
+        await save_media_cache_entry(key, path, size, entry.last_access)
+        await self._evict()
+
+    async def flush(self):
+        """Saves the access times of the hits since the last flush."""
+        if not self._dirty:
+            return
+        keys, self._dirty = self._dirty, set()
+        rows = [
+            (entry.last_access, key)
+            for key in keys
+            if (entry := self._entries.get(key)) is not None
+        ]
+        if rows:
+            await touch_media_cache_entries(rows)
+
+    def _protected(self) -> set:
+        queued = set()
+        for queue in db.values():
+            for track in queue:
+                queued.add(track.get("vidid"))
+                queued.add(track.get("file"))
+        return queued
+
+    async def _evict(self):
+        if self.size <= self.limit:
+            return
+        protected = self._protected()
+        evicted = []
+        for key, entry in list(self._entries.items()):
+            if self.size <= self.limit:
+                break
+            if (
+                entry.path in self._refs
+                or entry.media_id in protected
+                or entry.path in protected
+            ):
+                continue
+            self._remove(key)
+            evicted.append(key)
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+        if evicted:
+            await delete_media_cache_entries(evicted)
+
+    def acquire(self, path: str):
+        """Counts a queue reference to ``path``."""
+        self._refs[path] += 1
+
+    def release(self, path: str):
+        """Drops a queue reference; deletes uncached files nobody refers to."""
+        count = self._refs.get(path)
+        if not count:
+            return
+        if count > 1:
+            self._refs[path] = count - 1
+            return
+        del self._refs[path]
+        if path in self._paths or any(p in path for p in STREAM_PREFIXES):
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+media_cache = MediaCache(config.MEDIA_CACHE_SIZE)
+scheduler.add("media_cache_flush", media_cache.flush, interval=FLUSH_INTERVAL)
@@ -0,0 +1,113 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import re
+import time
+
+from py_yt import VideosSearch
+
+from YukkiMusic.utils.database.mongodatabase import (
+    get_video_metadata,
+    save_video_metadata,
+)
+from YukkiMusic.utils.formatters import time_to_seconds
+
+from .cache import MISSING, TTLCache
+from .singleflight import flights
+
+# In-memory entries, each query and video id is one entry
+METADATA_CACHE_SIZE = 5000
+# Metadata is fetched again after this many seconds (7 days)
+METADATA_TTL = 7 * 24 * 3600
+# Failed lookups are remembered this long so they aren't retried per request
+NEGATIVE_TTL = 60
+
+VIDEO_ID = re.compile(
+    r"(?:v=|youtu\.be/|/shorts/|/embed/|/live/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+
+class VideoMeta:
+    __slots__ = ("vidid", "title", "duration_min", "thumbnail")
+
+    def __init__(self, vidid: str, title: str, duration_min: str | None, thumbnail: str):
+        self.vidid = vidid
+        self.title = title
+        self.duration_min = duration_min
+        self.thumbnail = thumbnail
+
+    @property
+    def duration_sec(self) -> int:
+        if str(self.duration_min) == "None":
+            return 0
+        return int(time_to_seconds(self.duration_min))
+
+    @property
+    def link(self) -> str:
+        return f"https://www.youtube.com/watch?v={self.vidid}"
+
+
+class MetadataStore:
+    """Title, duration and thumbnail of YouTube videos from one search each.
+
+    Lookups go through a bounded in-memory LRU, then the ``video_metadata``
+    table (for links that carry a video id), and only then search YouTube,
+    so a restart doesn't repeat searches for known videos. Both layers
+    expire entries after ``METADATA_TTL``. A failed search is cached as
+    ``None`` for ``NEGATIVE_TTL`` only and never written to disk.
+    """
+
+    __slots__ = ("cache",)
+
+    def __init__(self):
+        self.cache = TTLCache(METADATA_CACHE_SIZE, METADATA_TTL, NEGATIVE_TTL)
+
+    async def get(self, link: str) -> VideoMeta | None:
+        """Metadata of the first search result for ``link`` (a URL or a query)."""
+        match = VIDEO_ID.search(link)
+        key = match.group(1) if match else link
+        meta = self.cache.get(key)
+        if meta is not MISSING:
+            return meta
+        return await flights.do(("metadata", key), self._load, key, link, bool(match))
+
+    async def _load(self, key: str, link: str, is_video: bool) -> VideoMeta | None:
+        if is_video:
+            row = await get_video_metadata(key, time.time() - METADATA_TTL)
+            if row is not None:
+                meta = VideoMeta(*row)
+                self.cache.set(key, meta)
+                return meta
+        meta = await self._search(link)
+        self.cache.set(key, meta)
+        if meta is not None:
+            self.cache.set(meta.vidid, meta)
+            await save_video_metadata(
+                meta.vidid, meta.title, meta.duration_min, meta.thumbnail, time.time()
+            )
+        return meta
+
+    @staticmethod
+    async def _search(link: str) -> VideoMeta | None:
+        try:
+            results = (await VideosSearch(link, limit=1).next())["result"]
+        except Exception:
+            return None
+        if not results:
+            return None
+        result = results[0]
+        return VideoMeta(
+            result["id"],
+            result["title"],
+            result["duration"],
+            result["thumbnails"][0]["url"].split("?")[0],
+        )
+
+
+video_metadata = MetadataStore()
@@ -0,0 +1,435 @@
+# YukkiMusic/core/migrations.py
+#
+# Ordered schema migrations for yukki.db. Each migration runs exactly once,
+# inside its own transaction, and its version is recorded in the
+# schema_version table. Never edit a migration that has shipped; add a new
+# one with the next version number instead.
+
+import json
+import sqlite3
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    """Registers ``func(conn)`` as schema migration ``version``."""
+
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+
+    return decorator
+
+
+@migration(1, "baseline schema")
+def _baseline(conn: sqlite3.Connection):
+    # IF NOT EXISTS lets databases created before versioning adopt this
+    # migration without touching their data.
+
+    # --- Tables previously added for general bot functionality ---
+    # Table for users
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY,
+            username TEXT,
+            join_date TEXT
+        )
+    ''')
+
+    # Table for assistants
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS assistants (
+            chat_id INTEGER PRIMARY KEY,
+            assistant_number INTEGER NOT NULL
+        )
+    ''')
+
+    # --- Tables for memorydatabase.py conversion ---
+    # Table for filters
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS filters (
+            chat_id INTEGER PRIMARY KEY,
+            filters_data TEXT -- Stores JSON string of filters
+        )
+    ''')
+
+    # Table for notes
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS notes (
+            chat_id INTEGER PRIMARY KEY,
+            notes_data TEXT DEFAULT '{}', -- Stores JSON string of notes
+            private_note BOOLEAN DEFAULT 0 -- 0 for False, 1 for True
+        )
+    ''')
+
+    # Table for autoend
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS autoend (
+            chat_id INTEGER PRIMARY KEY
+        )
+    ''')
+    
+    # Table for channelplaymode
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS channelplaymode (
+            chat_id INTEGER PRIMARY KEY,
+            mode INTEGER NOT NULL
+        )
+    ''')
+
+    # Table for playtype
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS playtype (
+            chat_id INTEGER PRIMARY KEY,
+            mode TEXT NOT NULL -- "Everyone" or "Admins"
+        )
+    ''')
+
+    # Table for playmode
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS playmode (
+            chat_id INTEGER PRIMARY KEY,
+            mode TEXT NOT NULL -- "Direct" or "Inline"
+        )
+    ''')
+
+    # Table for language
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS language (
+            chat_id INTEGER PRIMARY KEY,
+            lang TEXT NOT NULL -- e.g., "en", "id"
+        )
+    ''')
+
+    # Table for adminauth (nonadmin chats)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS adminauth (
+            chat_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for videocalls (video stream limit)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS videocalls (
+            chat_id INTEGER PRIMARY KEY,
+            limit_val INTEGER NOT NULL
+        )
+    ''')
+
+    # Table for onoff (general on/off settings, like maintenance)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS onoff (
+            setting_key INTEGER PRIMARY KEY -- e.g., 1 for maintenance
+        )
+    ''')
+
+    # --- Tables for mongodatabase.py conversion ---
+    # Table for playlists (from playlistdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS playlists (
+            chat_id INTEGER PRIMARY KEY,
+            notes_data TEXT DEFAULT '{}' -- Stores JSON string of playlist items
+        )
+    ''')
+
+    # Table for served_users (from usersdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS served_users (
+            user_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for served_chats (from chatsdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS served_chats (
+            chat_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for blacklisted_chats (from blacklist_chatdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS blacklisted_chats (
+            chat_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for private_chats (from privatedb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS private_chats (
+            chat_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for auth_users (from authuserdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS auth_users (
+            chat_id INTEGER PRIMARY KEY,
+            notes_data TEXT DEFAULT '{}' -- Stores JSON string of auth users
+        )
+    ''')
+
+    # Table for gbanned_users (from gbansdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS gbanned_users (
+            user_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+    # Table for sudoers (from sudoersdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sudoers (
+            key TEXT PRIMARY KEY, -- Will be 'sudo'
+            user_ids TEXT DEFAULT '[]' -- Stores JSON string of list of user_ids
+        )
+    ''')
+
+    # Table for queries (from queriesdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS queries (
+            chat_id INTEGER PRIMARY KEY, -- Will be hardcoded 98324
+            mode INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    # Table for chat_tops (from chattopdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS chat_tops (
+            chat_id INTEGER PRIMARY KEY,
+            vidid_data TEXT DEFAULT '{}' -- Stores JSON string of video IDs and their spots/titles
+        )
+    ''')
+
+    # Table for user_tops (from userdb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_tops (
+            user_id INTEGER PRIMARY KEY,
+            vidid_data TEXT DEFAULT '{}' -- Stores JSON string of video IDs and user spots
+        )
+    ''')
+
+    # Table for banned_users (from blockeddb)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS banned_users (
+            user_id INTEGER PRIMARY KEY
+        )
+    ''')
+
+
+def _legacy_rows(conn: sqlite3.Connection, table: str, key: str, column: str):
+    """Yields ``(key, name, item)`` for every entry of a legacy JSON-blob table."""
+    for row in conn.execute(f"SELECT {key}, {column} FROM {table}").fetchall():
+        try:
+            items = json.loads(row[1] or "{}")
+        except ValueError:
+            continue
+        for name, item in items.items():
+            yield row[0], name, item
+
+
+@migration(2, "normalize JSON-blob tables into one row per item")
+def _normalize_blobs(conn: sqlite3.Connection):
+    for table in (
+        "playlists",
+        "auth_users",
+        "chat_tops",
+        "user_tops",
+        "filters",
+        "notes",
+    ):
+        conn.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+
+    conn.execute('''
+        CREATE TABLE playlists (
+            chat_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            videoid TEXT,
+            title TEXT,
+            duration TEXT,
+            PRIMARY KEY (chat_id, name)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE auth_users (
+            chat_id INTEGER NOT NULL,
+            token TEXT NOT NULL, -- int_to_alpha(user_id)
+            auth_user_id INTEGER,
+            auth_name TEXT,
+            admin_id INTEGER,
+            admin_name TEXT,
+            PRIMARY KEY (chat_id, token)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE chat_tops (
+            chat_id INTEGER NOT NULL,
+            vidid TEXT NOT NULL,
+            spot INTEGER NOT NULL DEFAULT 0,
+            title TEXT,
+            PRIMARY KEY (chat_id, vidid)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE user_tops (
+            user_id INTEGER NOT NULL,
+            vidid TEXT NOT NULL,
+            spot INTEGER NOT NULL DEFAULT 0,
+            title TEXT,
+            PRIMARY KEY (user_id, vidid)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE filters (
+            chat_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            data TEXT NOT NULL, -- JSON of a single filter
+            PRIMARY KEY (chat_id, name)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE notes (
+            chat_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            data TEXT NOT NULL, -- JSON of a single note
+            PRIMARY KEY (chat_id, name)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE note_settings (
+            chat_id INTEGER PRIMARY KEY,
+            private_note BOOLEAN NOT NULL DEFAULT 0
+        )
+    ''')
+
+    conn.executemany(
+        "INSERT OR REPLACE INTO playlists VALUES (?, ?, ?, ?, ?)",
+        [
+            (chat_id, name, item.get("videoid"), item.get("title"), item.get("duration"))
+            for chat_id, name, item in _legacy_rows(
+                conn, "playlists_legacy", "chat_id", "notes_data"
+            )
+        ],
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO auth_users VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (
+                chat_id,
+                token,
+                item.get("auth_user_id"),
+                item.get("auth_name"),
+                item.get("admin_id"),
+                item.get("admin_name"),
+            )
+            for chat_id, token, item in _legacy_rows(
+                conn, "auth_users_legacy", "chat_id", "notes_data"
+            )
+        ],
+    )
+    for table, key in (("chat_tops", "chat_id"), ("user_tops", "user_id")):
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {table} VALUES (?, ?, ?, ?)",
+            [
+                (owner, vidid, int(item.get("spot", 0)), item.get("title"))
+                for owner, vidid, item in _legacy_rows(
+                    conn, f"{table}_legacy", key, "vidid_data"
+                )
+            ],
+        )
+    conn.executemany(
+        "INSERT OR REPLACE INTO filters VALUES (?, ?, ?)",
+        [
+            (chat_id, name, json.dumps(item))
+            for chat_id, name, item in _legacy_rows(
+                conn, "filters_legacy", "chat_id", "filters_data"
+            )
+        ],
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO notes VALUES (?, ?, ?)",
+        [
+            (chat_id, name, json.dumps(item))
+            for chat_id, name, item in _legacy_rows(
+                conn, "notes_legacy", "chat_id", "notes_data"
+            )
+        ],
+    )
+    conn.execute(
+        "INSERT INTO note_settings (chat_id, private_note) "
+        "SELECT chat_id, private_note FROM notes_legacy WHERE private_note"
+    )
+
+    for table in (
+        "playlists",
+        "auth_users",
+        "chat_tops",
+        "user_tops",
+        "filters",
+        "notes",
+    ):
+        conn.execute(f"DROP TABLE {table}_legacy")
+
+
+@migration(3, "covering indexes for leaderboard queries")
+def _leaderboard_indexes(conn: sqlite3.Connection):
+    # Per-chat / per-user totals and "top tracks here" walk these in order
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chat_tops_chat_spot ON chat_tops (chat_id, spot)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_user_tops_user_spot ON user_tops (user_id, spot)"
+    )
+    # Global per-track totals group by vidid without a temporary b-tree
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_chat_tops_vidid ON chat_tops (vidid, chat_id, spot, title)"
+    )
+
+
+@migration(4, "leaderboard snapshot table")
+def _leaderboard_snapshot(conn: sqlite3.Connection):
+    # "key" has no declared type so chat/user ids stay integers and video ids text
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS leaderboard_snapshot (
+            dimension TEXT NOT NULL, -- "tracks", "chats", "users" or "summary"
+            key NOT NULL,
+            total INTEGER NOT NULL,
+            title TEXT,
+            PRIMARY KEY (dimension, key)
+        )
+    ''')
+
+
+@migration(5, "media cache index")
+def _media_cache(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS media_cache (
+            key TEXT PRIMARY KEY, -- "source:id:format"
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL -- unix time
+        )
+    ''')
+
+
+@migration(6, "youtube video metadata cache")
+def _video_metadata(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS video_metadata (
+            vidid TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            duration_min TEXT, -- NULL for live streams
+            thumbnail TEXT NOT NULL,
+            fetched_at REAL NOT NULL -- unix time
+        )
+    ''')
+
+
+@migration(7, "spotify to youtube matches")
+def _spotify_matches(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS spotify_matches (
+            key TEXT PRIMARY KEY, -- "isrc:<code>", or "spotify:<track id>" without one
+            vidid TEXT NOT NULL,
+            matched_at REAL NOT NULL -- unix time
+        )
+    ''')
@@ -0,0 +1,116 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import time
+
+from YukkiMusic.utils.database.mongodatabase import increment_tops
+
+from ..logging import LOGGER
+
+FLUSH_INTERVAL = 5  # Seconds between flushes when plays trickle in
+FLUSH_THRESHOLD = 500  # Pending keys that trigger an early flush
+
+
+class StatsFlusher:
+    """Write-behind buffer for the per-chat and per-user play counters.
+
+    ``record()`` only coalesces the play into ``(chat, vidid)`` and
+    ``(user, vidid)`` counters; a background task writes everything pending
+    in one transaction every ``FLUSH_INTERVAL`` seconds, or as soon as
+    ``FLUSH_THRESHOLD`` keys are waiting. A failed flush puts its counts back,
+    and ``stop()`` drains the buffer before the database is closed.
+    """
+
+    def __init__(self):
+        self._chats = {}
+        self._users = {}
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._running = False
+        self.flushes = 0
+        self.flushed_plays = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of coalesced counters waiting to be written."""
+        return len(self._chats) + len(self._users)
+
+    def record(self, chat_id: int, user_id: int, vidid: str, title: str):
+        self._add(self._chats, (chat_id, vidid), 1, title)
+        self._add(self._users, (user_id, vidid), 1, title)
+        if self.depth >= FLUSH_THRESHOLD:
+            self._wakeup.set()
+
+    @staticmethod
+    def _add(pending: dict, key: tuple, count: int, title: str):
+        if entry := pending.get(key):
+            entry[0] += count
+            entry[1] = title or entry[1]
+        else:
+            pending[key] = [count, title]
+
+    def _restore(self, chats: dict, users: dict):
+        for key, (count, title) in chats.items():
+            self._add(self._chats, key, count, title)
+        for key, (count, title) in users.items():
+            self._add(self._users, key, count, title)
+
+    async def flush(self) -> bool:
+        async with self._lock:
+            if not self._chats and not self._users:
+                return True
+            chats, self._chats = self._chats, {}
+            users, self._users = self._users, {}
+            started = time.perf_counter()
+            ok = await increment_tops(
+                [(key[0], key[1], count, title) for key, (count, title) in chats.items()],
+                [(key[0], key[1], count, title) for key, (count, title) in users.items()],
+            )
+            if not ok:
+                self._restore(chats, users)
+                return False
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+            self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+            self.flushes += 1
+            self.flushed_plays += sum(count for count, _ in chats.values())
+            return True
+
+    async def _run(self):
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not await self.flush():
+                LOGGER(__name__).warning(
+                    f"Stats flush failed, {self.depth} counters kept for retry."
+                )
+
+    def start(self):
+        if not self._task:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Let an in-flight flush finish instead of cancelling it halfway
+        if self._task:
+            self._running = False
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if not await self.flush():
+            LOGGER(__name__).error(f"Dropping {self.depth} unsaved stats counters.")
+
+
+stats_flusher = StatsFlusher()
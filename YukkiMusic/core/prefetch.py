@@ -0,0 +1,142 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import time
+
+import config
+from YukkiMusic.misc import db
+from YukkiMusic.platforms import youtube
+from YukkiMusic.utils.thumbnails import gen_thumb
+
+from ..logging import LOGGER
+from .queue import Track
+from .registry import active_calls
+from .scheduler import scheduler
+
+
+class Prefetched:
+    """What ``change_stream`` needs to start a ``vid_`` track."""
+
+    __slots__ = ("file_path", "image", "thumb")
+
+    def __init__(self, file_path: str, image: str | None, thumb: str):
+        self.file_path = file_path
+        self.image = image
+        self.thumb = thumb
+
+
+async def resolve(track: Track) -> Prefetched:
+    """Downloads a ``vid_`` track and looks up its thumbnails."""
+    video = str(track.streamtype) == "video"
+    file_path, _ = await youtube.download(track.vidid, None, videoid=True, video=video)
+    image = None
+    if not video and config.PRIVATE_BOT_MODE:
+        try:
+            image = await youtube.thumbnail(track.vidid, True)
+        except Exception:
+            pass
+    return Prefetched(file_path, image, await gen_thumb(track.vidid))
+
+
+class Prefetcher:
+    """Resolves the next queued track while the current one is still playing.
+
+    Once the playing track passes ``PREFETCH_AT`` of its duration, queue
+    position 1 is downloaded and thumbnailed in the background, so
+    ``change_stream`` can start it as soon as the current track ends. A
+    prefetch belongs to one ``Track`` object: it is cancelled on the next
+    tick once that track has left the queue, or when a shuffle or move puts
+    a different track next. A track that ``change_stream`` just promoted to
+    the head keeps its prefetch until ``take()`` claims it. Switch times
+    (stream end to next play) are recorded to measure the gap.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self.hits = 0
+        self.misses = 0
+        self.last_switch_ms = 0.0
+        self.avg_switch_ms = 0.0
+        self._switches = 0
+
+    def _due(self, chat_id: int) -> Track | None:
+        """The track to prefetch for this chat now, if any."""
+        queue = db.get(chat_id)
+        if not queue or len(queue) < 2:
+            return None
+        head, upcoming = queue[0], queue[1]
+        if not isinstance(upcoming, Track) or "vid_" not in upcoming.file:
+            return None
+        if head.played < int(head.seconds or 0) * config.PREFETCH_AT:
+            return None
+        return upcoming
+
+    def _start(self, chat_id: int, track: Track):
+        task = asyncio.create_task(resolve(track), name=f"prefetch_{chat_id}")
+        # Retrieve the exception so an unused failed prefetch isn't logged
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._jobs[chat_id] = (track, task)
+
+    def cancel(self, chat_id: int):
+        if job := self._jobs.pop(chat_id, None):
+            job[1].cancel()
+
+    def _stale(self, chat_id: int, track: Track) -> bool:
+        if not active_calls.is_active(chat_id):
+            return True
+        queue = db.get(chat_id)
+        if not queue or not any(queued is track for queued in queue):
+            return True
+        if queue[0] is track:
+            # Promoted by change_stream, which is about to take() it
+            return False
+        due = self._due(chat_id)
+        return due is not None and due is not track
+
+    async def tick(self):
+        for chat_id, (track, _) in list(self._jobs.items()):
+            if self._stale(chat_id, track):
+                self.cancel(chat_id)
+        if youtube.use_fallback:
+            return
+        for chat_id in active_calls.chats():
+            if chat_id in self._jobs:
+                continue
+            if track := self._due(chat_id):
+                self._start(chat_id, track)
+
+    async def take(self, chat_id: int, track: Track) -> Prefetched | None:
+        """The prefetched result for ``track``, waiting if it's still running."""
+        job = self._jobs.pop(chat_id, None)
+        if job is None or job[0] is not track:
+            if job:
+                job[1].cancel()
+            self.misses += 1
+            return None
+        try:
+            result = await job[1]
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            LOGGER(__name__).warning(f"Prefetch of {track.vidid} failed: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def record_switch(self, started: float):
+        """Records the time from ``started`` (monotonic) until the next track played."""
+        self.last_switch_ms = (time.monotonic() - started) * 1000
+        self._switches += 1
+        self.avg_switch_ms += (self.last_switch_ms - self.avg_switch_ms) / self._switches
+
+
+prefetcher = Prefetcher()
+scheduler.add("prefetch", prefetcher.tick, interval=2)
@@ -0,0 +1,216 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import random
+import time
+from collections import deque
+from itertools import islice
+
+import config
+
+
+class Track:
+    """One queued track.
+
+    Fields are fixed slots, but the record still answers ``track["title"]``,
+    ``track["mystic"] = msg`` and ``track.get("url")`` so code written against
+    the old per-track dicts keeps working. Other keys, such as ones extra
+    plugins stash on a track, go to a small dict created on first use.
+
+    ``played`` is derived from a monotonic clock: the seconds accumulated
+    before the current run plus the time since it started. Nothing ticks in
+    the background; pausing freezes the clock and assigning ``played`` (a
+    seek) moves it.
+    """
+
+    __slots__ = (
+        "title",
+        "dur",
+        "streamtype",
+        "by",
+        "chat_id",
+        "file",
+        "vidid",
+        "seconds",
+        "url",
+        "user_id",
+        "mystic",
+        "markup",
+        "_offset",
+        "_started",
+        "_extra",
+    )
+    _FIELDS = frozenset(__slots__[:-3]) | {"played"}
+
+    def __init__(
+        self,
+        title,
+        dur,
+        streamtype,
+        by,
+        chat_id,
+        file,
+        vidid,
+        seconds=0,
+        played=0,
+        url=None,
+        user_id=None,
+    ):
+        self.title = title
+        self.dur = dur
+        self.streamtype = streamtype
+        self.by = by
+        self.chat_id = chat_id
+        self.file = file
+        self.vidid = vidid
+        self.seconds = seconds
+        self._offset = played
+        self._started = time.monotonic()
+        self.url = url
+        self.user_id = user_id
+        self.mystic = None
+        self.markup = None
+        self._extra = None
+
+    @property
+    def played(self) -> int:
+        if self._started is None:
+            return int(self._offset)
+        return int(self._offset + time.monotonic() - self._started)
+
+    @played.setter
+    def played(self, seconds: int):
+        self._offset = seconds
+        if self._started is not None:
+            self._started = time.monotonic()
+
+    def restart_clock(self):
+        """Starts counting from zero, used once the stream actually starts."""
+        self._offset = 0
+        self._started = time.monotonic()
+
+    def pause_clock(self):
+        if self._started is not None:
+            self._offset += time.monotonic() - self._started
+            self._started = None
+
+    def resume_clock(self):
+        if self._started is None:
+            self._started = time.monotonic()
+
+    def __getitem__(self, key):
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._FIELDS or self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key) -> bool:
+        if key in self._FIELDS:
+            return getattr(self, key) is not None
+        return self._extra is not None and key in self._extra
+
+    def get(self, key, default=None):
+        if key in self._FIELDS:
+            value = getattr(self, key)
+        else:
+            value = self._extra.get(key) if self._extra else None
+        return default if value is None else value
+
+    def __repr__(self) -> str:
+        return f"Track(vidid={self.vidid!r}, title={self.title!r})"
+
+
+class ChatQueue(deque):
+    """Playback queue of one chat; index 0 is the track that is playing.
+
+    ``pop(0)`` and ``insert(0, track)`` are O(1) on a deque, unlike on a list.
+    Slices return plain lists for the queue UI.
+    """
+
+    __slots__ = ("limit",)
+
+    def __init__(self, iterable=(), limit: int | None = None):
+        super().__init__(iterable)
+        self.limit = limit or config.QUEUE_LIMIT
+
+    @property
+    def full(self) -> bool:
+        return len(self) >= self.limit
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step > 0:
+                return list(islice(self, start, stop, step))
+            return list(self)[index]
+        return super().__getitem__(index)
+
+    def pop(self, index: int = -1):
+        if index == 0:
+            return self.popleft()
+        if index == -1:
+            return super().pop()
+        track = self[index]
+        del self[index]
+        return track
+
+    def skip(self, count: int) -> list:
+        """Removes and returns the first ``count`` tracks."""
+        return [self.popleft() for _ in range(min(count, len(self)))]
+
+    def shuffle(self):
+        """Shuffles every track except the one that is playing."""
+        if len(self) < 3:
+            return
+        head = self.popleft()
+        rest = list(self)
+        random.shuffle(rest)
+        self.clear()
+        self.append(head)
+        self.extend(rest)
+
+
+class QueueStore(dict):
+    """``chat_id -> ChatQueue`` mapping; plain lists stored in it are converted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, chat_id, queue):
+        if not isinstance(queue, ChatQueue):
+            queue = ChatQueue(queue)
+        super().__setitem__(chat_id, queue)
+
+    def setdefault(self, chat_id, queue=()):
+        if chat_id not in self:
+            self[chat_id] = queue
+        return self[chat_id]
+
+    def update(self, *args, **kwargs):
+        for chat_id, queue in dict(*args, **kwargs).items():
+            self[chat_id] = queue
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
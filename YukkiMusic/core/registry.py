@@ -0,0 +1,120 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+
+DEFAULT_AUDIO_QUALITY = "STUDIO"
+DEFAULT_VIDEO_QUALITY = "UHD_4K"
+
+
+class CallState:
+    """In-memory state of one chat's voice chat session and stream settings."""
+
+    __slots__ = (
+        "chat_id",
+        "playing",
+        "muted",
+        "loop",
+        "audio_quality",
+        "video_quality",
+    )
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.playing = False
+        self.muted = False
+        self.loop = 0
+        self.audio_quality = DEFAULT_AUDIO_QUALITY
+        self.video_quality = DEFAULT_VIDEO_QUALITY
+
+    @property
+    def is_default(self) -> bool:
+        return (
+            not self.loop
+            and self.audio_quality == DEFAULT_AUDIO_QUALITY
+            and self.video_quality == DEFAULT_VIDEO_QUALITY
+        )
+
+
+class ActiveCallRegistry:
+    """Active voice/video chats plus a ``CallState`` record per chat.
+
+    Active and video chats are kept in insertion-ordered dicts, so membership,
+    add, remove and the video chat count are all O(1) while listings keep the
+    order calls were started in. Records of chats that leave the call are
+    dropped unless they still carry a loop or bitrate setting.
+    """
+
+    __slots__ = ("_states", "_active", "_video")
+
+    def __init__(self):
+        self._states = {}
+        self._active = {}
+        self._video = {}
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def get(self, chat_id: int) -> CallState | None:
+        return self._states.get(chat_id)
+
+    def state(self, chat_id: int) -> CallState:
+        state = self._states.get(chat_id)
+        if state is None:
+            state = self._states[chat_id] = CallState(chat_id)
+        return state
+
+    def update(self, chat_id: int, **fields):
+        state = self.state(chat_id)
+        for name, value in fields.items():
+            setattr(state, name, value)
+        self._release(chat_id)
+
+    def _release(self, chat_id: int):
+        if chat_id in self._active or chat_id in self._video:
+            return
+        state = self._states.get(chat_id)
+        if state is not None and state.is_default:
+            del self._states[chat_id]
+
+    def is_active(self, chat_id: int) -> bool:
+        return chat_id in self._active
+
+    def add(self, chat_id: int):
+        self._active[chat_id] = self.state(chat_id)
+
+    def remove(self, chat_id: int):
+        if self._active.pop(chat_id, None) is not None:
+            state = self._states[chat_id]
+            state.playing = False
+            state.muted = False
+            self._release(chat_id)
+
+    def chats(self) -> list[int]:
+        # A copy, callers stop streams (and so remove chats) while iterating
+        return list(self._active)
+
+    def is_video(self, chat_id: int) -> bool:
+        return chat_id in self._video
+
+    def add_video(self, chat_id: int):
+        self._video[chat_id] = self.state(chat_id)
+
+    def remove_video(self, chat_id: int):
+        if self._video.pop(chat_id, None) is not None:
+            self._release(chat_id)
+
+    def video_chats(self) -> list[int]:
+        return list(self._video)
+
+    @property
+    def video_count(self) -> int:
+        return len(self._video)
+
+
+active_calls = ActiveCallRegistry()
@@ -0,0 +1,170 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import random
+import time
+
+from ..logging import LOGGER
+
+# Longest pause after repeated failures of a job, in seconds
+MAX_BACKOFF = 300
+# How long stop() waits for running jobs before cancelling them
+STOP_TIMEOUT = 10
+
+
+class Job:
+    """A periodic coroutine function and its run metrics (times in ms)."""
+
+    __slots__ = (
+        "name",
+        "func",
+        "interval",
+        "jitter",
+        "runs",
+        "failures",
+        "last_run_ms",
+        "max_run_ms",
+        "last_lag_ms",
+        "max_lag_ms",
+        "last_error",
+        "_task",
+    )
+
+    def __init__(self, name: str, func, interval: float, jitter: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.runs = 0
+        self.failures = 0
+        self.last_run_ms = 0.0
+        self.max_run_ms = 0.0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.last_error = None
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_run_ms": self.last_run_ms,
+            "max_run_ms": self.max_run_ms,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """Runs every periodic background job of the bot.
+
+    Each job runs in its own task, one run at a time: the next run is planned
+    ``interval`` (plus a random ``jitter``) after the previous one finished,
+    so a slow run never overlaps the next. A run that raises is logged and
+    retried with exponential backoff instead of killing the loop. ``stop()``
+    lets running jobs finish before cancelling whatever is left.
+    """
+
+    __slots__ = ("_jobs", "_started", "_stopping")
+
+    def __init__(self):
+        self._jobs = {}
+        self._started = False
+        self._stopping = asyncio.Event()
+
+    def add(self, name: str, func, interval: float, jitter: float = 0.0) -> Job:
+        """Registers ``func`` (a coroutine function without arguments).
+
+        Jobs added after ``start()`` start right away.
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job {name!r} is already registered")
+        job = self._jobs[name] = Job(name, func, interval, jitter)
+        if self._started:
+            self._spawn(job)
+        return job
+
+    def every(self, interval: float, name: str | None = None, jitter: float = 0.0):
+        """Decorator form of ``add()``."""
+
+        def decorator(func):
+            self.add(name or func.__name__, func, interval, jitter)
+            return func
+
+        return decorator
+
+    def _spawn(self, job: Job):
+        job._task = asyncio.create_task(self._loop(job), name=f"job_{job.name}")
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleeps up to ``seconds``, returns False once the scheduler stops."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), max(seconds, 0))
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def _loop(self, job: Job):
+        due = time.monotonic() + job.interval + random.uniform(0, job.jitter)
+        backoff = 0
+        while await self._sleep(due - time.monotonic()):
+            started = time.monotonic()
+            job.last_lag_ms = (started - due) * 1000
+            job.max_lag_ms = max(job.max_lag_ms, job.last_lag_ms)
+            try:
+                await job.func()
+                backoff = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                job.last_error = f"{type(e).__name__}: {e}"
+                backoff = min(max(backoff * 2, 1), MAX_BACKOFF)
+                LOGGER(__name__).exception(
+                    f"Job {job.name} failed, retrying in {backoff}s"
+                )
+            finished = time.monotonic()
+            job.runs += 1
+            job.last_run_ms = (finished - started) * 1000
+            job.max_run_ms = max(job.max_run_ms, job.last_run_ms)
+            due = finished + job.interval + random.uniform(0, job.jitter) + backoff
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        self._stopping.clear()
+        for job in self._jobs.values():
+            self._spawn(job)
+        LOGGER(__name__).info(f"Started {len(self._jobs)} background jobs.")
+
+    async def stop(self, timeout: float = STOP_TIMEOUT):
+        if not self._started:
+            return
+        self._started = False
+        self._stopping.set()
+        tasks = [job._task for job in self._jobs.values() if job._task]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                LOGGER(__name__).warning(f"Cancelling {task.get_name()}.")
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for job in self._jobs.values():
+            job._task = None
+
+    def stats(self) -> list[dict]:
+        return [job.stats() for job in self._jobs.values()]
+
+
+scheduler = Scheduler()
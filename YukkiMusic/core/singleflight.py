@@ -0,0 +1,68 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+from functools import wraps
+
+
+class SingleFlight:
+    """Runs one call per key at a time and shares it with concurrent callers.
+
+    While a call for a key is in flight, other callers with the same key
+    await that call and get its result or its exception, instead of doing
+    the same download or lookup again. The key is forgotten once the call
+    finishes, so later callers start a fresh one. A caller being cancelled
+    doesn't cancel the shared call for the others.
+    """
+
+    __slots__ = ("_calls", "started", "shared")
+
+    def __init__(self):
+        self._calls = {}
+        self.started = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def _done(self, key, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Nobody may be waiting anymore, retrieve the exception so it isn't logged
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, func, *args, **kwargs):
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = task
+            self.started += 1
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+
+flights = SingleFlight()
+
+
+def single_flight(func):
+    """Coalesces concurrent calls of ``func`` with the same arguments.
+
+    Arguments must be hashable; for methods the instance is part of the key.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        return await flights.do(key, func, *args, **kwargs)
+
+    return wrapper
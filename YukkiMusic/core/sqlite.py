@@ -1,228 +1,240 @@
 # YukkiMusic/core/sqlite.py
 
+import asyncio
 import logging
 import sqlite3
 import sys
-import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-import config # Assuming this import is correct and needed
+from YukkiMusic.core.migrations import MIGRATIONS
 
 LOGGER = logging.getLogger(__name__)
 DB_FILE = "yukki.db"
+READER_CONNECTIONS = 4
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_MS = 30000
+CACHE_SIZE_KIB = 16384  # 16 MiB page cache per connection
+MMAP_SIZE = 268435456  # 256 MiB
 
-def init_db():
-    """Initializes the SQLite database and creates necessary tables."""
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-
-        # --- Tables previously added for general bot functionality ---
-        # Table for users
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT,
-                join_date TEXT
-            )
-        ''')
+def apply_pragmas(conn: sqlite3.Connection):
+    """Per-connection tuning. WAL itself is persistent and set by init_db()."""
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
 
-        # Table for assistants
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS assistants (
-                chat_id INTEGER PRIMARY KEY,
-                assistant_number INTEGER NOT NULL
-            )
-        ''')
-
-        # --- Tables for memorydatabase.py conversion ---
-        # Table for filters
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS filters (
-                chat_id INTEGER PRIMARY KEY,
-                filters_data TEXT -- Stores JSON string of filters
-            )
-        ''')
-
-        # Table for notes
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS notes (
-                chat_id INTEGER PRIMARY KEY,
-                notes_data TEXT DEFAULT '{}', -- Stores JSON string of notes
-                private_note BOOLEAN DEFAULT 0 -- 0 for False, 1 for True
-            )
-        ''')
 
-        # Table for autoend
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS autoend (
-                chat_id INTEGER PRIMARY KEY
-            )
-        ''')
-        
-        # Table for channelplaymode
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS channelplaymode (
-                chat_id INTEGER PRIMARY KEY,
-                mode INTEGER NOT NULL
-            )
-        ''')
-
-        # Table for playtype
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playtype (
-                chat_id INTEGER PRIMARY KEY,
-                mode TEXT NOT NULL -- "Everyone" or "Admins"
-            )
-        ''')
-
-        # Table for playmode
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playmode (
-                chat_id INTEGER PRIMARY KEY,
-                mode TEXT NOT NULL -- "Direct" or "Inline"
-            )
-        ''')
+def schema_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
 
-        # Table for language
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS language (
-                chat_id INTEGER PRIMARY KEY,
-                lang TEXT NOT NULL -- e.g., "en", "id"
-            )
-        ''')
-
-        # Table for adminauth (nonadmin chats)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS adminauth (
-                chat_id INTEGER PRIMARY KEY
-            )
-        ''')
-
-        # Table for videocalls (video stream limit)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS videocalls (
-                chat_id INTEGER PRIMARY KEY,
-                limit_val INTEGER NOT NULL
-            )
-        ''')
-
-        # Table for onoff (general on/off settings, like maintenance)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS onoff (
-                setting_key INTEGER PRIMARY KEY -- e.g., 1 for maintenance
-            )
-        ''')
-
-        # --- Tables for mongodatabase.py conversion ---
-        # Table for playlists (from playlistdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS playlists (
-                chat_id INTEGER PRIMARY KEY,
-                notes_data TEXT DEFAULT '{}' -- Stores JSON string of playlist items
-            )
-        ''')
-
-        # Table for served_users (from usersdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS served_users (
-                user_id INTEGER PRIMARY KEY
-            )
-        ''')
-
-        # Table for served_chats (from chatsdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS served_chats (
-                chat_id INTEGER PRIMARY KEY
-            )
-        ''')
 
-        # Table for blacklisted_chats (from blacklist_chatdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS blacklisted_chats (
-                chat_id INTEGER PRIMARY KEY
-            )
-        ''')
-
-        # Table for private_chats (from privatedb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS private_chats (
-                chat_id INTEGER PRIMARY KEY
-            )
-        ''')
-
-        # Table for auth_users (from authuserdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS auth_users (
-                chat_id INTEGER PRIMARY KEY,
-                notes_data TEXT DEFAULT '{}' -- Stores JSON string of auth users
-            )
-        ''')
-
-        # Table for gbanned_users (from gbansdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gbanned_users (
-                user_id INTEGER PRIMARY KEY
-            )
-        ''')
-
-        # Table for sudoers (from sudoersdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sudoers (
-                key TEXT PRIMARY KEY, -- Will be 'sudo'
-                user_ids TEXT DEFAULT '[]' -- Stores JSON string of list of user_ids
-            )
-        ''')
-
-        # Table for queries (from queriesdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS queries (
-                chat_id INTEGER PRIMARY KEY, -- Will be hardcoded 98324
-                mode INTEGER NOT NULL DEFAULT 0
-            )
-        ''')
-
-        # Table for chat_tops (from chattopdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_tops (
-                chat_id INTEGER PRIMARY KEY,
-                vidid_data TEXT DEFAULT '{}' -- Stores JSON string of video IDs and their spots/titles
-            )
-        ''')
-
-        # Table for user_tops (from userdb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_tops (
-                user_id INTEGER PRIMARY KEY,
-                vidid_data TEXT DEFAULT '{}' -- Stores JSON string of video IDs and user spots
-            )
-        ''')
-
-        # Table for banned_users (from blockeddb)
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS banned_users (
-                user_id INTEGER PRIMARY KEY
-            )
-        ''')
+def init_db():
+    """Opens the SQLite database, enables WAL and applies pending migrations.
 
-        conn.commit()
+    Runs on every start, so new tables and indexes reach existing
+    deployments without the file having to be deleted.
+    """
+    try:
+        conn = sqlite3.connect(DB_FILE, isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        apply_pragmas(conn)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        current = schema_version(conn)
+        for version, description, func in MIGRATIONS:
+            if version <= current:
+                continue
+            LOGGER.info(f"Applying SQLite migration {version}: {description}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                func(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                    (version, description),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        conn.execute("PRAGMA optimize")
+        LOGGER.info(
+            f"SQLite database '{DB_FILE}' ready at schema version {schema_version(conn)}."
+        )
         conn.close()
-        LOGGER.info(f"SQLite database '{DB_FILE}' initialized successfully.")
     except sqlite3.Error as e:
         LOGGER.error(f"Error initializing SQLite database: {e}")
         sys.exit(1)
 
+
 def get_db_connection():
-    """Returns a connection object to the SQLite database."""
+    """Returns a connection object to the SQLite database.
+
+    Only meant for one-off synchronous work outside the event loop (startup,
+    maintenance scripts). Async code must go through :data:`sqldb` instead.
+    """
     try:
         conn = sqlite3.connect(DB_FILE)
+        apply_pragmas(conn)
         conn.row_factory = sqlite3.Row # This allows accessing columns by name
         return conn
     except sqlite3.Error as e:
         LOGGER.error(f"Error connecting to SQLite database: {e}")
         sys.exit(1)
 
-# Ensure the database is initialized when this module is imported
-# This will create the database file and tables if they don't exist
-if not os.path.exists(DB_FILE):
-    LOGGER.info(f"SQLite database file '{DB_FILE}' not found. Initializing...")
-    init_db()
\ No newline at end of file
+
+class SQLiteEngine:
+    """Async access to the SQLite database through a pool of long-lived connections.
+
+    Every statement runs on a dedicated executor, so the event loop never waits
+    on disk I/O. All writes go through a single writer thread (SQLite only ever
+    allows one writer anyway); reads are spread over ``readers`` threads. Each
+    thread keeps its own connection for the lifetime of the process, and each
+    connection keeps a cache of prepared statements, so repeated queries are
+    neither re-opened nor re-parsed.
+
+    Errors are logged and turned into the same empty results the database
+    helpers always returned (``None``, ``[]``, ``0``), so a failing query never
+    propagates into a command handler.
+    """
+
+    def __init__(self, path: str, readers: int = READER_CONNECTIONS):
+        self.path = path
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="sqlite-reader"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+            )
+            apply_pragmas(conn)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _submit(self, executor: ThreadPoolExecutor, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, func, *args)
+
+    # --- Reads ---
+
+    def _fetchone(self, sql: str, params) -> sqlite3.Row | None:
+        try:
+            return self._connection().execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            LOGGER.error(f"SQLite read failed ({sql}): {e}")
+            return None
+
+    def _fetchall(self, sql: str, params) -> list[sqlite3.Row]:
+        try:
+            return self._connection().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            LOGGER.error(f"SQLite read failed ({sql}): {e}")
+            return []
+
+    async def fetchone(self, sql: str, params=()) -> sqlite3.Row | None:
+        return await self._submit(self._readers, self._fetchone, sql, params)
+
+    async def fetchall(self, sql: str, params=()) -> list[sqlite3.Row]:
+        return await self._submit(self._readers, self._fetchall, sql, params)
+
+    async def fetchval(self, sql: str, params=(), default=None):
+        """Returns the first column of the first row, or ``default``."""
+        row = await self.fetchone(sql, params)
+        if row is None or row[0] is None:
+            return default
+        return row[0]
+
+    async def exists(self, sql: str, params=()) -> bool:
+        return await self.fetchone(sql, params) is not None
+
+    # --- Writes ---
+
+    def _write(self, func):
+        conn = self._connection()
+        try:
+            result = func(conn)
+            conn.commit()
+            return result
+        except sqlite3.Error as e:
+            conn.rollback()
+            LOGGER.error(f"SQLite write failed: {e}")
+            return None
+        except BaseException:
+            # A bug in ``func`` mustn't leave its partial writes for the next
+            # transaction to commit
+            conn.rollback()
+            raise
+
+    async def execute(self, sql: str, params=()) -> int:
+        """Runs a single write statement and returns the affected row count."""
+        result = await self.run(lambda conn: conn.execute(sql, params).rowcount)
+        return result or 0
+
+    async def executemany(self, sql: str, seq_of_params) -> int:
+        """Runs ``sql`` once per parameter set inside a single transaction."""
+        seq_of_params = list(seq_of_params)
+        if not seq_of_params:
+            return 0
+        result = await self.run(
+            lambda conn: conn.executemany(sql, seq_of_params).rowcount
+        )
+        return result or 0
+
+    async def run(self, func):
+        """Runs ``func(connection)`` on the writer connection as one transaction.
+
+        Use this for read-modify-write sequences that must not interleave with
+        other writes. Returns whatever ``func`` returns, or ``None`` if SQLite
+        failed; any other exception is raised after the rollback.
+        """
+        return await self._submit(self._writer, self._write, func)
+
+    async def checkpoint(self):
+        """Folds the WAL back into the main file, e.g. before copying it."""
+        await self._submit(
+            self._writer,
+            lambda: self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)"),
+        )
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with self._lock:
+            for conn in self._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        LOGGER.info("SQLite connections closed.")
+
+
+# Bring the database up to the latest schema when this module is imported.
+# This creates the file on first run and migrates existing deployments.
+init_db()
+
+sqldb = SQLiteEngine(DB_FILE)
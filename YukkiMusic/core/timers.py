@@ -0,0 +1,56 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import heapq
+import time
+
+
+class Deadlines:
+    """Keys that expire after a delay, handed out in deadline order.
+
+    Deadlines sit in a heap, so ``pop_due()`` only touches the keys that
+    expired: O(due keys * log n) however many are waiting. Each key has one
+    deadline; adding it again moves it, and a discarded or moved entry is
+    skipped when it surfaces instead of being searched for.
+    """
+
+    __slots__ = ("_heap", "_due")
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key) -> bool:
+        return key in self._due
+
+    def add(self, key, delay: float):
+        due = time.monotonic() + delay
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, key))
+
+    def discard(self, key):
+        self._due.pop(key, None)
+
+    def pop_due(self, now: float | None = None) -> list:
+        """Removes and returns every key whose deadline has passed."""
+        if now is None:
+            now = time.monotonic()
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            due, key = heapq.heappop(self._heap)
+            if self._due.get(key) == due:
+                del self._due[key]
+                expired.append(key)
+        if not self._due:
+            # Only stale entries can be left, drop them in one go
+            self._heap.clear()
+        return expired
@@ -45,25 +45,29 @@ class Userbot:
         ]
         self.handlers = []
 
+    async def _announce(self, client, index):
+        try:
+            await client.send_message(config.LOG_GROUP_ID, "Assistant Started")
+        except ChatWriteForbidden:
+            try:
+                await client.join_chat(config.LOG_GROUP_ID)
+                await client.send_message(config.LOG_GROUP_ID, "Assistant Started")
+            except Exception:
+                LOGGER(__name__).error(
+                    f"Assistant Account {index} failed to send message in log group. "
+                    f"Ensure the assistant is added to the log group."
+                )
+                sys.exit(1)
+
     async def _start(self, client, index):
         LOGGER(__name__).info(f"Starting Assistant Client {index}")
         try:
             await client.start()
             assistants.append(index)
-            try:
-                await client.send_message(config.LOG_GROUP_ID, "Assistant Started")
-            except ChatWriteForbidden:
-                try:
-                    await client.join_chat(config.LOG_GROUP_ID)
-                    await client.send_message(config.LOG_GROUP_ID, "Assistant Started")
-                except Exception:
-                    LOGGER(__name__).error(
-                        f"Assistant Account {index} failed to send message in log group. "
-                        f"Ensure the assistant is added to the log group."
-                    )
-                    sys.exit(1)
-
-            get_me = await client.get_me()
+            # The log group check doesn't hold up reading the account
+            _, get_me = await asyncio.gather(
+                self._announce(client, index), client.get_me()
+            )
             client.username = get_me.username
             client.id = get_me.id
             client.mention = get_me.mention
@@ -0,0 +1,167 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+import asyncio
+import json
+import os
+import sys
+
+import config
+
+from ..logging import LOGGER
+
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "ytdlp_worker.py"
+)
+# A worker is replaced by a fresh process after this many jobs, so memory
+# that yt-dlp's extractors pile up is given back to the system
+MAX_JOBS_PER_WORKER = 100
+# Seconds a job may take, downloads get longer
+EXTRACT_TIMEOUT = 60
+DOWNLOAD_TIMEOUT = 900
+# Seconds a new worker may take to import yt-dlp
+START_TIMEOUT = 60
+# Largest reply line, info dicts with every format listed run to megabytes
+REPLY_LIMIT = 64 * 1024 * 1024
+
+
+class YtDlpError(Exception):
+    pass
+
+
+class _Worker:
+    __slots__ = ("proc", "jobs")
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.jobs = 0
+
+    @classmethod
+    async def spawn(cls) -> "_Worker":
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=REPLY_LIMIT,
+        )
+        worker = cls(proc)
+        try:
+            ready = await asyncio.wait_for(proc.stdout.readline(), START_TIMEOUT)
+        except BaseException:
+            worker.kill()
+            raise
+        if not ready:
+            worker.kill()
+            raise YtDlpError("yt-dlp worker exited while starting")
+        return worker
+
+    async def call(self, op: str, url: str, options: dict) -> dict:
+        job = {"op": op, "url": url, "options": options}
+        # Sets (compat_opts) go over as lists
+        self.proc.stdin.write(json.dumps(job, default=list).encode() + b"\n")
+        await self.proc.stdin.drain()
+        line = await self.proc.stdout.readline()
+        if not line:
+            raise YtDlpError("yt-dlp worker exited")
+        return json.loads(line)
+
+    def kill(self):
+        try:
+            self.proc.kill()
+        except ProcessLookupError:
+            pass
+
+
+class YtDlpPool:
+    """Runs yt-dlp in a pool of warm worker processes.
+
+    Workers are separate interpreters running ``ytdlp_worker.py``. They
+    import yt-dlp once and keep their ``YoutubeDL`` instances, so a request
+    costs neither a new interpreter nor extractor imports, and extraction
+    doesn't compete with the bot for the GIL. At most ``YTDLP_WORKERS`` jobs
+    run at once, others wait their turn.
+
+    A worker whose job times out, or whose caller is cancelled mid-job, is
+    killed rather than left running, so stuck downloads can't pile up past
+    the limit. Workers are also replaced after ``MAX_JOBS_PER_WORKER`` jobs.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.jobs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.recycles = 0
+        self._idle = []
+        self._all = set()
+        self._slots = asyncio.Semaphore(workers)
+
+    async def _spawn(self) -> _Worker:
+        worker = await _Worker.spawn()
+        self._all.add(worker)
+        return worker
+
+    def _kill(self, worker: _Worker):
+        worker.kill()
+        self._all.discard(worker)
+
+    async def start(self):
+        """Starts the workers ahead of the first request."""
+        missing = self.workers - len(self._all)
+        workers = await asyncio.gather(*[self._spawn() for _ in range(missing)])
+        self._idle.extend(workers)
+        LOGGER(__name__).info(f"Started {self.workers} yt-dlp workers.")
+
+    def stop(self):
+        for worker in self._all:
+            worker.kill()
+        self._all.clear()
+        self._idle.clear()
+
+    async def run(self, op: str, url: str, options: dict, timeout: float):
+        async with self._slots:
+            self.jobs += 1
+            worker = self._idle.pop() if self._idle else await self._spawn()
+            try:
+                reply = await asyncio.wait_for(
+                    worker.call(op, url, options), timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self._kill(worker)
+                LOGGER(__name__).warning(f"yt-dlp {op} of {url} timed out.")
+                raise
+            except BaseException:
+                # Cancelled or the worker died, it can't take another job
+                self.failures += 1
+                self._kill(worker)
+                raise
+            worker.jobs += 1
+            if worker.jobs >= MAX_JOBS_PER_WORKER:
+                self._kill(worker)
+                self.recycles += 1
+            else:
+                self._idle.append(worker)
+        if "error" in reply:
+            self.failures += 1
+            raise YtDlpError(reply["error"])
+        return reply["result"]
+
+    async def extract(self, url: str, options: dict) -> dict:
+        return await self.run("extract", url, options, EXTRACT_TIMEOUT)
+
+    async def download(self, url: str, options: dict) -> dict:
+        return await self.run("download", url, options, DOWNLOAD_TIMEOUT)
+
+    async def stream_url(self, url: str, options: dict) -> str:
+        return await self.run("stream_url", url, options, EXTRACT_TIMEOUT)
+
+
+ytdlp = YtDlpPool(config.YTDLP_WORKERS)
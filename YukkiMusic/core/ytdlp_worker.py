@@ -0,0 +1,77 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+"""yt-dlp worker process, started by core/ytdlp.py.
+
+It runs as a script in a fresh interpreter, so it never imports the bot
+package. Jobs arrive as one JSON object per line on stdin and each gets one
+JSON line back on stdout, ``{"result": ...}`` or ``{"error": "..."}``.
+"""
+import json
+import sys
+
+from yt_dlp import YoutubeDL
+
+# Network timeout inside yt-dlp, so a stalled request fails instead of hanging
+SOCKET_TIMEOUT = 20
+# YoutubeDL instances kept (one per distinct set of options)
+INSTANCES = 16
+
+_instances = {}
+
+
+def _instance(options: dict) -> YoutubeDL:
+    key = json.dumps(options, sort_keys=True)
+    ydl = _instances.get(key)
+    if ydl is None:
+        if len(_instances) >= INSTANCES:
+            for old in _instances.values():
+                old.close()
+            _instances.clear()
+        # JSON has no sets
+        if "compat_opts" in options:
+            options = {**options, "compat_opts": set(options["compat_opts"])}
+        ydl = _instances[key] = YoutubeDL({"socket_timeout": SOCKET_TIMEOUT, **options})
+    return ydl
+
+
+def run(op: str, url: str, options: dict):
+    """``extract`` returns the info dict, ``download`` downloads and returns the
+    info dict, ``stream_url`` returns the first media URL (like ``yt-dlp -g``).
+    """
+    ydl = _instance(options)
+    if op == "stream_url":
+        info = ydl.extract_info(url, download=False)
+        if info.get("url"):
+            return info["url"]
+        return info["requested_formats"][0]["url"]
+    if op in ("extract", "download"):
+        info = ydl.extract_info(url, download=op == "download")
+        return ydl.sanitize_info(info)
+    raise ValueError(f"Unknown yt-dlp job {op!r}")
+
+
+def main():
+    # yt-dlp prints to stdout, keep it for replies only
+    replies = sys.stdout
+    sys.stdout = sys.stderr
+    replies.write('{"ready": true}\n')
+    replies.flush()
+    while line := sys.stdin.readline():
+        job = json.loads(line)
+        try:
+            reply = {"result": run(job["op"], job["url"], job["options"])}
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {e}"}
+        replies.write(json.dumps(reply, default=str) + "\n")
+        replies.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import heroku3
 from pyrogram import filters
 
 import config
+from YukkiMusic.core.queue import QueueStore
 from YukkiMusic.utils.database.mongodatabase import get_sudoers, add_sudo, remove_sudo # Import SQLite functions
 
 SUDOERS = filters.user()
@@ -45,7 +46,7 @@ def dbb():
     # It can be kept as a no-op or removed if no other logic relies on it.
     # For now, it's modified to reflect that DB is handled elsewhere.
     global db
-    db = {} # Still initializes an empty dict as it did before.
+    db = QueueStore() # chat_id -> ChatQueue of the tracks queued in that chat
     logger.info(f"Database Initialization Placeholder Executed (SQLite handled by core/sqlite.py).")
 
 
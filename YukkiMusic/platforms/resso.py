@@ -10,10 +10,12 @@
 
 import re
 
-import aiohttp
 from bs4 import BeautifulSoup
 from py_yt import VideosSearch
 
+from YukkiMusic.core.http import http
+from YukkiMusic.core.singleflight import single_flight
+
 
 class Resso:
     def __init__(self):
@@ -26,14 +28,14 @@ class Resso:
         else:
             return False
 
+    @single_flight
     async def track(self, url, playid: bool | str = None):
         if playid:
             url = self.base + url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return False
-                html = await response.text()
+        async with http.get(url) as response:
+            if response.status != 200:
+                return False
+            html = await response.text()
         soup = BeautifulSoup(html, "html.parser")
         for tag in soup.find_all("meta"):
             if tag.get("property", None) == "og:title":
@@ -10,9 +10,8 @@
 
 from os import path
 
-from yt_dlp import YoutubeDL
-
-from YukkiMusic.utils.decorators import asyncify
+from YukkiMusic.core.singleflight import single_flight
+from YukkiMusic.core.ytdlp import ytdlp
 from YukkiMusic.utils.formatters import seconds_to_min
 
 
@@ -29,20 +28,19 @@ class SoundCloud:
     async def valid(self, link: str) -> bool:
         return "soundcloud" in link
 
-    @asyncify
-    def download(self, url: str) -> dict | bool:
-        with YoutubeDL(self.opts):
-            try:
-                info = d.extract_info(url)
-            except Exception:
-                return False
-            xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
-            duration_min = seconds_to_min(info["duration"])
-            track_details = {
-                "title": info["title"],
-                "duration_sec": info["duration"],
-                "duration_min": duration_min,
-                "uploader": info["uploader"],
-                "filepath": xyz,
-            }
-            return track_details, xyz
+    @single_flight
+    async def download(self, url: str) -> dict | bool:
+        try:
+            info = await ytdlp.download(url, self.opts)
+        except Exception:
+            return False
+        xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
+        duration_min = seconds_to_min(info["duration"])
+        track_details = {
+            "title": info["title"],
+            "duration_sec": info["duration"],
+            "duration_min": duration_min,
+            "uploader": info["uploader"],
+            "filepath": xyz,
+        }
+        return track_details, xyz
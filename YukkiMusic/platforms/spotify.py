@@ -8,14 +8,47 @@
 # All rights reserved.
 #
 
+import asyncio
 import re
+import time
 
 import spotipy
-from py_yt import VideosSearch
 from spotipy.oauth2 import SpotifyClientCredentials
 
 import config
-from YukkiMusic.utils.decorators import asyncify
+from YukkiMusic.core.metadata import video_metadata
+from YukkiMusic.core.singleflight import single_flight
+from YukkiMusic.utils.database.mongodatabase import (
+    get_spotify_matches,
+    save_spotify_matches,
+)
+
+# Pages requested from Spotify at once
+PAGE_CONCURRENCY = 4
+# YouTube searches at once while matching the tracks of a playlist
+MATCH_CONCURRENCY = 5
+# Matches are searched again after this many seconds (30 days)
+MATCH_TTL = 30 * 24 * 3600
+
+
+def _query(track: dict) -> str:
+    info = track["name"]
+    for artist in track["artists"]:
+        fetched = f" {artist['name']}"
+        if "Various Artists" not in fetched:
+            info += fetched
+    # YouTube lookups cut a link at "&", keep the whole query
+    return " ".join(info.replace("&", " ").split())
+
+
+def _match_key(track: dict) -> str | None:
+    """The ISRC, which is shared by a song's releases, else the track id."""
+    isrc = (track.get("external_ids") or {}).get("isrc")
+    if isrc:
+        return f"isrc:{isrc.upper()}"
+    if track.get("id"):
+        return f"spotify:{track['id']}"
+    return None
 
 
 class Spotify:
@@ -32,6 +65,7 @@ class Spotify:
             )
         else:
             self.spotify = None
+        self._matching = set()
 
     async def valid(self, link: str):
         if re.search(self.regex, link):
@@ -39,69 +73,120 @@ class Spotify:
         else:
             return False
 
+    async def _api(self, method: str, *args, **kwargs):
+        """Calls a spotipy method in a worker thread, it blocks on HTTP."""
+        return await asyncio.to_thread(getattr(self.spotify, method), *args, **kwargs)
+
+    async def _pages(self, first: dict, method: str, item_id: str, **kwargs) -> list:
+        """Items of the paging object ``first`` and of all pages after it."""
+        limit = first["limit"]
+        slots = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+        async def page(offset: int) -> list:
+            async with slots:
+                result = await self._api(
+                    method, item_id, limit=limit, offset=offset, **kwargs
+                )
+            return result["items"]
+
+        items = list(first["items"])
+        offsets = range(first["offset"] + limit, first["total"], limit)
+        for rest in await asyncio.gather(*map(page, offsets)):
+            items.extend(rest)
+        return items
+
+    async def _entries(self, tracks: list[dict]) -> list[str]:
+        """YouTube links of tracks matched before, search queries for the rest.
+
+        The unmatched tracks that will be played are matched in the
+        background. The searches are shared with the ones ``stream`` makes
+        for the same queries, so nothing is searched twice.
+        """
+        keys = [_match_key(track) for track in tracks]
+        matches = await get_spotify_matches(
+            list({key for key in keys if key}), time.time() - MATCH_TTL
+        )
+        entries = []
+        unmatched = []
+        for index, (track, key) in enumerate(zip(tracks, keys)):
+            if key in matches:
+                entries.append(f"https://www.youtube.com/watch?v={matches[key]}")
+                continue
+            query = _query(track)
+            entries.append(query)
+            if key and index < config.PLAYLIST_FETCH_LIMIT:
+                unmatched.append((key, query))
+        if unmatched:
+            task = asyncio.create_task(self._match(unmatched))
+            self._matching.add(task)
+            task.add_done_callback(self._matching.discard)
+        return entries
+
+    @staticmethod
+    async def _match(unmatched: list[tuple[str, str]]):
+        slots = asyncio.Semaphore(MATCH_CONCURRENCY)
+
+        async def match(key: str, query: str):
+            async with slots:
+                meta = await video_metadata.get(query)
+            if meta is not None:
+                return key, meta.vidid, time.time()
+
+        rows = await asyncio.gather(*[match(key, query) for key, query in unmatched])
+        await save_spotify_matches([row for row in rows if row])
+
+    @single_flight
     async def track(self, link: str):
-        track = self.spotify.track(link)
-        info = track["name"]
-        for artist in track["artists"]:
-            fetched = f" {artist['name']}"
-            if "Various Artists" not in fetched:
-                info += fetched
-        results = VideosSearch(info, limit=1)
-        for result in (await results.next())["result"]:
-            ytlink = result["link"]
-            title = result["title"]
-            vidid = result["id"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
+        track = await self._api("track", link)
+        key = _match_key(track)
+        matches = {}
+        if key:
+            matches = await get_spotify_matches([key], time.time() - MATCH_TTL)
+        if key in matches:
+            meta = await video_metadata.get(
+                f"https://www.youtube.com/watch?v={matches[key]}"
+            )
+        else:
+            meta = await video_metadata.get(_query(track))
+            if meta is not None and key:
+                await save_spotify_matches([(key, meta.vidid, time.time())])
+        if meta is None:
+            raise ValueError(f"No YouTube result for {link}")
         track_details = {
-            "title": title,
-            "link": ytlink,
-            "vidid": vidid,
-            "duration_min": duration_min,
-            "thumb": thumbnail,
+            "title": meta.title,
+            "link": meta.link,
+            "vidid": meta.vidid,
+            "duration_min": meta.duration_min,
+            "thumb": meta.thumbnail,
         }
-        return track_details, vidid
-
-    @asyncify
-    def playlist(self, url: str) -> tuple:
-        playlist = self.spotify.playlist(url)
-        playlist_id = playlist["id"]
-        results = []
-        for item in playlist["tracks"]["items"]:
-            music_track = item["track"]
-            info = music_track["name"]
-            for artist in music_track["artists"]:
-                fetched = f" {artist['name']}"
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-        return results, playlist_id
-
-    @asyncify
-    def album(self, url: str) -> tuple:
-        album = self.spotify.album(url)
-        album_id = album["id"]
-        results = []
-        for item in album["tracks"]["items"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f" {artist['name']}"
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-        return results, album_id
-
-    @asyncify
-    def artist(self, url: str) -> tuple:
-        artist_info = self.spotify.artist(url)
-        artist_id = artist_info["id"]
-        results = []
-        artist_top_tracks = self.spotify.artist_top_tracks(url)
-        for item in artist_top_tracks["tracks"]:
-            info = item["name"]
-            for artist in item["artists"]:
-                fetched = f" {artist['name']}"
-                if "Various Artists" not in fetched:
-                    info += fetched
-            results.append(info)
-        return results, artist_id
+        return track_details, meta.vidid
+
+    @single_flight
+    async def playlist(self, url: str) -> tuple:
+        playlist = await self._api("playlist", url, additional_types=("track",))
+        items = await self._pages(
+            playlist["tracks"],
+            "playlist_items",
+            playlist["id"],
+            additional_types=("track",),
+        )
+        # Removed tracks come back as None, local files have no artists to search
+        tracks = [
+            item["track"]
+            for item in items
+            if item.get("track") and item["track"].get("name")
+        ]
+        return await self._entries(tracks), playlist["id"]
+
+    @single_flight
+    async def album(self, url: str) -> tuple:
+        album = await self._api("album", url)
+        tracks = await self._pages(album["tracks"], "album_tracks", album["id"])
+        return await self._entries(tracks), album["id"]
+
+    @single_flight
+    async def artist(self, url: str) -> tuple:
+        artist_info, top_tracks = await asyncio.gather(
+            self._api("artist", url), self._api("artist_top_tracks", url)
+        )
+        return await self._entries(top_tracks["tracks"]), artist_info["id"]
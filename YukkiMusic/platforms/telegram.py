@@ -19,6 +19,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
 import config
 from config import lyrical
 from YukkiMusic import app
+from YukkiMusic.core.http import http
 
 from ..utils.formatters import convert_bytes, get_readable_time, seconds_to_min
 
@@ -95,29 +96,30 @@ class Telegram:
 
     async def is_streamable_url(self, url: str) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=5) as response:
-                    if response.status == 200:
-                        content_type = response.headers.get("Content-Type", "")
-                        if (
-                            "application/vnd.apple.mpegurl" in content_type
-                            or "application/x-mpegURL" in content_type
-                        ):
-                            return True
-                        if any(
-                            keyword in content_type
-                            for keyword in [
-                                "audio",
-                                "video",
-                                "mp4",
-                                "mpegurl",
-                                "m3u8",
-                                "mpeg",
-                            ]
-                        ):
-                            return True
-                        if url.endswith((".m3u8", ".index", ".mp4", ".mpeg", ".mpd")):
-                            return True
+            async with http.get(
+                url, timeout=aiohttp.ClientTimeout(total=5), retries=0
+            ) as response:
+                if response.status == 200:
+                    content_type = response.headers.get("Content-Type", "")
+                    if (
+                        "application/vnd.apple.mpegurl" in content_type
+                        or "application/x-mpegURL" in content_type
+                    ):
+                        return True
+                    if any(
+                        keyword in content_type
+                        for keyword in [
+                            "audio",
+                            "video",
+                            "mp4",
+                            "mpegurl",
+                            "m3u8",
+                            "mpeg",
+                        ]
+                    ):
+                        return True
+                    if url.endswith((".m3u8", ".index", ".mp4", ".mpeg", ".mpd")):
+                        return True
         except aiohttp.ClientError:
             pass
         return False
@@ -7,7 +7,6 @@
 #
 # All rights reserved.
 #
-import asyncio
 import os
 import re
 
@@ -15,30 +14,23 @@ from async_lru import alru_cache
 from py_yt import VideosSearch
 from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
-from yt_dlp import YoutubeDL
 
 import config
 from config import cookies
+from YukkiMusic.core.mediacache import media_cache
+from YukkiMusic.core.metadata import VideoMeta, video_metadata
+from YukkiMusic.core.singleflight import flights, single_flight
+from YukkiMusic.core.ytdlp import ytdlp
 from YukkiMusic.utils.database import is_on_off
 from YukkiMusic.utils.decorators import asyncify
-from YukkiMusic.utils.formatters import seconds_to_min, time_to_seconds
+from YukkiMusic.utils.formatters import seconds_to_min
 
 NOTHING = {"cookies_dead": None}
 
-
-async def shell_cmd(cmd):
-    proc = await asyncio.create_subprocess_shell(
-        cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
-    out, errorz = await proc.communicate()
-    if errorz:
-        if "unavailable videos are hidden" in (errorz.decode("utf-8")).lower():
-            return out.decode("utf-8")
-        else:
-            return errorz.decode("utf-8")
-    return out.decode("utf-8")
+# Bounds of the playlist, formats and slider lookup caches, video metadata has
+# its own store in core/metadata.py
+LOOKUP_CACHE_SIZE = 256
+LOOKUP_CACHE_TTL = 3600
 
 
 class YouTube:
@@ -91,132 +83,100 @@ class YouTube:
             return None
         return text[offset : offset + length]
 
-    @alru_cache(maxsize=None)
-    async def details(self, link: str, videoid: bool | str = None):
+    async def _metadata(self, link: str, videoid: bool | str = None) -> VideoMeta:
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-            duration_min = result["duration"]
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            vidid = result["id"]
-            if str(duration_min) == "None":
-                duration_sec = 0
-            else:
-                duration_sec = int(time_to_seconds(duration_min))
-        return title, duration_min, duration_sec, thumbnail, vidid
+        meta = await video_metadata.get(link)
+        if meta is None:
+            raise ValueError(f"No YouTube result for {link}")
+        return meta
+
+    async def details(self, link: str, videoid: bool | str = None):
+        meta = await self._metadata(link, videoid)
+        return (
+            meta.title,
+            meta.duration_min,
+            meta.duration_sec,
+            meta.thumbnail,
+            meta.vidid,
+        )
 
-    @alru_cache(maxsize=None)
     async def title(self, link: str, videoid: bool | str = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            title = result["title"]
-        return title
+        return (await self._metadata(link, videoid)).title
 
-    @alru_cache(maxsize=None)
     async def duration(self, link: str, videoid: bool | str = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            duration = result["duration"]
-        return duration
+        return (await self._metadata(link, videoid)).duration_min
 
-    @alru_cache(maxsize=None)
     async def thumbnail(self, link: str, videoid: bool | str = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
-        results = VideosSearch(link, limit=1)
-        for result in (await results.next())["result"]:
-            thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-        return thumbnail
+        return (await self._metadata(link, videoid)).thumbnail
 
+    @single_flight
     async def video(self, link: str, videoid: bool | str = None):
         if videoid:
             link = self.base + link
         if "&" in link:
             link = link.split("&")[0]
-        cmd = [
-            "yt-dlp",
-            f"--cookies",
-            cookies(),
-            "-g",
-            "-f",
-            "best[height<=?720][width<=?1280]",
-            f"{link}",
-        ]
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-        if stdout:
-            return 1, stdout.decode().split("\n")[0]
-        else:
-            return 0, stderr.decode()
+        try:
+            url = await ytdlp.stream_url(
+                link,
+                {
+                    "format": "best[height<=?720][width<=?1280]",
+                    "quiet": True,
+                    "cookiefile": cookies(),
+                },
+            )
+        except Exception as e:
+            return 0, str(e)
+        return 1, url
 
-    @alru_cache(maxsize=None)
     async def playlist(self, link, limit, videoid: bool | str = None):
         if videoid:
             link = self.listbase + link
         if "&" in link:
             link = link.split("&")[0]
-
-        cmd = (
-            f"yt-dlp -i --compat-options no-youtube-unavailable-videos "
-            f'--get-id --flat-playlist --playlist-end {limit} --skip-download "{link}" '
-            f"2>/dev/null"
-        )
-
-        playlist = await shell_cmd(cmd)
-
         try:
-            result = [key for key in playlist.split("\n") if key]
+            return await self._playlist(link, limit)
         except Exception:
-            result = []
-        return result
+            return []
+
+    # Failures raise out of the cache, so only fetched playlists are kept
+    @alru_cache(maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL)
+    async def _playlist(self, link: str, limit: int) -> list[str]:
+        playlist = await ytdlp.extract(
+            link,
+            {
+                "extract_flat": True,
+                "ignoreerrors": True,
+                "playlistend": limit,
+                "compat_opts": {"no-youtube-unavailable-videos"},
+                "quiet": True,
+            },
+        )
+        return [entry["id"] for entry in playlist["entries"] if entry]
 
-    @alru_cache(maxsize=None)
     async def track(self, link: str, videoid: bool | str = None):
-        if videoid:
-            link = self.base + link
-        if "&" in link:
-            link = link.split("&")[0]
         # if link.startswith("http://") or link.startswith("https://"):
         #     return await self._track(link)
         try:
-            results = VideosSearch(link, limit=1)
-            for result in (await results.next())["result"]:
-                title = result["title"]
-                duration_min = result["duration"]
-                vidid = result["id"]
-                yturl = result["link"]
-                thumbnail = result["thumbnails"][0]["url"].split("?")[0]
-            track_details = {
-                "title": title,
-                "link": yturl,
-                "vidid": vidid,
-                "duration_min": duration_min,
-                "thumb": thumbnail,
-            }
-            return track_details, vidid
-        except Exception:
+            meta = await self._metadata(link, videoid)
+        except ValueError:
+            if videoid:
+                link = self.base + link
+            if "&" in link:
+                link = link.split("&")[0]
             return await self._track(link)
+        track_details = {
+            "title": meta.title,
+            "link": meta.link,
+            "vidid": meta.vidid,
+            "duration_min": meta.duration_min,
+            "thumb": meta.thumbnail,
+        }
+        return track_details, meta.vidid
 
-    @asyncify
-    def _track(self, q):
+    async def _track(self, q):
         options = {
             "format": "best",
             "noplaylist": True,
@@ -224,25 +184,23 @@ class YouTube:
             "extract_flat": "in_playlist",
             "cookiefile": f"{cookies()}",
         }
-        with YoutubeDL(options) as ydl:
-            info_dict = ydl.extract_info(f"ytsearch: {q}", download=False)
-            details = info_dict.get("entries")[0]
-            info = {
-                "title": details["title"],
-                "link": details["url"],
-                "vidid": details["id"],
-                "duration_min": (
-                    seconds_to_min(details["duration"])
-                    if details["duration"] != 0
-                    else None
-                ),
-                "thumb": details["thumbnails"][0]["url"],
-            }
-            return info, details["id"]
+        info_dict = await ytdlp.extract(f"ytsearch: {q}", options)
+        details = info_dict.get("entries")[0]
+        info = {
+            "title": details["title"],
+            "link": details["url"],
+            "vidid": details["id"],
+            "duration_min": (
+                seconds_to_min(details["duration"])
+                if details["duration"] != 0
+                else None
+            ),
+            "thumb": details["thumbnails"][0]["url"],
+        }
+        return info, details["id"]
 
-    @alru_cache(maxsize=None)
-    @asyncify
-    def formats(self, link: str, videoid: bool | str = None):
+    @alru_cache(maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL)
+    async def formats(self, link: str, videoid: bool | str = None):
         if videoid:
             link = self.base + link
         if "&" in link:
@@ -253,37 +211,35 @@ class YouTube:
             "cookiefile": f"{cookies()}",
         }
 
-        ydl = YoutubeDL(ytdl_opts)
-        with ydl:
-            formats_available = []
-            r = ydl.extract_info(link, download=False)
-            for format in r["formats"]:
+        r = await ytdlp.extract(link, ytdl_opts)
+        formats_available = []
+        for format in r["formats"]:
+            try:
+                str(format["format"])
+            except Exception:
+                continue
+            if "dash" not in str(format["format"]).lower():
                 try:
-                    str(format["format"])
-                except Exception:
+                    format["format"]
+                    format["filesize"]
+                    format["format_id"]
+                    format["ext"]
+                    format["format_note"]
+                except KeyError:
                     continue
-                if "dash" not in str(format["format"]).lower():
-                    try:
-                        format["format"]
-                        format["filesize"]
-                        format["format_id"]
-                        format["ext"]
-                        format["format_note"]
-                    except KeyError:
-                        continue
-                    formats_available.append(
-                        {
-                            "format": format["format"],
-                            "filesize": format["filesize"],
-                            "format_id": format["format_id"],
-                            "ext": format["ext"],
-                            "format_note": format["format_note"],
-                            "yturl": link,
-                        }
-                    )
+                formats_available.append(
+                    {
+                        "format": format["format"],
+                        "filesize": format["filesize"],
+                        "format_id": format["format_id"],
+                        "ext": format["ext"],
+                        "format_note": format["format_note"],
+                        "yturl": link,
+                    }
+                )
         return formats_available, link
 
-    @alru_cache(maxsize=None)
+    @alru_cache(maxsize=LOOKUP_CACHE_SIZE, ttl=LOOKUP_CACHE_TTL)
     async def slider(
         self,
         link: str,
@@ -302,6 +258,39 @@ class YouTube:
         thumbnail = result[query_type]["thumbnails"][0]["url"].split("?")[0]
         return title, duration_min, thumbnail, vidid
 
+    async def _cached(self, link: str, media_id: str | None, fmt: str, download) -> str:
+        """Serves ``media_id`` from the media cache, or downloads and caches it.
+
+        Concurrent calls for the same track share one download, so they don't
+        race to write the same file.
+        """
+
+        async def fetch():
+            if media_id and (
+                path := await media_cache.lookup("youtube", media_id, fmt)
+            ):
+                return path
+            path = await download()
+            await media_cache.store(
+                "youtube",
+                media_id or os.path.splitext(os.path.basename(path))[0],
+                fmt,
+                path,
+            )
+            return path
+
+        return await flights.do(("youtube", fmt, media_id or link), fetch)
+
+    @single_flight
+    async def _stream_url(self, link: str) -> str | None:
+        """Direct media URL of ``link``, or None."""
+        try:
+            return await ytdlp.stream_url(
+                link, {"format": "best", "quiet": True, "cookiefile": cookies()}
+            )
+        except Exception:
+            return None
+
     async def download(
         self,
         link: str,
@@ -313,11 +302,11 @@ class YouTube:
         format_id: bool | str = None,
         title: bool | str = None,
     ) -> str:
+        media_id = link if videoid else None
         if videoid:
             link = self.base + link
 
-        @asyncify
-        def audio_dl():
+        async def audio_dl():
             ydl_optssx = {
                 "format": "bestaudio[ext=m4a]/bestaudio/best",
                 "outtmpl": "downloads/%(id)s.%(ext)s",
@@ -330,16 +319,11 @@ class YouTube:
                 "prefer_ffmpeg": True,
             }
 
-            with YoutubeDL(ydl_optssx) as x:
-                info = x.extract_info(link, False)
-                xyz = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-                if os.path.exists(xyz):
-                    return xyz
-                x.download([link])
-                return xyz
+            # yt-dlp skips the download when the file is already there
+            info = await ytdlp.download(link, ydl_optssx)
+            return os.path.join("downloads", f"{info['id']}.{info['ext']}")
 
-        @asyncify
-        def video_dl():
+        async def video_dl():
             ydl_optssx = {
                 "format": "(bestvideo[height<=?720][width<=?1280][ext=mp4])+(bestaudio[ext=m4a])",
                 "outtmpl": "downloads/%(id)s.%(ext)s",
@@ -352,16 +336,11 @@ class YouTube:
                 "cookiefile": f"{cookies()}",
             }
 
-            with YoutubeDL(ydl_optssx) as x:
-                info = x.extract_info(link, False)
-                xyz = os.path.join("downloads", f"{info['id']}.{info['ext']}")
-                if os.path.exists(xyz):
-                    return xyz
-                x.download([link])
-                return xyz
+            # yt-dlp skips the download when the file is already there
+            info = await ytdlp.download(link, ydl_optssx)
+            return os.path.join("downloads", f"{info['id']}.{info['ext']}")
 
-        @asyncify
-        def song_video_dl():
+        async def song_video_dl():
             ydl_optssx = {
                 "format": f"{format_id}+140",
                 "outtmpl": os.path.join("downloads", f"%(id)s_{format_id}.%(ext)s"),
@@ -375,14 +354,11 @@ class YouTube:
                 "cookiefile": f"{cookies()}",
             }
 
-            with YoutubeDL(ydl_optssx) as x:
-                info = x.extract_info(link)
-                filename = f"{info['id']}_{format_id}.mp4"
-                file_path = os.path.join("downloads", filename)
-                return file_path
+            info = await ytdlp.download(link, ydl_optssx)
+            filename = f"{info['id']}_{format_id}.mp4"
+            return os.path.join("downloads", filename)
 
-        @asyncify
-        def song_audio_dl():
+        async def song_audio_dl():
             ydl_optssx = {
                 "format": format_id,
                 "outtmpl": os.path.join("downloads", f"%(id)s_{format_id}.%(ext)s"),
@@ -402,48 +378,34 @@ class YouTube:
                 "cookiefile": f"{cookies()}",
             }
 
-            with YoutubeDL(ydl_optssx) as x:
-                info = x.extract_info(link)
-                filename = f"{info['id']}_{format_id}.mp3"
-                file_path = os.path.join("downloads", filename)
-                return file_path
+            info = await ytdlp.download(link, ydl_optssx)
+            filename = f"{info['id']}_{format_id}.mp3"
+            return os.path.join("downloads", filename)
 
         if songvideo:
-            return await song_video_dl()
+            return await flights.do(
+                ("youtube", f"song_video_{format_id}", link), song_video_dl
+            )
 
         elif songaudio:
-            return await song_audio_dl()
+            return await flights.do(
+                ("youtube", f"song_audio_{format_id}", link), song_audio_dl
+            )
 
         elif video:
             if await is_on_off(config.YTDOWNLOADER):
                 direct = True
-                downloaded_file = await video_dl()
+                downloaded_file = await self._cached(link, media_id, "video", video_dl)
             else:
-                command = [
-                    "yt-dlp",
-                    f"--cookies",
-                    cookies(),
-                    "-g",
-                    "-f",
-                    "best",
-                    link,
-                ]
-
-                proc = await asyncio.create_subprocess_exec(
-                    *command,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, stderr = await proc.communicate()
-
-                if stdout:
-                    downloaded_file = stdout.decode().split("\n")[0]
-                    direct = None
-                else:
-                    downloaded_file = await video_dl()
+                downloaded_file = await self._stream_url(link)
+                direct = None
+                if not downloaded_file:
+                    downloaded_file = await self._cached(
+                        link, media_id, "video", video_dl
+                    )
                     direct = True
         else:
             direct = True
-            downloaded_file = await audio_dl()
+            downloaded_file = await self._cached(link, media_id, "audio", audio_dl)
 
         return downloaded_file, direct
@@ -7,7 +7,6 @@
 #
 # All rights reserved.
 #
-import random
 
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardMarkup, InputMediaPhoto
@@ -211,17 +210,10 @@ async def admin_callback(client, query, _):
         check = db.get(chat_id)
         if not check:
             return await query.answer(_["admin_21"], show_alert=True)
-        try:
-            popped = check.pop(0)
-        except Exception:
-            return await query.answer(_["admin_22"], show_alert=True)
-        check = db.get(chat_id)
-        if not check:
-            check.insert(0, popped)
+        if len(check) < 2:
             return await query.answer(_["admin_22"], show_alert=True)
         await query.answer()
-        random.shuffle(check)
-        check.insert(0, popped)
+        check.shuffle()
         await query.message.reply_text(
             _["admin_23"].format(mention), disable_web_page_preview=True
         )
@@ -8,8 +8,6 @@
 # All rights reserved.
 #
 
-import random
-
 from pyrogram import filters
 from pyrogram.types import Message
 
@@ -28,14 +26,7 @@ async def admins(Client, message: Message, _, chat_id):
     check = db.get(chat_id)
     if not check:
         return await message.reply_text(_["admin_21"])
-    try:
-        popped = check.pop(0)
-    except Exception:
-        return await message.reply_text(_["admin_22"])
-    check = db.get(chat_id)
-    if not check:
-        check.insert(0, popped)
+    if len(check) < 2:
         return await message.reply_text(_["admin_22"])
-    random.shuffle(check)
-    check.insert(0, popped)
+    check.shuffle()
     await message.reply_text(_["admin_23"].format(message.from_user.mention))
@@ -43,31 +43,14 @@ async def skip(cli, message: Message, _, chat_id):
                 if count > 2:
                     count = int(count - 1)
                     if 1 <= state <= count:
-                        for x in range(state):
-                            popped = None
-                            try:
-                                popped = check.pop(0)
-                                if popped.get("mystic"):
-                                    try:
-                                        await popped.get("mystic").delete()
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                return await message.reply_text(_["admin_16"])
-                            if popped:
-                                await auto_clean(popped)
-                            if not check:
+                        # state <= len - 1, so a track is always left to play
+                        for popped in check.skip(state):
+                            if popped.get("mystic"):
                                 try:
-                                    await message.reply_text(
-                                        _["admin_10"].format(
-                                            message.from_user.first_name
-                                        ),
-                                        disable_web_page_preview=True,
-                                    )
-                                    await Yukki.stop_stream(chat_id)
+                                    await popped.get("mystic").delete()
                                 except Exception:
-                                    return
-                                break
+                                    pass
+                            await auto_clean(popped)
                     else:
                         return await message.reply_text(_["admin_15"].format(count))
                 else:
@@ -9,23 +9,24 @@
 #
 
 import asyncio
-from datetime import datetime
 
 from pyrogram.enums import ChatType
 
 import config
 from strings import get_string
 from YukkiMusic import app
-from YukkiMusic.core.call import Yukki
+from YukkiMusic.core.call import Yukki, participants
+from YukkiMusic.core.scheduler import scheduler
+from YukkiMusic.core.timers import Deadlines
 from YukkiMusic.utils.database import (
-    get_assistant,
     get_client,
     get_lang,
     is_active_chat,
     is_autoend,
 )
 
-autoend = {}
+# Chats whose voice chat looked empty, checked again once their timer expires
+autoend = Deadlines()
 
 
 async def auto_leave():
@@ -60,7 +61,6 @@ async def auto_leave():
                 pass
 
         if config.AUTO_LEAVING_ASSISTANT:
-            await asyncio.sleep(config.AUTO_LEAVE_ASSISTANT_TIME)
             tasks = []
             for num in assistants:
                 client = await get_client(num)
@@ -69,55 +69,45 @@ async def auto_leave():
 
 
 async def auto_end():
-    if await is_autoend():
-        await asyncio.sleep(30)
-        for chat_id, timer in list(autoend.items()):
-            if datetime.now() > timer:
-                if not await is_active_chat(chat_id):
-                    del autoend[chat_id]
-                    continue
-
-                userbot = await get_assistant(chat_id)
-                members = []
-
-                try:
-                    async for member in userbot.get_call_members(chat_id):
-                        if member is None:
-                            continue
-                        members.append(member)
-                except ValueError:
-                    try:
-                        await Yukki.stop_stream(chat_id)
-                    except Exception:
-                        pass
-                    continue
-
-                if len(members) <= 1:
-                    try:
-                        await Yukki.stop_stream(chat_id)
-                    except Exception:
-                        pass
-
-                    try:
-                        language = await get_lang(message.chat.id)
-                        language = get_string(language)
-                    except Exception:
-                        language = get_string("en")
-                    try:
-                        await app.send_message(
-                            chat_id,
-                            language["misc_1"],
-                        )
-                    except Exception:
-                        pass
-
-                del autoend[chat_id]
+    if not await is_autoend():
+        autoend.pop_due()
+        return
+    for chat_id in autoend.pop_due():
+        if not await is_active_chat(chat_id):
+            continue
+
+        try:
+            await Yukki.sync_participants(chat_id)
+        except ValueError:
+            try:
+                await Yukki.stop_stream(chat_id)
+            except Exception:
+                pass
+            continue
+        except Exception:
+            pass
 
+        count = participants.count(chat_id)
+        if count is not None and count <= 1:
+            try:
+                await Yukki.stop_stream(chat_id)
+            except Exception:
+                pass
 
-async def do_and_do():
-    while True:
-        await asyncio.gather(auto_leave(), auto_end())
-        await asyncio.sleep(1)
+            try:
+                language = await get_lang(chat_id)
+                language = get_string(language)
+            except Exception:
+                language = get_string("en")
+            try:
+                await app.send_message(
+                    chat_id,
+                    language["misc_1"],
+                )
+            except Exception:
+                pass
 
 
-asyncio.create_task(do_and_do())
+if config.AUTO_LEAVING_ASSISTANT:
+    scheduler.add("auto_leave", auto_leave, interval=config.AUTO_LEAVE_ASSISTANT_TIME)
+scheduler.add("auto_end", auto_end, interval=2)
@@ -9,7 +9,6 @@
 #
 
 import asyncio
-from datetime import datetime, timedelta
 
 from pyrogram import filters
 from pyrogram.enums import ChatMembersFilter
@@ -17,30 +16,33 @@ from pyrogram.errors import FloodWait
 from pyrogram.raw import types
 
 import config
-from config import adminlist, chatstats, clean, userstats
+from config import adminlist
 from strings import command
 from YukkiMusic import app
+from YukkiMusic.core.scheduler import scheduler
+from YukkiMusic.core.timers import Deadlines
 from YukkiMusic.utils.database import (
     get_active_chats,
     get_authuser_names,
     get_client,
-    get_particular_top,
     get_served_chats,
     get_served_users,
-    get_user_top,
     is_cleanmode_on,
     set_queries,
-    update_particular_top,
-    update_user_top,
 )
 from YukkiMusic.utils.decorators.language import language
 from YukkiMusic.utils.formatters import alpha_to_int
 
 AUTO_DELETE = config.CLEANMODE_DELETE_MINS
 AUTO_SLEEP = 5
+# Most message ids Telegram accepts in one delete_messages request
+DELETE_BATCH = 100
 IS_BROADCASTING = False
 cleanmode_group = 15
 
+# (chat_id, message_id) of messages to delete once clean mode's delay is over
+expiring = Deadlines()
+
 
 @app.on_raw_update(group=cleanmode_group)
 async def clean_mode(client, update, users, chats):
@@ -60,14 +62,8 @@ async def clean_mode(client, update, users, chats):
     chat_id = int(f"-100{update.channel_id}")
     if not await is_cleanmode_on(chat_id):
         return
-    if chat_id not in clean:
-        clean[chat_id] = []
-    time_now = datetime.now()
-    put = {
-        "msg_id": message_id,
-        "timer_after": time_now + timedelta(minutes=AUTO_DELETE),
-    }
-    clean[chat_id].append(put)
+    if chat_id != config.LOG_GROUP_ID:
+        expiring.add((chat_id, message_id), AUTO_DELETE * 60)
     await set_queries(1)
 
 
@@ -218,74 +214,43 @@ async def braodcast_message(client, message, _):
     IS_BROADCASTING = False
 
 
+async def delete_expired():
+    """Deletes the expired clean-mode messages with one request per chat."""
+    batches = {}
+    for chat_id, message_id in expiring.pop_due():
+        batches.setdefault(chat_id, []).append(message_id)
+    for chat_id, message_ids in batches.items():
+        for i in range(0, len(message_ids), DELETE_BATCH):
+            chunk = message_ids[i : i + DELETE_BATCH]
+            try:
+                await app.delete_messages(chat_id, chunk)
+            except FloodWait as e:
+                # Try these again on a later run
+                for message_id in chunk:
+                    expiring.add((chat_id, message_id), e.value)
+            except Exception:
+                continue
+
+
 async def auto_clean():
-    while not await asyncio.sleep(AUTO_SLEEP):
-        try:
-            for chat_id in chatstats:
-                for dic in chatstats[chat_id]:
-                    vidid = dic["vidid"]
-                    title = dic["title"]
-                    chatstats[chat_id].pop(0)
-                    spot = await get_particular_top(chat_id, vidid)
-                    if spot:
-                        spot = spot["spot"]
-                        next_spot = spot + 1
-                        new_spot = {"spot": next_spot, "title": title}
-                        await update_particular_top(chat_id, vidid, new_spot)
-                    else:
-                        next_spot = 1
-                        new_spot = {"spot": next_spot, "title": title}
-                        await update_particular_top(chat_id, vidid, new_spot)
-            for user_id in userstats:
-                for dic in userstats[user_id]:
-                    vidid = dic["vidid"]
-                    title = dic["title"]
-                    userstats[user_id].pop(0)
-                    spot = await get_user_top(user_id, vidid)
-                    if spot:
-                        spot = spot["spot"]
-                        next_spot = spot + 1
-                        new_spot = {"spot": next_spot, "title": title}
-                        await update_user_top(user_id, vidid, new_spot)
-                    else:
-                        next_spot = 1
-                        new_spot = {"spot": next_spot, "title": title}
-                        await update_user_top(user_id, vidid, new_spot)
-        except Exception:
-            continue
-        try:
-            for chat_id in clean:
-                if chat_id == config.LOG_GROUP_ID:
-                    continue
-                for x in clean[chat_id]:
-                    if datetime.now() > x["timer_after"]:
-                        try:
-                            await app.delete_messages(chat_id, x["msg_id"])
-                        except FloodWait as e:
-                            await asyncio.sleep(e.value)
-                        except Exception:
-                            continue
-                    else:
-                        continue
-        except Exception:
-            continue
-        try:
-            served_chats = await get_active_chats()
-            for chat_id in served_chats:
-                if chat_id not in adminlist:
-                    adminlist[chat_id] = []
-                    admins = app.get_chat_members(
-                        chat_id, filter=ChatMembersFilter.ADMINISTRATORS
-                    )
-                    async for user in admins:
-                        if user.privileges.can_manage_video_chats:
-                            adminlist[chat_id].append(user.user.id)
-                    authusers = await get_authuser_names(chat_id)
-                    for user in authusers:
-                        user_id = await alpha_to_int(user)
-                        adminlist[chat_id].append(user_id)
-        except Exception:
-            continue
+    try:
+        served_chats = await get_active_chats()
+        for chat_id in served_chats:
+            if chat_id not in adminlist:
+                adminlist[chat_id] = []
+                admins = app.get_chat_members(
+                    chat_id, filter=ChatMembersFilter.ADMINISTRATORS
+                )
+                async for user in admins:
+                    if user.privileges.can_manage_video_chats:
+                        adminlist[chat_id].append(user.user.id)
+                authusers = await get_authuser_names(chat_id)
+                for user in authusers:
+                    user_id = await alpha_to_int(user)
+                    adminlist[chat_id].append(user_id)
+    except Exception:
+        pass
 
 
-asyncio.create_task(auto_clean())
+scheduler.add("delete_expired", delete_expired, interval=AUTO_SLEEP)
+scheduler.add("auto_clean", auto_clean, interval=AUTO_SLEEP)
@@ -7,14 +7,19 @@
 #
 # All rights reserved.
 #
-import asyncio
+import heapq
+import random
 import time
-from datetime import datetime, timedelta
 
+from pyrogram.errors import FloodWait, MessageNotModified
 from pyrogram.types import InlineKeyboardMarkup
 
+import config
 from strings import get_string
-from YukkiMusic.core.call import Yukki
+from YukkiMusic.core.call import Yukki, participants
+from YukkiMusic.core.ratelimit import TokenBucket
+from YukkiMusic.core.registry import active_calls
+from YukkiMusic.core.scheduler import scheduler
 from YukkiMusic.misc import db
 from YukkiMusic.plugins.admins.callback import wrong
 from YukkiMusic.plugins.misc.autoleave import autoend
@@ -32,160 +37,180 @@ checker = {}
 muted = {}
 
 
-async def timer():
-    while not await asyncio.sleep(1):
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            if not await is_music_playing(chat_id):
-                continue
-            playing = db.get(chat_id)
-            if not playing:
-                continue
-            file_path = playing[0]["file"]
-            if "index_" in file_path or "live_" in file_path:
-                continue
-            duration = int(playing[0]["seconds"])
-            if duration == 0:
-                continue
-            db[chat_id][0]["played"] += 1
-
-
 async def leave_if_muted():
-    while True:
-        await asyncio.sleep(2)
-        for chat_id, details in list(muted.items()):
-            if time.time() - details["timestamp"] >= 60:
-                _ = details["_"]
-                try:
-                    userbot = await get_assistant(chat_id)
-                    members = []
-                    try:
-                        async for member in userbot.get_call_members(chat_id):
-                            if member is None:
-                                continue
-                            members.append(member)
-                    except ValueError:
-                        try:
-                            await Yukki.stop_stream(chat_id)
-                        except Exception:
-                            pass
-                        continue
-
-                    m = next((m for m in members if m.chat.id == userbot.id), None)
-                    if m is None:
-                        continue
-                    is_muted = bool(m.is_muted and not m.can_self_unmute)
-
-                    if is_muted:
-                        await Yukki.stop_stream(chat_id)
-                        await set_loop(chat_id, 0)
-
-                    del muted[chat_id]
-                except Exception:
-                    del muted[chat_id]
-
-
-async def markup_timer():
-    while True:
-        await asyncio.sleep(2)
-        active_chats = await get_active_chats()
-        for chat_id in active_chats:
-            if not await is_music_playing(chat_id):
-                continue
-
-            playing = db.get(chat_id)
-            if not playing:
-                continue
-
-            duration_seconds = int(playing[0]["seconds"])
-
-            try:
-                language = await get_lang(chat_id)
-                _ = get_string(language)
-            except Exception:
-                _ = get_string("en")
-
-            is_muted = False
+    for chat_id, details in list(muted.items()):
+        if time.time() - details["timestamp"] >= 60:
             try:
                 userbot = await get_assistant(chat_id)
-                members = []
-                try:
-                    async for member in userbot.get_call_members(chat_id):
-                        if member is None:
-                            continue
-                        members.append(member)
-                except ValueError:
-                    try:
-                        await Yukki.stop_stream(chat_id)
-                    except Exception:
-                        pass
-                    continue
-
-                if not members:
+                if participants.is_muted(chat_id, userbot.id):
                     await Yukki.stop_stream(chat_id)
                     await set_loop(chat_id, 0)
-                    continue
+            except Exception:
+                pass
+            del muted[chat_id]
 
-                if len(members) <= 1 and chat_id not in autoend:
-                    autoend[chat_id] = datetime.now() + timedelta(seconds=30)
 
-                m = next((m for m in members if m.chat.id == userbot.id), None)
-                if m is None:
-                    continue
+async def watch_members():
+    """Checks listeners and the assistant's mute state of every playing chat.
 
-                is_muted = bool(m.is_muted and not m.can_self_unmute)
-                if is_muted:
-                    if chat_id not in muted:
-                        muted[chat_id] = {
-                            "timestamp": time.time(),
-                            "_": _,
-                        }
+    Both are read from the participant cache, which PyTgCalls updates keep
+    current; a chat's list is only fetched from Telegram when it's unknown
+    or hasn't been reconciled for a while.
+    """
+    active_chats = await get_active_chats()
+    for chat_id in active_chats:
+        if not await is_music_playing(chat_id):
+            continue
 
-            except Exception:
-                pass
-
-            if duration_seconds == 0:
-                continue
+        if not db.get(chat_id):
+            continue
 
+        try:
+            await Yukki.sync_participants(chat_id)
+        except ValueError:
             try:
-                mystic = playing[0]["mystic"]
-                markup = playing[0]["markup"]
+                await Yukki.stop_stream(chat_id)
             except Exception:
+                pass
+            continue
+        except Exception:
+            continue
+
+        try:
+            count = participants.count(chat_id)
+            if not count:
+                await Yukki.stop_stream(chat_id)
+                await set_loop(chat_id, 0)
                 continue
 
-            try:
-                check = wrong[chat_id][mystic.id]
-                if check is False:
-                    continue
-            except Exception:
-                pass
+            if count <= 1 and chat_id not in autoend:
+                autoend.add(chat_id, 30)
 
+            userbot = await get_assistant(chat_id)
+            if participants.is_muted(chat_id, userbot.id):
+                if chat_id not in muted:
+                    try:
+                        language = await get_lang(chat_id)
+                        _ = get_string(language)
+                    except Exception:
+                        _ = get_string("en")
+                    muted[chat_id] = {
+                        "timestamp": time.time(),
+                        "_": _,
+                    }
+
+        except Exception:
+            pass
+
+
+class ProgressUpdater:
+    """Edits the progress bar of every playing chat within a global API budget.
+
+    Each chat has its own next-update time in a heap. All chats share one
+    token bucket of ``PROGRESS_EDIT_RATE`` edits per second, so the per-chat
+    interval grows with the number of active chats, and new chats get a random
+    first slot so edits are spread out instead of arriving in bursts. An edit
+    is skipped when the rendered ``played`` label hasn't changed, e.g. while
+    paused.
+    """
+
+    def __init__(self, rate: float, min_interval: float):
+        self.min_interval = min_interval
+        self.bucket = TokenBucket(rate)
+        self.sent = 0
+        self.skipped = 0
+        self.rate_limited = 0
+        self._heap = []
+        self._scheduled = set()
+        self._labels = {}
+
+    def interval(self) -> float:
+        return max(self.min_interval, len(self._scheduled) / self.bucket.rate)
+
+    def _schedule(self, chat_id: int, due: float):
+        self._scheduled.add(chat_id)
+        heapq.heappush(self._heap, (due, chat_id))
+
+    def _discover(self, now: float):
+        for chat_id in active_calls.chats():
+            if chat_id not in self._scheduled:
+                self._schedule(chat_id, now + random.uniform(0, self.interval()))
+
+    def _drop(self, chat_id: int):
+        self._scheduled.discard(chat_id)
+        self._labels.pop(chat_id, None)
+
+    async def tick(self):
+        """Updates every chat whose turn has come, in due order."""
+        now = time.monotonic()
+        self._discover(now)
+        while self._heap and self._heap[0][0] <= now:
+            _, chat_id = heapq.heappop(self._heap)
+            if not active_calls.is_active(chat_id):
+                self._drop(chat_id)
+                continue
             try:
-                buttons = (
-                    stream_markup_timer(
-                        _,
-                        playing[0]["vidid"],
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
-                    if markup == "stream"
-                    else telegram_markup_timer(
-                        _,
-                        chat_id,
-                        seconds_to_min(playing[0]["played"]),
-                        playing[0]["dur"],
-                    )
-                )
-
-                await mystic.edit_reply_markup(
-                    reply_markup=InlineKeyboardMarkup(buttons)
-                )
-
+                await self._update(chat_id)
             except Exception:
-                continue
+                pass
+            self._schedule(chat_id, time.monotonic() + self.interval())
+
+    def _render(self, chat_id: int):
+        """Returns ``(track, label)`` for the playing track, or None to skip."""
+        playing = db.get(chat_id)
+        if not playing:
+            return None
+        track = playing[0]
+        if int(track["seconds"]) == 0:
+            return None
+        mystic = track.get("mystic")
+        if not mystic or not track.get("markup"):
+            return None
+        if wrong.get(chat_id, {}).get(mystic.id) is False:
+            return None
+        return track, (mystic.id, seconds_to_min(track["played"]))
+
+    async def _update(self, chat_id: int):
+        if not await is_music_playing(chat_id):
+            return
+        rendered = self._render(chat_id)
+        if rendered is None:
+            return
+        if self._labels.get(chat_id) == rendered[1]:
+            self.skipped += 1
+            return
+        await self.bucket.acquire()
+        # Waiting for a token may have taken a while, render again
+        rendered = self._render(chat_id)
+        if rendered is None:
+            return
+        track, label = rendered
+        language = await get_lang(chat_id)
+        _ = get_string(language)
+        buttons = (
+            stream_markup_timer(_, track["vidid"], chat_id, label[1], track["dur"])
+            if track["markup"] == "stream"
+            else telegram_markup_timer(_, chat_id, label[1], track["dur"])
+        )
+        try:
+            await track["mystic"].edit_reply_markup(
+                reply_markup=InlineKeyboardMarkup(buttons)
+            )
+        except FloodWait as e:
+            self.rate_limited += 1
+            self.bucket.pause(e.value)
+            return
+        except MessageNotModified:
+            pass
+        self.sent += 1
+        self._labels[chat_id] = label
+
+
+progress_updater = ProgressUpdater(
+    config.PROGRESS_EDIT_RATE, config.PROGRESS_MIN_INTERVAL
+)
 
 
-asyncio.create_task(timer(), name="timer")
-asyncio.create_task(markup_timer(), name="markup_timer")
-asyncio.create_task(leave_if_muted(), name="leave_if_muted")
+scheduler.add("watch_members", watch_members, interval=2)
+scheduler.add("leave_if_muted", leave_if_muted, interval=2)
+scheduler.add("progress_updater", progress_updater.tick, interval=1)
@@ -15,7 +15,6 @@ import socket
 from datetime import datetime
 
 import aiofiles
-import aiohttp
 import dotenv
 import heroku3
 from git import Repo
@@ -29,6 +28,7 @@ from config import BANNED_USERS
 from strings import command
 from YukkiMusic import app
 from YukkiMusic.core.call import Yukki
+from YukkiMusic.core.http import http
 from YukkiMusic.misc import HAPP, SUDOERS, XCB, db
 from YukkiMusic.utils import pastebin
 from YukkiMusic.utils.database import (
@@ -191,11 +191,10 @@ async def usage_dynos(client, message, _):
     }
     path = "/accounts/" + account_id + "/actions/get-quota"
     url = "https://api.heroku.com" + path
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers) as r:
-            if r.status != 200:
-                return await dyno.edit("Unable to fetch.")
-            result = await r.json()
+    async with http.get(url, headers=headers) as r:
+        if r.status != 200:
+            return await dyno.edit("Unable to fetch.")
+        result = await r.json()
     quota = result["account_quota"]
     quota_used = result["quota_used"]
     remaining_quota = quota - quota_used
@@ -0,0 +1,29 @@
+#
+# Copyright (C) 2024-2025 by TheTeamVivek@Github, < https://github.com/TheTeamVivek >.
+#
+# This file is part of < https://github.com/TheTeamVivek/YukkiMusic > project,
+# and is released under the MIT License.
+# Please see < https://github.com/TheTeamVivek/YukkiMusic/blob/master/LICENSE >
+#
+# All rights reserved.
+#
+
+from pyrogram.types import Message
+
+from strings import command
+from YukkiMusic import app
+from YukkiMusic.core.leaderboard import leaderboard
+from YukkiMusic.misc import SUDOERS
+from YukkiMusic.utils.decorators.language import language
+
+
+@app.on_message(command("REBUILDSTATS_COMMAND") & SUDOERS)
+@language
+async def rebuild_stats(client, message: Message, _):
+    mystic = await message.reply_text(_["rebuild_1"])
+    try:
+        await leaderboard.rebuild()
+    except Exception as e:
+        return await mystic.edit_text(_["rebuild_3"].format(type(e).__name__))
+    tracks, plays = leaderboard.summary()
+    await mystic.edit_text(_["rebuild_2"].format(tracks, plays))
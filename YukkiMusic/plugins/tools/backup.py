@@ -1,6 +1,7 @@
 import asyncio
 import os
 import shutil # For copying files safely
+from datetime import datetime
 import logging # For logging potential issues
 
 from pyrogram import filters
@@ -8,7 +9,7 @@ from pyrogram.errors import FloodWait, MessageIdInvalid # Added MessageIdInvalid
 
 from config import BANNED_USERS, OWNER_ID # MONGO_DB_URI is no longer needed here
 from YukkiMusic import app
-from YukkiMusic.core.sqlite import DB_FILE # Import the SQLite database file path
+from YukkiMusic.core.sqlite import DB_FILE, sqldb # Import the SQLite database file path
 
 LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +39,8 @@ async def export_database(client, message):
         return await edit_or_reply(mystic, f"Error: SQLite database file `{DB_FILE}` not found.")
 
     try:
+        # Flush the WAL so the exported file contains every committed write
+        await sqldb.checkpoint()
         # Send the SQLite database file
         await app.send_document(
             chat_id=message.chat.id,
@@ -107,6 +110,7 @@ async def import_database(client, message):
         # Make a quick backup of the *current* database before overwriting
         backup_current_db_path = f"{DB_FILE}.pre_import_backup_{datetime.now().strftime('%Y%m%d%H%M%S')}"
         if os.path.exists(DB_FILE):
+            await sqldb.checkpoint()
             shutil.copy2(DB_FILE, backup_current_db_path)
             LOGGER.info(f"Backed up current DB to: {backup_current_db_path}")
 
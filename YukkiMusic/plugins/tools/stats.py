@@ -14,22 +14,30 @@ import config
 from config import BANNED_USERS
 from strings import command
 from YukkiMusic import app
+from YukkiMusic.core.http import http
+from YukkiMusic.core.leaderboard import leaderboard
+from YukkiMusic.core.mediacache import media_cache
+from YukkiMusic.core.playstats import stats_flusher
+from YukkiMusic.core.prefetch import prefetcher
+from YukkiMusic.core.scheduler import scheduler
+from YukkiMusic.core.singleflight import flights
+from YukkiMusic.core.ytdlp import ytdlp
 # from YukkiMusic.core.mongo import mongodb # Removed MongoDB import
 from YukkiMusic.core.userbot import assistants
 from YukkiMusic.misc import SUDOERS
 from YukkiMusic.platforms import youtube
+from YukkiMusic.plugins.misc.seeker import progress_updater
 from YukkiMusic.utils.database.mongodatabase import ( # Assuming these are now SQLite-backed
-    get_global_tops,
     get_particulars,
     get_queries,
     get_served_chats,
     get_served_users,
     get_sudoers,
-    get_top_chats,
-    get_topp_users,
+    get_tops_summary,
     get_banned_count, # Added to use for blocked users count
 )
-from YukkiMusic.utils.decorators import asyncify, language, languageCB
+from YukkiMusic.utils.database.memorydatabase import get_settings_cache_stats
+from YukkiMusic.utils.decorators import language, languageCB
 from YukkiMusic.utils.inline.stats import (
     back_stats_buttons,
     back_stats_markup,
@@ -38,6 +46,7 @@ from YukkiMusic.utils.inline.stats import (
     stats_buttons,
     top_ten_stats_markup,
 )
+from YukkiMusic.utils.stream.stream import playlist_timings
 
 
 @app.on_message(command("STATS_COMMAND") & ~BANNED_USERS)
@@ -55,42 +64,15 @@ async def stats_global(client, message: Message, _):
 @language
 async def gstats_global(client, message: Message, _):
     mystic = await message.reply_text(_["gstats_1"])
-    stats = await get_global_tops()
-    if not stats:
+    # Served from the in-memory board; two rows are enough to skip "telegram"
+    stats = leaderboard.top_tracks(2)
+    videoid, co = next(
+        ((vidid, data["spot"]) for vidid, data in stats.items() if vidid != "telegram"),
+        (None, None),
+    )
+    if not videoid:
         await asyncio.sleep(1)
         return await mystic.edit(_["gstats_2"])
-
-    @asyncify
-    def get_stats():
-        results = {}
-        for i in stats:
-            top_list = stats[i]["spot"]
-            results[str(i)] = top_list
-            list_arranged = dict(
-                sorted(
-                    results.items(),
-                    key=lambda item: item[1],
-                    reverse=True,
-                )
-            )
-        if not results:
-            return mystic.edit(_["gstats_2"])
-        videoid = None
-        co = None
-        for vidid, count in list_arranged.items():
-            if vidid == "telegram":
-                continue
-            else:
-                videoid = vidid
-                co = count
-            break
-        return videoid, co
-
-    try:
-        videoid, co = await get_stats()
-    except Exception as e:
-        print(e)
-        return
     (
         title,
         duration_min,
@@ -126,74 +108,49 @@ async def top_users_ten(client, query, _):
             f"ᴏғ {query.message.chat.title}" if what == "Here" else what
         )
     )
+    # Global boards are materialized in memory, the chat board comes from SQLite
     if what == "Tracks":
-        stats = await get_global_tops()
+        stats = leaderboard.top_tracks(10)
     elif what == "Chats":
-        stats = await get_top_chats()
+        stats = leaderboard.top_chats(10)
     elif what == "Users":
-        stats = await get_topp_users()
+        stats = leaderboard.top_users(10)
     elif what == "Here":
-        stats = await get_particulars(chat_id)
+        stats = await get_particulars(chat_id, limit=10)
     if not stats:
         await asyncio.sleep(1)
         return await mystic.edit(_["gstats_2"], reply_markup=upl)
     queries = await get_queries()
+    msg = ""
+    limit = 0
+    if what in ["Tracks", "Here"]:
+        if what == "Tracks":
+            tracks, total_count = leaderboard.summary()
+        else:
+            tracks, total_count = await get_tops_summary(chat_id)
+        for items, details in stats.items():
+            limit += 1
+            count = details["spot"]
+            title = ((details["title"] or "")[:35]).title()
+            if items == "telegram":
+                msg += f"🔗[TelegramVideos and media's](https://t.me/telegram) ** Played {count} Times**\n\n"
+            else:
+                msg += f"🔗 [{title}](https://www.youtube.com/watch?v={items}) ** Played {count} Times**\n\n"
 
-    @asyncify
-    def get_stats():
-        results = {}
-        for i in stats:
-            top_list = stats[i] if what in ["Chats", "Users"] else stats[i]["spot"]
-            results[str(i)] = top_list
-            list_arranged = dict(
-                sorted(
-                    results.items(),
-                    key=lambda item: item[1],
-                    reverse=True,
-                )
-            )
-        if not results:
-            return mystic.edit(_["gstats_2"], reply_markup=upl)
-        msg = ""
-        limit = 0
-        total_count = 0
-        if what in ["Tracks", "Here"]:
-            for items, count in list_arranged.items():
-                total_count += count
-                if limit == 10:
-                    continue
-                limit += 1
-                details = stats.get(items)
-                title = (details["title"][:35]).title()
-                if items == "telegram":
-                    msg += f"🔗[TelegramVideos and media's](https://t.me/telegram) ** Played {count} Times**\n\n"
-                else:
-                    msg += f"🔗 [{title}](https://www.youtube.com/watch?v={items}) ** Played {count} Times**\n\n"
-
-            temp = (
-                _["gstats_4"].format(
-                    queries,
-                    app.mention,
-                    len(stats),
-                    total_count,
-                    limit,
-                )
-                if what == "Tracks"
-                else _["gstats_7"].format(len(stats), total_count, limit)
+        temp = (
+            _["gstats_4"].format(
+                queries,
+                app.mention,
+                tracks,
+                total_count,
+                limit,
             )
-            msg = temp + msg
-        return msg, list_arranged
-
-    try:
-        msg, list_arranged = await get_stats()
-    except Exception as e:
-        print(e)
-        return
-    limit = 0
-    if what in ["Users", "Chats"]:
-        for items, count in list_arranged.items():
-            if limit == 10:
-                break
+            if what == "Tracks"
+            else _["gstats_7"].format(tracks, total_count, limit)
+        )
+        msg = temp + msg
+    else:
+        for items, count in stats.items():
             try:
                 extract = (
                     (await app.get_users(items)).first_name
@@ -336,6 +293,14 @@ async def bot_stats(client, query, _):
     # blocked = len(BANNED_USERS) # BANNED_USERS is a filter, not a direct count of banned users from DB
     blocked = await get_banned_count() # Use the SQLite function to get count from DB
     sudoers = len(await get_sudoers()) # Get actual sudoers count from DB
+    cache_stats = get_settings_cache_stats().values()
+    cache_size = sum(c["size"] for c in cache_stats)
+    cache_hits = sum(c["hits"] for c in cache_stats)
+    cache_lookups = cache_hits + sum(c["misses"] for c in cache_stats)
+    cache_ratio = round(cache_hits * 100 / cache_lookups, 1) if cache_lookups else 0
+    jobs = scheduler.stats()
+    job_failures = sum(j["failures"] for j in jobs)
+    job_lag = max((j["max_lag_ms"] for j in jobs), default=0)
 
     text = f""" **Bot Stats and information:**
 
@@ -357,6 +322,17 @@ async def bot_stats(client, query, _):
 **Total DB Collection:** {collections}
 **Total DB Keys:** {objects}
 **Total Bot Queries:** `{total_queries} `
+**Stats Queue Depth:** {stats_flusher.depth}
+**Settings Cache:** {cache_size} ᴋᴇʏs, {cache_ratio}% ʜɪᴛs
+**Stats Flush Latency:** {stats_flusher.last_flush_ms:.1f} ᴍs (max {stats_flusher.max_flush_ms:.1f} ᴍs)
+**Progress Edits:** {progress_updater.sent} sent, {progress_updater.skipped} skipped, {progress_updater.rate_limited} rate-limited
+**Background Jobs:** {len(jobs)}, {job_failures} failures, max lag {job_lag:.0f} ᴍs
+**Track Switch:** {prefetcher.avg_switch_ms:.0f} ᴍs avg, prefetch {prefetcher.hits} hits / {prefetcher.misses} misses
+**Playlist First Audio:** {playlist_timings.avg_ms:.0f} ᴍs avg over {playlist_timings.plays} plays
+**Media Cache:** {len(media_cache)} files, {media_cache.size / 1024 / 1024:.0f}/{config.MEDIA_CACHE_SIZE} ᴍʙ, {media_cache.hit_ratio * 100:.1f}% ʜɪᴛs
+**Coalesced Lookups:** {flights.shared} shared, {flights.started} started, {len(flights)} in flight
+**yt-dlp Workers:** {ytdlp.workers}, {ytdlp.jobs} jobs, {ytdlp.failures} failures, {ytdlp.timeouts} timeouts
+**HTTP Requests:** {http.requests}, {http.retried} retried, {http.failures} failed
     """
     med = InputMediaPhoto(media=config.STATS_IMG_URL, caption=text)
     try:
@@ -1,16 +1,28 @@
 import random
-import sqlite3
 
 from pytgcalls import PyTgCalls
 
 # REMOVED: from YukkiMusic import userbot
-from YukkiMusic.core.sqlite import get_db_connection, DB_FILE # Import from your new sqlite.py
+from YukkiMusic.core.sqlite import sqldb # Pooled async access to yukki.db
 
 # A simple in-memory cache, similar to the original assistantdict
 assistantdict = {}
 
-# We'll manage the database interaction directly in these functions.
-# No direct 'db = mongodb.assistants' equivalent needed.
+# Table: assistants (chat_id INTEGER PRIMARY KEY, assistant_number INTEGER)
+
+
+async def _fetch_assistant(chat_id: int) -> int | None:
+    return await sqldb.fetchval(
+        "SELECT assistant_number FROM assistants WHERE chat_id = ?", (chat_id,)
+    )
+
+
+async def _store_assistant(chat_id: int, number: int):
+    await sqldb.execute(
+        "INSERT OR REPLACE INTO assistants (chat_id, assistant_number) VALUES (?, ?)",
+        (chat_id, number),
+    )
+
 
 async def get_client(assistant: int):
     """
@@ -31,20 +43,8 @@ async def save_assistant(chat_id: int, number: int):
     number = int(number)
     assistantdict[chat_id] = number
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO assistants (chat_id, assistant_number) VALUES (?, ?)",
-            (chat_id, number)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error saving assistant for chat_id {chat_id}: {e}")
-        # Depending on your error handling strategy, you might want to re-raise or log.
-    finally:
-        conn.close()
-    
+    await _store_assistant(chat_id, number)
+
     # The original function returned await get_assistant(chat_id)
     # which would then return the userbot client. Let's maintain that behavior.
     return await get_client(number)
@@ -58,19 +58,7 @@ async def set_assistant(chat_id: int):
     from YukkiMusic.core.userbot import assistants # This import is fine as it's from core.userbot
     from YukkiMusic import userbot # Import userbot locally here too, if get_client needs it
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    current_assistant = None
-    try:
-        cursor.execute("SELECT assistant_number FROM assistants WHERE chat_id = ?", (chat_id,))
-        db_record = cursor.fetchone()
-        if db_record:
-            current_assistant = db_record['assistant_number']
-    except sqlite3.Error as e:
-        print(f"Error fetching current assistant for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    current_assistant = await _fetch_assistant(chat_id)
 
     # Ensure assistants list is not empty before random.choice
     if not assistants:
@@ -88,18 +76,7 @@ async def set_assistant(chat_id: int):
     assistantdict[chat_id] = ran_assistant
     
     # Save the chosen assistant to the database
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO assistants (chat_id, assistant_number) VALUES (?, ?)",
-            (chat_id, ran_assistant)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting random assistant for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await _store_assistant(chat_id, ran_assistant)
 
     userbot_client = await get_client(ran_assistant)
     return userbot_client
@@ -126,18 +103,7 @@ async def get_assistant(chat_id: int):
             return userbot_client
     else:
         # Not in cache, try database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        db_assistant = None
-        try:
-            cursor.execute("SELECT assistant_number FROM assistants WHERE chat_id = ?", (chat_id,))
-            db_record = cursor.fetchone()
-            if db_record:
-                db_assistant = db_record['assistant_number']
-        except sqlite3.Error as e:
-            print(f"Error fetching assistant from DB for chat_id {chat_id}: {e}")
-        finally:
-            conn.close()
+        db_assistant = await _fetch_assistant(chat_id)
 
         if db_assistant:
             if db_assistant in assistants:
@@ -168,19 +134,7 @@ async def set_calls_assistant(chat_id: int):
 
     ran_assistant = random.choice(assistants)
     assistantdict[chat_id] = ran_assistant
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO assistants (chat_id, assistant_number) VALUES (?, ?)",
-            (chat_id, ran_assistant)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting calls assistant for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await _store_assistant(chat_id, ran_assistant)
 
     return ran_assistant
 
@@ -203,18 +157,7 @@ async def group_assistant(self, chat_id: int) -> PyTgCalls:
             assis = await set_calls_assistant(chat_id)
     else:
         # Not in cache, try database
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        db_assistant_num = None
-        try:
-            cursor.execute("SELECT assistant_number FROM assistants WHERE chat_id = ?", (chat_id,))
-            db_record = cursor.fetchone()
-            if db_record:
-                db_assistant_num = db_record['assistant_number']
-        except sqlite3.Error as e:
-            print(f"Error fetching group assistant from DB for chat_id {chat_id}: {e}")
-        finally:
-            conn.close()
+        db_assistant_num = await _fetch_assistant(chat_id)
 
         if db_assistant_num:
             if db_assistant_num in assistants:
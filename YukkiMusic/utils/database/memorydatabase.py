@@ -1,282 +1,228 @@
 import json # Import json for serialization
-import sqlite3
 from pytgcalls import types as _types
 
 import config
-from YukkiMusic.core.sqlite import get_db_connection # Import from your new sqlite.py
+from YukkiMusic.core.cache import MISSING, TTLCache
+from YukkiMusic.core.registry import active_calls
+from YukkiMusic.core.sqlite import sqldb # Pooled async access to yukki.db
 
-# No direct 'db' objects for MongoDB collections needed anymore.
-# We'll interact with the DB via get_db_connection()
+# Persistent settings go through the shared sqldb engine, which runs queries
+# off the event loop on long-lived pooled connections.
+
+# Per-chat settings are loaded together as a ChatContext and kept in a bounded
+# LRU/TTL cache, so a bot in a huge number of groups only keeps the recently
+# active ones in memory. Setters write the database first and then drop the
+# cached context, so the next read loads it again.
+SETTINGS_CACHE_SIZE = 20000
+SETTINGS_CACHE_TTL = 3600
 
 # Shifting to memory [ mongo sucks often] - These will remain in-memory
-audio = {}
-video = {}
-loop = {}
-playtype = {}
-playmode = {}
-channelconnect = {}
-langm = {}
-pause = {}
-mute = {}
-active = []
-activevideo = []
+chat_contexts = TTLCache(SETTINGS_CACHE_SIZE, SETTINGS_CACHE_TTL)
+_context_generations = {} # chat_id -> times its context was invalidated
 command = [] # Command delete mode
 cleanmode = [] # Clean mode
-nonadmin = {} # Non-admin chat
 vlimit = [] # Video stream limit (though this one is also fetched from DB)
 maintenance = []
 autoend = {}
 greeting_message = {"welcome": {}, "goodbye": {}}
 
 
+# --- Chat Context ---
+# Every persistent per-chat setting the command decorators need, read in one
+# query. Tables: language, playtype, playmode, channelplaymode, adminauth,
+# private_chats
+
+class ChatContext:
+    __slots__ = ("chat_id", "lang", "playtype", "playmode", "cmode", "nonadmin", "private")
+
+    def __init__(
+        self,
+        chat_id: int,
+        lang: str | None = None,
+        playtype: str | None = None,
+        playmode: str | None = None,
+        cmode: int | None = None,
+        nonadmin: bool = False,
+        private: bool = False,
+    ):
+        self.chat_id = chat_id
+        self.lang = lang or "en"
+        self.playtype = playtype or "Everyone"
+        self.playmode = playmode or "Direct"
+        self.cmode = cmode
+        self.nonadmin = bool(nonadmin)
+        self.private = bool(private)
+
+
+async def get_chat_context(chat_id: int) -> ChatContext:
+    context = chat_contexts.get(chat_id)
+    if context is not MISSING:
+        return context
+    generation = _context_generations.get(chat_id, 0)
+    record = await sqldb.fetchone(
+        "SELECT "
+        "(SELECT lang FROM language WHERE chat_id = :id), "
+        "(SELECT mode FROM playtype WHERE chat_id = :id), "
+        "(SELECT mode FROM playmode WHERE chat_id = :id), "
+        "(SELECT mode FROM channelplaymode WHERE chat_id = :id), "
+        "EXISTS (SELECT 1 FROM adminauth WHERE chat_id = :id), "
+        "EXISTS (SELECT 1 FROM private_chats WHERE chat_id = :id)",
+        {"id": chat_id},
+    )
+    context = ChatContext(chat_id, *record) if record else ChatContext(chat_id)
+    # Don't cache defaults that came from a failed query, or a row read before
+    # a setter committed while this query was running
+    if record and _context_generations.get(chat_id, 0) == generation:
+        chat_contexts.set(chat_id, context)
+    return context
+
+
+def invalidate_chat_context(chat_id: int):
+    """Drops the cached context, and any load that was already running."""
+    _context_generations[chat_id] = _context_generations.get(chat_id, 0) + 1
+    chat_contexts.pop(chat_id)
+
+
+async def write_chat_setting(chat_id: int, sql: str, params=()) -> bool:
+    """Runs a setting's write and invalidates the context if it committed."""
+    rowcount = await sqldb.run(lambda conn: conn.execute(sql, params).rowcount)
+    if rowcount is None:
+        return False
+    invalidate_chat_context(chat_id)
+    return True
+
+
+def get_settings_cache_stats() -> dict[str, dict]:
+    return {"chat_context": chat_contexts.stats()}
+
+
 # --- Filters Database Operations ---
-# Table: filters (chat_id INTEGER PRIMARY KEY, filters_data TEXT)
+# Table: filters (chat_id, name, data) - one row per filter, data is its JSON
 
 async def get_filters_count() -> dict:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    chats_count = 0
-    filters_count = 0
-    try:
-        # Assuming chat_id < 0 for group chats as per MongoDB query
-        cursor.execute("SELECT chat_id, filters_data FROM filters WHERE chat_id < 0")
-        chats = cursor.fetchall()
-        chats_count = len(chats)
-        for chat in chats:
-            filters_data = json.loads(chat['filters_data'])
-            filters_count += len(filters_data)
-    except sqlite3.Error as e:
-        print(f"Error getting filters count: {e}")
-    finally:
-        conn.close()
+    # Assuming chat_id < 0 for group chats as per MongoDB query
+    record = await sqldb.fetchone(
+        "SELECT COUNT(DISTINCT chat_id) AS chats_count, COUNT(*) AS filters_count "
+        "FROM filters WHERE chat_id < 0"
+    )
     return {
-        "chats_count": chats_count,
-        "filters_count": filters_count,
+        "chats_count": record["chats_count"] if record else 0,
+        "filters_count": record["filters_count"] if record else 0,
     }
 
 
 async def _get_filters(chat_id: int) -> dict[str, int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    _filters = {}
-    try:
-        cursor.execute("SELECT filters_data FROM filters WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            _filters = json.loads(record['filters_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching filters for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return _filters
+    records = await sqldb.fetchall(
+        "SELECT name, data FROM filters WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return {record["name"]: json.loads(record["data"]) for record in records}
 
 
 async def get_filters_names(chat_id: int) -> list[str]:
-    _filters = await _get_filters(chat_id)
-    return list(_filters.keys())
+    records = await sqldb.fetchall(
+        "SELECT name FROM filters WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return [record["name"] for record in records]
 
 
 async def get_filter(chat_id: int, name: str) -> bool | dict:
     name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    return _filters.get(name, False)
+    data = await sqldb.fetchval(
+        "SELECT data FROM filters WHERE chat_id = ? AND name = ?", (chat_id, name)
+    )
+    return json.loads(data) if data else False
 
 
 async def save_filter(chat_id: int, name: str, _filter: dict):
     name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    _filters[name] = _filter
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        filters_json = json.dumps(_filters)
-        cursor.execute(
-            "INSERT OR REPLACE INTO filters (chat_id, filters_data) VALUES (?, ?)",
-            (chat_id, filters_json)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error saving filter for chat_id {chat_id}, name {name}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT INTO filters (chat_id, name, data) VALUES (?, ?, ?) "
+        "ON CONFLICT(chat_id, name) DO UPDATE SET data = excluded.data",
+        (chat_id, name, json.dumps(_filter)),
+    )
 
 
 async def delete_filter(chat_id: int, name: str) -> bool:
-    filtersd = await _get_filters(chat_id)
     name = name.lower().strip()
-    if name in filtersd:
-        del filtersd[name]
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            if filtersd: # If there are still filters, update the record
-                filters_json = json.dumps(filtersd)
-                cursor.execute(
-                    "UPDATE filters SET filters_data = ? WHERE chat_id = ?",
-                    (filters_json, chat_id)
-                )
-            else: # If no filters left, delete the record
-                cursor.execute("DELETE FROM filters WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"Error deleting filter for chat_id {chat_id}, name {name}: {e}")
-        finally:
-            conn.close()
-    return False
+    deleted = await sqldb.execute(
+        "DELETE FROM filters WHERE chat_id = ? AND name = ?", (chat_id, name)
+    )
+    return deleted > 0
 
 
 async def deleteall_filters(chat_id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM filters WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error deleting all filters for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM filters WHERE chat_id = ?", (chat_id,))
 
 
 # --- Notes Database Operations ---
-# Table: notes (chat_id INTEGER PRIMARY KEY, notes_data TEXT, private_note BOOLEAN)
+# Table: notes (chat_id, name, data) - one row per note, data is its JSON
+# Table: note_settings (chat_id INTEGER PRIMARY KEY, private_note BOOLEAN)
 
 async def get_notes_count() -> dict:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    chats_count = 0
-    notes_count = 0
-    try:
-        cursor.execute("SELECT chat_id, notes_data FROM notes")
-        chats = cursor.fetchall()
-        chats_count = len(chats)
-        for chat in chats:
-            notes_data = json.loads(chat['notes_data'])
-            notes_count += len(notes_data)
-    except sqlite3.Error as e:
-        print(f"Error getting notes count: {e}")
-    finally:
-        conn.close()
-    return {"chats_count": chats_count, "notes_count": notes_count}
+    record = await sqldb.fetchone(
+        "SELECT COUNT(DISTINCT chat_id) AS chats_count, COUNT(*) AS notes_count FROM notes"
+    )
+    return {
+        "chats_count": record["chats_count"] if record else 0,
+        "notes_count": record["notes_count"] if record else 0,
+    }
 
 
 async def _get_notes(chat_id: int) -> dict[str, int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    _notes = {}
-    try:
-        cursor.execute("SELECT notes_data FROM notes WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            _notes = json.loads(record['notes_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching notes for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return _notes
+    records = await sqldb.fetchall(
+        "SELECT name, data FROM notes WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return {record["name"]: json.loads(record["data"]) for record in records}
 
 
 async def get_note_names(chat_id: int) -> list[str]:
-    _notes = await _get_notes(chat_id)
-    return list(_notes.keys())
+    records = await sqldb.fetchall(
+        "SELECT name FROM notes WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return [record["name"] for record in records]
 
 
 async def get_note(chat_id: int, name: str) -> bool | dict:
     name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    return _notes.get(name, False)
+    data = await sqldb.fetchval(
+        "SELECT data FROM notes WHERE chat_id = ? AND name = ?", (chat_id, name)
+    )
+    return json.loads(data) if data else False
 
 
 async def save_note(chat_id: int, name: str, note: dict):
     name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    _notes[name] = note
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        notes_json = json.dumps(_notes)
-        cursor.execute(
-            "INSERT OR REPLACE INTO notes (chat_id, notes_data) VALUES (?, ?)",
-            (chat_id, notes_json)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error saving note for chat_id {chat_id}, name {name}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT INTO notes (chat_id, name, data) VALUES (?, ?, ?) "
+        "ON CONFLICT(chat_id, name) DO UPDATE SET data = excluded.data",
+        (chat_id, name, json.dumps(note)),
+    )
 
 
 async def delete_note(chat_id: int, name: str) -> bool:
-    notesd = await _get_notes(chat_id)
     name = name.lower().strip()
-    if name in notesd:
-        del notesd[name]
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            if notesd: # If there are still notes, update the record
-                notes_json = json.dumps(notesd)
-                cursor.execute(
-                    "UPDATE notes SET notes_data = ? WHERE chat_id = ?",
-                    (notes_json, chat_id)
-                )
-            else: # If no notes left, delete the record
-                cursor.execute("DELETE FROM notes WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"Error deleting note for chat_id {chat_id}, name {name}: {e}")
-        finally:
-            conn.close()
-    return False
+    deleted = await sqldb.execute(
+        "DELETE FROM notes WHERE chat_id = ? AND name = ?", (chat_id, name)
+    )
+    return deleted > 0
 
 
 async def deleteall_notes(chat_id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM notes WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error deleting all notes for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM notes WHERE chat_id = ?", (chat_id,))
 
 
 async def set_private_note(chat_id: int, private_note: bool):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        # Notes can have private_note or notes_data or both.
-        # Ensure we don't overwrite notes_data if it exists.
-        cursor.execute(
-            "INSERT INTO notes (chat_id, private_note) VALUES (?, ?) "
-            "ON CONFLICT(chat_id) DO UPDATE SET private_note = ?",
-            (chat_id, private_note, private_note)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting private note for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR REPLACE INTO note_settings (chat_id, private_note) VALUES (?, ?)",
+        (chat_id, private_note),
+    )
 
 
 async def is_pnote_on(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    private_note = False
-    try:
-        cursor.execute("SELECT private_note FROM notes WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record and record['private_note'] is not None:
-            private_note = bool(record['private_note']) # SQLite stores bool as 0 or 1
-    except sqlite3.Error as e:
-        print(f"Error checking private note for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return private_note
+    private_note = await sqldb.fetchval(
+        "SELECT private_note FROM note_settings WHERE chat_id = ?", (chat_id,), default=0
+    )
+    return bool(private_note) # SQLite stores bool as 0 or 1
 
 
 # --- Auto End Stream ---
@@ -287,20 +233,9 @@ async def is_autoend() -> bool:
     mode = autoend.get(chat_id)
     if mode is not None: # Check if it's already in the in-memory cache
         return mode
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_on_db = False
-    try:
-        cursor.execute("SELECT chat_id FROM autoend WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            is_on_db = True
-    except sqlite3.Error as e:
-        print(f"Error checking autoend from DB: {e}")
-    finally:
-        conn.close()
-    
+    is_on_db = await sqldb.exists(
+        "SELECT 1 FROM autoend WHERE chat_id = ?", (chat_id,)
+    )
     autoend[chat_id] = is_on_db # Update in-memory cache
     return is_on_db
 
@@ -308,257 +243,136 @@ async def is_autoend() -> bool:
 async def autoend_on():
     chat_id = 123 # Hardcoded chat_id as in original
     autoend[chat_id] = True
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO autoend (chat_id) VALUES (?)", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error turning autoend on: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("INSERT OR IGNORE INTO autoend (chat_id) VALUES (?)", (chat_id,))
 
 
 async def autoend_off():
     chat_id = 123 # Hardcoded chat_id as in original
     autoend[chat_id] = False
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM autoend WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error turning autoend off: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM autoend WHERE chat_id = ?", (chat_id,))
 
 
 # --- LOOP PLAY (In-Memory Only) ---
-# This functionality seems to be purely in-memory in the original, so no DB changes.
+# Loop, mute, pause, active chats and bitrates live on the CallState records
+# of core/registry.active_calls.
 async def get_loop(chat_id: int) -> int:
-    return loop.get(chat_id, 0) # Default to 0 if not set
+    state = active_calls.get(chat_id)
+    return state.loop if state else 0
 
 async def set_loop(chat_id: int, mode: int):
-    loop[chat_id] = mode
+    active_calls.update(chat_id, loop=mode)
 
 
 # --- Channel Play IDS ---
 # Table: channelplaymode (chat_id INTEGER PRIMARY KEY, mode INTEGER)
 
 async def get_cmode(chat_id: int) -> int | None:
-    mode = channelconnect.get(chat_id)
-    if mode is not None:
-        return mode
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    db_mode = None
-    try:
-        cursor.execute("SELECT mode FROM channelplaymode WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            db_mode = record['mode']
-    except sqlite3.Error as e:
-        print(f"Error fetching channel mode for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    
-    if db_mode is not None:
-        channelconnect[chat_id] = db_mode
-    return db_mode
+    return (await get_chat_context(chat_id)).cmode
 
 
 async def set_cmode(chat_id: int, mode: int):
-    channelconnect[chat_id] = mode
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO channelplaymode (chat_id, mode) VALUES (?, ?)",
-            (chat_id, mode)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting channel mode for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id,
+        "INSERT OR REPLACE INTO channelplaymode (chat_id, mode) VALUES (?, ?)",
+        (chat_id, mode),
+    )
 
 
 # --- PLAY TYPE WHETHER ADMINS ONLY OR EVERYONE ---
 # Table: playtype (chat_id INTEGER PRIMARY KEY, mode TEXT)
 
 async def get_playtype(chat_id: int) -> str:
-    mode = playtype.get(chat_id)
-    if mode is not None:
-        return mode
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    db_mode = "Everyone"
-    try:
-        cursor.execute("SELECT mode FROM playtype WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            db_mode = record['mode']
-    except sqlite3.Error as e:
-        print(f"Error fetching playtype for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    
-    playtype[chat_id] = db_mode
-    return db_mode
+    return (await get_chat_context(chat_id)).playtype
 
 
 async def set_playtype(chat_id: int, mode: str):
-    playtype[chat_id] = mode
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO playtype (chat_id, mode) VALUES (?, ?)",
-            (chat_id, mode)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting playtype for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id,
+        "INSERT OR REPLACE INTO playtype (chat_id, mode) VALUES (?, ?)",
+        (chat_id, mode),
+    )
 
 
 # --- play mode whether inline or direct query ---
 # Table: playmode (chat_id INTEGER PRIMARY KEY, mode TEXT)
 
 async def get_playmode(chat_id: int) -> str:
-    mode = playmode.get(chat_id)
-    if mode is not None:
-        return mode
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    db_mode = "Direct"
-    try:
-        cursor.execute("SELECT mode FROM playmode WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            db_mode = record['mode']
-    except sqlite3.Error as e:
-        print(f"Error fetching playmode for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    
-    playmode[chat_id] = db_mode
-    return db_mode
+    return (await get_chat_context(chat_id)).playmode
 
 
 async def set_playmode(chat_id: int, mode: str):
-    playmode[chat_id] = mode
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO playmode (chat_id, mode) VALUES (?, ?)",
-            (chat_id, mode)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting playmode for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id,
+        "INSERT OR REPLACE INTO playmode (chat_id, mode) VALUES (?, ?)",
+        (chat_id, mode),
+    )
 
 
 # --- language ---
 # Table: language (chat_id INTEGER PRIMARY KEY, lang TEXT)
 
 async def get_lang(chat_id: int) -> str:
-    mode = langm.get(chat_id)
-    if mode is not None:
-        return mode
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    db_lang = "en"
-    try:
-        cursor.execute("SELECT lang FROM language WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            db_lang = record['lang']
-    except sqlite3.Error as e:
-        print(f"Error fetching language for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    
-    langm[chat_id] = db_lang
-    return db_lang
+    return (await get_chat_context(chat_id)).lang
 
 
 async def set_lang(chat_id: int, lang: str):
-    langm[chat_id] = lang
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO language (chat_id, lang) VALUES (?, ?)",
-            (chat_id, lang)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting language for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id,
+        "INSERT OR REPLACE INTO language (chat_id, lang) VALUES (?, ?)",
+        (chat_id, lang),
+    )
 
 
 # --- Muted (In-Memory Only) ---
 async def is_muted(chat_id: int) -> bool:
-    return mute.get(chat_id, False) # Default to False
+    state = active_calls.get(chat_id)
+    return state.muted if state else False
 
 async def mute_on(chat_id: int):
-    mute[chat_id] = True
+    active_calls.update(chat_id, muted=True)
 
 async def mute_off(chat_id: int):
-    mute[chat_id] = False
+    active_calls.update(chat_id, muted=False)
 
 
 # --- Pause-Skip (In-Memory Only) ---
 async def is_music_playing(chat_id: int) -> bool:
-    return pause.get(chat_id, False) # Default to False
+    state = active_calls.get(chat_id)
+    return state.playing if state else False
 
 async def music_on(chat_id: int):
-    pause[chat_id] = True
+    active_calls.update(chat_id, playing=True)
 
 async def music_off(chat_id: int):
-    pause[chat_id] = False
+    active_calls.update(chat_id, playing=False)
 
 
 # --- Active Voice Chats (In-Memory Only) ---
 async def get_active_chats() -> list:
-    return active
+    return active_calls.chats()
 
 async def is_active_chat(chat_id: int) -> bool:
-    return chat_id in active
+    return active_calls.is_active(chat_id)
 
 async def add_active_chat(chat_id: int):
-    if chat_id not in active:
-        active.append(chat_id)
+    active_calls.add(chat_id)
 
 async def remove_active_chat(chat_id: int):
-    if chat_id in active:
-        active.remove(chat_id)
+    active_calls.remove(chat_id)
 
 
 # --- Active Video Chats (In-Memory Only) ---
 async def get_active_video_chats() -> list:
-    return activevideo
+    return active_calls.video_chats()
 
 async def is_active_video_chat(chat_id: int) -> bool:
-    return chat_id in activevideo
+    return active_calls.is_video(chat_id)
 
 async def add_active_video_chat(chat_id: int):
-    if chat_id not in activevideo:
-        activevideo.append(chat_id)
+    active_calls.add_video(chat_id)
 
 async def remove_active_video_chat(chat_id: int):
-    if chat_id in activevideo:
-        activevideo.remove(chat_id)
+    active_calls.remove_video(chat_id)
 
 
 # --- Delete command mode (In-Memory Only) ---
@@ -593,181 +407,86 @@ async def commanddelete_on(chat_id: int):
 # Table: adminauth (chat_id INTEGER PRIMARY KEY)
 
 async def check_nonadmin_chat(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_nonadmin = False
-    try:
-        cursor.execute("SELECT chat_id FROM adminauth WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            is_nonadmin = True
-    except sqlite3.Error as e:
-        print(f"Error checking nonadmin chat from DB for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return is_nonadmin
+    return await sqldb.exists(
+        "SELECT 1 FROM adminauth WHERE chat_id = ?", (chat_id,)
+    )
 
 
 async def is_nonadmin_chat(chat_id: int) -> bool:
-    mode = nonadmin.get(chat_id)
-    if mode is not None:
-        return mode
-    
-    is_nonadmin_db = await check_nonadmin_chat(chat_id) # Call the DB function
-    nonadmin[chat_id] = is_nonadmin_db # Update in-memory cache
-    return is_nonadmin_db
+    return (await get_chat_context(chat_id)).nonadmin
 
 
 async def add_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = True
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO adminauth (chat_id) VALUES (?)", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding nonadmin chat for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id,
+        "INSERT OR IGNORE INTO adminauth (chat_id) VALUES (?)",
+        (chat_id,),
+    )
 
 
 async def remove_nonadmin_chat(chat_id: int):
-    nonadmin[chat_id] = False
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM adminauth WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error removing nonadmin chat for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id, "DELETE FROM adminauth WHERE chat_id = ?", (chat_id,)
+    )
 
 
 # --- Video Limit ---
 # Table: videocalls (chat_id INTEGER PRIMARY KEY, limit_val INTEGER)
 
 async def is_video_allowed(chat_idd: int) -> bool: # Renamed parameter for clarity
-    chat_id = 123456 # Hardcoded chat_id as in original
-    
-    # Try to get limit from in-memory cache first
-    limit = vlimit[0] if vlimit else None
-    if limit is None: # If not in cache, fetch from DB
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        db_limit = config.VIDEO_STREAM_LIMIT # Default from config
-        try:
-            cursor.execute("SELECT limit_val FROM videocalls WHERE chat_id = ?", (chat_id,))
-            record = cursor.fetchone()
-            if record:
-                db_limit = record['limit_val']
-        except sqlite3.Error as e:
-            print(f"Error fetching video limit from DB: {e}")
-        finally:
-            conn.close()
-        
-        vlimit.clear()
-        vlimit.append(db_limit)
-        limit = db_limit
-    
+    limit = await get_video_limit()
     if limit == 0:
         return False
-    
-    count = len(await get_active_video_chats())
-    if int(count) == int(limit):
-        if not await is_active_video_chat(chat_idd):
+
+    if active_calls.video_count == int(limit):
+        if not active_calls.is_video(chat_idd):
             return False
     return True
 
 
 async def get_video_limit() -> int: # Changed return type to int
     chat_id = 123456 # Hardcoded chat_id as in original
-    
-    limit = vlimit[0] if vlimit else None
-    if limit is None:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        db_limit = config.VIDEO_STREAM_LIMIT
-        try:
-            cursor.execute("SELECT limit_val FROM videocalls WHERE chat_id = ?", (chat_id,))
-            record = cursor.fetchone()
-            if record:
-                db_limit = record['limit_val']
-        except sqlite3.Error as e:
-            print(f"Error fetching video limit from DB for get_video_limit: {e}")
-        finally:
-            conn.close()
-        vlimit.clear()
-        vlimit.append(db_limit)
-        limit = db_limit
-    return limit
+
+    # Try to get limit from in-memory cache first
+    if vlimit:
+        return vlimit[0]
+    db_limit = await sqldb.fetchval(
+        "SELECT limit_val FROM videocalls WHERE chat_id = ?",
+        (chat_id,),
+        default=config.VIDEO_STREAM_LIMIT, # Default from config
+    )
+    vlimit.clear()
+    vlimit.append(db_limit)
+    return db_limit
 
 
 async def set_video_limit(limt: int):
     chat_id = 123456 # Hardcoded chat_id as in original
     vlimit.clear()
     vlimit.append(limt)
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO videocalls (chat_id, limit_val) VALUES (?, ?)",
-            (chat_id, limt)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting video limit: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR REPLACE INTO videocalls (chat_id, limit_val) VALUES (?, ?)",
+        (chat_id, limt),
+    )
 
 
 # --- On Off ---
 # Table: onoff (setting_key INTEGER PRIMARY KEY)
 
 async def is_on_off(on_off_key: int) -> bool: # Renamed parameter for clarity
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_on = False
-    try:
-        cursor.execute("SELECT setting_key FROM onoff WHERE setting_key = ?", (on_off_key,))
-        record = cursor.fetchone()
-        if record:
-            is_on = True
-    except sqlite3.Error as e:
-        print(f"Error checking on/off status for key {on_off_key}: {e}")
-    finally:
-        conn.close()
-    return is_on
+    return await sqldb.exists(
+        "SELECT 1 FROM onoff WHERE setting_key = ?", (on_off_key,)
+    )
 
 
 async def add_on(on_off_key: int):
-    is_on = await is_on_off(on_off_key)
-    if is_on:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO onoff (setting_key) VALUES (?)", (on_off_key,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding on status for key {on_off_key}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR IGNORE INTO onoff (setting_key) VALUES (?)", (on_off_key,)
+    )
 
 
 async def add_off(on_off_key: int):
-    is_off = await is_on_off(on_off_key)
-    if not is_off:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM onoff WHERE setting_key = ?", (on_off_key,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding off status for key {on_off_key}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM onoff WHERE setting_key = ?", (on_off_key,))
 
 
 # --- Maintenance ---
@@ -804,19 +523,21 @@ async def maintenance_on():
 
 # --- Bitrate settings (In-Memory Only) ---
 async def save_audio_bitrate(chat_id: int, bitrate: str):
-    audio[chat_id] = bitrate
+    active_calls.update(chat_id, audio_quality=bitrate)
 
 async def save_video_bitrate(chat_id: int, bitrate: str):
-    video[chat_id] = bitrate
+    active_calls.update(chat_id, video_quality=bitrate)
 
 async def get_aud_bit_name(chat_id: int) -> str:
-    return audio.get(chat_id, "STUDIO")
+    state = active_calls.get(chat_id)
+    return state.audio_quality if state else "STUDIO"
 
 async def get_vid_bit_name(chat_id: int) -> str:
-    return video.get(chat_id, "UHD_4K")
+    state = active_calls.get(chat_id)
+    return state.video_quality if state else "UHD_4K"
 
 async def get_audio_bitrate(chat_id: int) -> str:
-    mode = audio.get(chat_id, "STUDIO")
+    mode = await get_aud_bit_name(chat_id)
     return {
         "STUDIO": _types.AudioQuality.STUDIO,
         "HIGH": _types.AudioQuality.HIGH,
@@ -825,7 +546,7 @@ async def get_audio_bitrate(chat_id: int) -> str:
     }.get(mode, _types.AudioQuality.STUDIO)
 
 async def get_video_bitrate(chat_id: int) -> str:
-    mode = video.get(chat_id, "UHD_4K")
+    mode = await get_vid_bit_name(chat_id)
     return {
         "UHD_4K": _types.VideoQuality.UHD_4K,
         "QHD_2K": _types.VideoQuality.QHD_2K,
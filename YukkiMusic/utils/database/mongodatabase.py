@@ -1,536 +1,311 @@
 import json # Import json for serialization
-import sqlite3
 
-from YukkiMusic.core.sqlite import get_db_connection # Import from your new sqlite.py
+from YukkiMusic.core.sqlite import sqldb # Pooled async access to yukki.db
+from YukkiMusic.utils.database.memorydatabase import write_chat_setting
 
-# No direct 'db' objects for MongoDB collections needed anymore.
-# We'll interact with the DB via get_db_connection()
+# All queries go through the shared sqldb engine, which runs them off the
+# event loop on long-lived pooled connections.
 
 playlist = [] # This appears to be an in-memory list, not directly database-backed.
 
 # --- Playlists Operations ---
-# Table: playlists (chat_id INTEGER PRIMARY KEY, notes_data TEXT)
-# Using 'notes_data' to maintain consistency with the original MongoDB structure's key for data.
+# Table: playlists (chat_id, name, videoid, title, duration) - one row per saved track
+
+
+def _playlist_item(record) -> dict:
+    return {
+        "videoid": record["videoid"],
+        "title": record["title"],
+        "duration": record["duration"],
+    }
 
 
 async def _get_playlists(chat_id: int) -> dict[str, dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    _playlists = {}
-    try:
-        cursor.execute("SELECT notes_data FROM playlists WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record and record['notes_data']:
-            _playlists = json.loads(record['notes_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching playlists for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return _playlists
+    records = await sqldb.fetchall(
+        "SELECT name, videoid, title, duration FROM playlists "
+        "WHERE chat_id = ? ORDER BY rowid",
+        (chat_id,),
+    )
+    return {record["name"]: _playlist_item(record) for record in records}
 
 
 async def get_playlist_names(chat_id: int) -> list[str]:
-    _playlists = await _get_playlists(chat_id)
-    return list(_playlists.keys())
+    records = await sqldb.fetchall(
+        "SELECT name FROM playlists WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return [record["name"] for record in records]
 
 
 async def get_playlist(chat_id: int, name: str) -> bool | dict:
     # name is used directly, not lowercased/stripped in original for playlist.
-    _playlists = await _get_playlists(chat_id)
-    return _playlists.get(name, False)
+    record = await sqldb.fetchone(
+        "SELECT videoid, title, duration FROM playlists WHERE chat_id = ? AND name = ?",
+        (chat_id, name),
+    )
+    return _playlist_item(record) if record else False
 
 
 async def save_playlist(chat_id: int, name: str, note: dict):
     # name is used directly
-    _playlists = await _get_playlists(chat_id)
-    _playlists[name] = note
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        playlists_json = json.dumps(_playlists)
-        cursor.execute(
-            "INSERT OR REPLACE INTO playlists (chat_id, notes_data) VALUES (?, ?)",
-            (chat_id, playlists_json)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error saving playlist for chat_id {chat_id}, name {name}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT INTO playlists (chat_id, name, videoid, title, duration) "
+        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(chat_id, name) DO UPDATE SET "
+        "videoid = excluded.videoid, title = excluded.title, duration = excluded.duration",
+        (chat_id, name, note.get("videoid"), note.get("title"), note.get("duration")),
+    )
 
 
 async def delete_playlist(chat_id: int, name: str) -> bool:
-    playlistsd = await _get_playlists(chat_id)
     # name is used directly
-    if name in playlistsd:
-        del playlistsd[name]
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            if playlistsd:
-                playlists_json = json.dumps(playlistsd)
-                cursor.execute(
-                    "UPDATE playlists SET notes_data = ? WHERE chat_id = ?",
-                    (playlists_json, chat_id)
-                )
-            else:
-                cursor.execute("DELETE FROM playlists WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"Error deleting playlist for chat_id {chat_id}, name {name}: {e}")
-        finally:
-            conn.close()
-    return False
+    deleted = await sqldb.execute(
+        "DELETE FROM playlists WHERE chat_id = ? AND name = ?", (chat_id, name)
+    )
+    return deleted > 0
 
 
 # --- Users Operations (tgusersdb) ---
 # Table: served_users (user_id INTEGER PRIMARY KEY)
 
 async def is_served_user(user_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_served = False
-    try:
-        cursor.execute("SELECT user_id FROM served_users WHERE user_id = ?", (user_id,))
-        record = cursor.fetchone()
-        if record:
-            is_served = True
-    except sqlite3.Error as e:
-        print(f"Error checking served user {user_id}: {e}")
-    finally:
-        conn.close()
-    return is_served
+    return await sqldb.exists(
+        "SELECT 1 FROM served_users WHERE user_id = ?", (user_id,)
+    )
 
 
 async def get_served_users() -> list[dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    users_list = []
-    try:
-        cursor.execute("SELECT user_id FROM served_users WHERE user_id > 0") # MongoDB equivalent of $gt 0
-        records = cursor.fetchall()
-        for record in records:
-            users_list.append({"user_id": record['user_id']}) # Mimic original output structure
-    except sqlite3.Error as e:
-        print(f"Error getting served users: {e}")
-    finally:
-        conn.close()
-    return users_list
+    records = await sqldb.fetchall(
+        "SELECT user_id FROM served_users WHERE user_id > 0" # MongoDB equivalent of $gt 0
+    )
+    return [{"user_id": record["user_id"]} for record in records] # Mimic original output structure
 
 
 async def add_served_user(user_id: int):
-    is_served = await is_served_user(user_id)
-    if is_served:
+    if await is_served_user(user_id):
         return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO served_users (user_id) VALUES (?)", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding served user {user_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR IGNORE INTO served_users (user_id) VALUES (?)", (user_id,)
+    )
 
 
 async def delete_served_user(user_id: int):
     # The original logic deletes even if not served, which is fine for SQLite.
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM served_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error deleting served user {user_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM served_users WHERE user_id = ?", (user_id,))
 
 
 # --- Served Chats Operations (chatsdb) ---
 # Table: served_chats (chat_id INTEGER PRIMARY KEY)
 
 async def get_served_chats() -> list[dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    chats_list = []
-    try:
-        cursor.execute("SELECT chat_id FROM served_chats WHERE chat_id < 0") # MongoDB equivalent of $lt 0
-        records = cursor.fetchall()
-        for record in records:
-            chats_list.append({"chat_id": record['chat_id']}) # Mimic original output structure
-    except sqlite3.Error as e:
-        print(f"Error getting served chats: {e}")
-    finally:
-        conn.close()
-    return chats_list
+    records = await sqldb.fetchall(
+        "SELECT chat_id FROM served_chats WHERE chat_id < 0" # MongoDB equivalent of $lt 0
+    )
+    return [{"chat_id": record["chat_id"]} for record in records] # Mimic original output structure
 
 
 async def is_served_chat(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_served = False
-    try:
-        cursor.execute("SELECT chat_id FROM served_chats WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            is_served = True
-    except sqlite3.Error as e:
-        print(f"Error checking served chat {chat_id}: {e}")
-    finally:
-        conn.close()
-    return is_served
+    return await sqldb.exists(
+        "SELECT 1 FROM served_chats WHERE chat_id = ?", (chat_id,)
+    )
 
 
 async def add_served_chat(chat_id: int):
-    is_served = await is_served_chat(chat_id)
-    if is_served:
+    if await is_served_chat(chat_id):
         return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO served_chats (chat_id) VALUES (?)", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding served chat {chat_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR IGNORE INTO served_chats (chat_id) VALUES (?)", (chat_id,)
+    )
 
 
 async def delete_served_chat(chat_id: int):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM served_chats WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error deleting served chat {chat_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM served_chats WHERE chat_id = ?", (chat_id,))
 
 
 # --- Blacklisted Chats Operations ---
 # Table: blacklisted_chats (chat_id INTEGER PRIMARY KEY)
 
 async def blacklisted_chats() -> list[int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    chats_list = []
-    try:
-        cursor.execute("SELECT chat_id FROM blacklisted_chats WHERE chat_id < 0")
-        records = cursor.fetchall()
-        for record in records:
-            chats_list.append(record['chat_id'])
-    except sqlite3.Error as e:
-        print(f"Error getting blacklisted chats: {e}")
-    finally:
-        conn.close()
-    return chats_list
+    records = await sqldb.fetchall(
+        "SELECT chat_id FROM blacklisted_chats WHERE chat_id < 0"
+    )
+    return [record["chat_id"] for record in records]
 
 
 async def blacklist_chat(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT chat_id FROM blacklisted_chats WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if not record:
-            cursor.execute("INSERT INTO blacklisted_chats (chat_id) VALUES (?)", (chat_id,))
-            conn.commit()
-            return True
-        return False
-    except sqlite3.Error as e:
-        print(f"Error blacklisting chat {chat_id}: {e}")
-        return False
-    finally:
-        conn.close()
+    added = await sqldb.execute(
+        "INSERT OR IGNORE INTO blacklisted_chats (chat_id) VALUES (?)", (chat_id,)
+    )
+    return added > 0
 
 
 async def whitelist_chat(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("SELECT chat_id FROM blacklisted_chats WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            cursor.execute("DELETE FROM blacklisted_chats WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return True
-        return False
-    except sqlite3.Error as e:
-        print(f"Error whitelisting chat {chat_id}: {e}")
-        return False
-    finally:
-        conn.close()
+    removed = await sqldb.execute(
+        "DELETE FROM blacklisted_chats WHERE chat_id = ?", (chat_id,)
+    )
+    return removed > 0
 
 
 # --- Private Served Chats Operations ---
 # Table: private_chats (chat_id INTEGER PRIMARY KEY)
 
 async def get_private_served_chats() -> list[dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    chats_list = []
-    try:
-        cursor.execute("SELECT chat_id FROM private_chats WHERE chat_id < 0")
-        records = cursor.fetchall()
-        for record in records:
-            chats_list.append({"chat_id": record['chat_id']})
-    except sqlite3.Error as e:
-        print(f"Error getting private served chats: {e}")
-    finally:
-        conn.close()
-    return chats_list
+    records = await sqldb.fetchall(
+        "SELECT chat_id FROM private_chats WHERE chat_id < 0"
+    )
+    return [{"chat_id": record["chat_id"]} for record in records]
 
 
 async def is_served_private_chat(chat_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_served = False
-    try:
-        cursor.execute("SELECT chat_id FROM private_chats WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            is_served = True
-    except sqlite3.Error as e:
-        print(f"Error checking private served chat {chat_id}: {e}")
-    finally:
-        conn.close()
-    return is_served
+    return await sqldb.exists(
+        "SELECT 1 FROM private_chats WHERE chat_id = ?", (chat_id,)
+    )
 
 
 async def add_private_chat(chat_id: int):
-    is_served = await is_served_private_chat(chat_id)
-    if is_served:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO private_chats (chat_id) VALUES (?)", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding private chat {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id, "INSERT OR IGNORE INTO private_chats (chat_id) VALUES (?)", (chat_id,)
+    )
 
 
 async def remove_private_chat(chat_id: int):
-    is_served = await is_served_private_chat(chat_id)
-    if not is_served:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM private_chats WHERE chat_id = ?", (chat_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error removing private chat {chat_id}: {e}")
-    finally:
-        conn.close()
+    await write_chat_setting(
+        chat_id, "DELETE FROM private_chats WHERE chat_id = ?", (chat_id,)
+    )
 
 
 # --- Auth Users DB Operations ---
-# Table: auth_users (chat_id INTEGER PRIMARY KEY, notes_data TEXT)
+# Table: auth_users (chat_id, token, auth_user_id, auth_name, admin_id, admin_name)
+
+
+def _authuser_item(record) -> dict:
+    return {
+        "auth_user_id": record["auth_user_id"],
+        "auth_name": record["auth_name"],
+        "admin_id": record["admin_id"],
+        "admin_name": record["admin_name"],
+    }
+
 
 async def _get_authusers(chat_id: int) -> dict[str, dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    _authusers = {}
-    try:
-        cursor.execute("SELECT notes_data FROM auth_users WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record and record['notes_data']:
-            _authusers = json.loads(record['notes_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching authusers for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return _authusers
+    records = await sqldb.fetchall(
+        "SELECT token, auth_user_id, auth_name, admin_id, admin_name FROM auth_users "
+        "WHERE chat_id = ? ORDER BY rowid",
+        (chat_id,),
+    )
+    return {record["token"]: _authuser_item(record) for record in records}
 
 
 async def get_authuser_names(chat_id: int) -> list[str]:
-    _authusers = await _get_authusers(chat_id)
-    return list(_authusers.keys())
+    records = await sqldb.fetchall(
+        "SELECT token FROM auth_users WHERE chat_id = ? ORDER BY rowid", (chat_id,)
+    )
+    return [record["token"] for record in records]
 
 
 async def get_authuser(chat_id: int, name: str) -> bool | dict:
     # name is used directly
-    _authusers = await _get_authusers(chat_id)
-    return _authusers.get(name, False)
+    record = await sqldb.fetchone(
+        "SELECT auth_user_id, auth_name, admin_id, admin_name FROM auth_users "
+        "WHERE chat_id = ? AND token = ?",
+        (chat_id, name),
+    )
+    return _authuser_item(record) if record else False
 
 
 async def save_authuser(chat_id: int, name: str, note: dict):
     # name is used directly
-    _authusers = await _get_authusers(chat_id)
-    _authusers[name] = note
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        authusers_json = json.dumps(_authusers)
-        cursor.execute(
-            "INSERT OR REPLACE INTO auth_users (chat_id, notes_data) VALUES (?, ?)",
-            (chat_id, authusers_json)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error saving authuser for chat_id {chat_id}, name {name}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT INTO auth_users (chat_id, token, auth_user_id, auth_name, admin_id, admin_name) "
+        "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(chat_id, token) DO UPDATE SET "
+        "auth_user_id = excluded.auth_user_id, auth_name = excluded.auth_name, "
+        "admin_id = excluded.admin_id, admin_name = excluded.admin_name",
+        (
+            chat_id,
+            name,
+            note.get("auth_user_id"),
+            note.get("auth_name"),
+            note.get("admin_id"),
+            note.get("admin_name"),
+        ),
+    )
 
 
 async def delete_authuser(chat_id: int, name: str) -> bool:
-    authusersd = await _get_authusers(chat_id)
     # name is used directly
-    if name in authusersd:
-        del authusersd[name]
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        try:
-            if authusersd:
-                authusers_json = json.dumps(authusersd)
-                cursor.execute(
-                    "UPDATE auth_users SET notes_data = ? WHERE chat_id = ?",
-                    (authusers_json, chat_id)
-                )
-            else:
-                cursor.execute("DELETE FROM auth_users WHERE chat_id = ?", (chat_id,))
-            conn.commit()
-            return True
-        except sqlite3.Error as e:
-            print(f"Error deleting authuser for chat_id {chat_id}, name {name}: {e}")
-        finally:
-            conn.close()
-    return False
+    deleted = await sqldb.execute(
+        "DELETE FROM auth_users WHERE chat_id = ? AND token = ?", (chat_id, name)
+    )
+    return deleted > 0
 
 
 # --- Global Bans Operations (gbansdb) ---
 # Table: gbanned_users (user_id INTEGER PRIMARY KEY)
 
 async def get_gbanned() -> list[int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    results = []
-    try:
-        cursor.execute("SELECT user_id FROM gbanned_users WHERE user_id > 0")
-        records = cursor.fetchall()
-        for record in records:
-            results.append(record['user_id'])
-    except sqlite3.Error as e:
-        print(f"Error getting gbanned users: {e}")
-    finally:
-        conn.close()
-    return results
+    records = await sqldb.fetchall(
+        "SELECT user_id FROM gbanned_users WHERE user_id > 0"
+    )
+    return [record["user_id"] for record in records]
 
 
 async def is_gbanned_user(user_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_gbanned = False
-    try:
-        cursor.execute("SELECT user_id FROM gbanned_users WHERE user_id = ?", (user_id,))
-        record = cursor.fetchone()
-        if record:
-            is_gbanned = True
-    except sqlite3.Error as e:
-        print(f"Error checking gban for user {user_id}: {e}")
-    finally:
-        conn.close()
-    return is_gbanned
+    return await sqldb.exists(
+        "SELECT 1 FROM gbanned_users WHERE user_id = ?", (user_id,)
+    )
 
 
 async def add_gban_user(user_id: int):
-    is_gbanned = await is_gbanned_user(user_id)
-    if is_gbanned:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO gbanned_users (user_id) VALUES (?)", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding gban for user {user_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR IGNORE INTO gbanned_users (user_id) VALUES (?)", (user_id,)
+    )
 
 
 async def remove_gban_user(user_id: int):
-    is_gbanned = await is_gbanned_user(user_id)
-    if not is_gbanned:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM gbanned_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error removing gban for user {user_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute("DELETE FROM gbanned_users WHERE user_id = ?", (user_id,))
 
 
 # --- Sudoers Operations ---
 # Table: sudoers (key TEXT PRIMARY KEY, user_ids TEXT) - 'key' will be 'sudo'
 
+def _read_sudoers(conn) -> list[int]:
+    record = conn.execute("SELECT user_ids FROM sudoers WHERE key = 'sudo'").fetchone()
+    return json.loads(record["user_ids"]) if record and record["user_ids"] else []
+
+
+def _write_sudoers(conn, sudoers_list: list[int]):
+    conn.execute(
+        "INSERT OR REPLACE INTO sudoers (key, user_ids) VALUES (?, ?)",
+        ("sudo", json.dumps(sudoers_list)),
+    )
+
+
 async def get_sudoers() -> list[int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    sudoers_list = []
-    try:
-        cursor.execute("SELECT user_ids FROM sudoers WHERE key = 'sudo'")
-        record = cursor.fetchone()
-        if record and record['user_ids']:
-            sudoers_list = json.loads(record['user_ids'])
-    except sqlite3.Error as e:
-        print(f"Error fetching sudoers: {e}")
-    finally:
-        conn.close()
-    return sudoers_list
+    data = await sqldb.fetchval("SELECT user_ids FROM sudoers WHERE key = 'sudo'")
+    return json.loads(data) if data else []
 
 
 async def add_sudo(user_id: int) -> bool:
-    sudoers_list = await get_sudoers()
-    if user_id in sudoers_list: # Check if already sudo
-        return False
-    sudoers_list.append(user_id)
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        sudoers_json = json.dumps(sudoers_list)
-        cursor.execute(
-            "INSERT OR REPLACE INTO sudoers (key, user_ids) VALUES (?, ?)",
-            ('sudo', sudoers_json)
-        )
-        conn.commit()
+    def _add(conn):
+        sudoers_list = _read_sudoers(conn)
+        if user_id in sudoers_list: # Check if already sudo
+            return False
+        sudoers_list.append(user_id)
+        _write_sudoers(conn, sudoers_list)
         return True
-    except sqlite3.Error as e:
-        print(f"Error adding sudo user {user_id}: {e}")
-        return False
-    finally:
-        conn.close()
+
+    # Read and write on the writer connection so concurrent calls can't lose an update
+    return bool(await sqldb.run(_add))
 
 
 async def remove_sudo(user_id: int) -> bool:
-    sudoers_list = await get_sudoers()
-    if user_id not in sudoers_list: # Check if not sudo
-        return False
-    sudoers_list.remove(user_id)
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        sudoers_json = json.dumps(sudoers_list)
-        cursor.execute(
-            "INSERT OR REPLACE INTO sudoers (key, user_ids) VALUES (?, ?)",
-            ('sudo', sudoers_json)
-        )
-        conn.commit()
+    def _remove(conn):
+        sudoers_list = _read_sudoers(conn)
+        if user_id not in sudoers_list: # Check if not sudo
+            return False
+        sudoers_list.remove(user_id)
+        _write_sudoers(conn, sudoers_list)
         return True
-    except sqlite3.Error as e:
-        print(f"Error removing sudo user {user_id}: {e}")
-        return False
-    finally:
-        conn.close()
+
+    return bool(await sqldb.run(_remove))
 
 
 # --- Total Queries on bot ---
@@ -538,218 +313,332 @@ async def remove_sudo(user_id: int) -> bool:
 
 async def get_queries() -> int:
     chat_id = 98324
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    queries_count = 0
-    try:
-        cursor.execute("SELECT mode FROM queries WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record:
-            queries_count = record['mode']
-    except sqlite3.Error as e:
-        print(f"Error fetching queries count: {e}")
-    finally:
-        conn.close()
-    return queries_count
+    return await sqldb.fetchval(
+        "SELECT mode FROM queries WHERE chat_id = ?", (chat_id,), default=0
+    )
 
 
 async def set_queries(mode: int):
     chat_id = 98324
-    current_queries = await get_queries() # Get current value via the new function
-    new_mode = current_queries + mode # Add to current value
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            "INSERT OR REPLACE INTO queries (chat_id, mode) VALUES (?, ?)",
-            (chat_id, new_mode)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error setting queries count: {e}")
-    finally:
-        conn.close()
+    # Increment in a single statement instead of a read followed by a write
+    await sqldb.execute(
+        "INSERT INTO queries (chat_id, mode) VALUES (?, ?) "
+        "ON CONFLICT(chat_id) DO UPDATE SET mode = mode + excluded.mode",
+        (chat_id, mode),
+    )
 
 
 # --- Top Chats DB Operations ---
-# Table: chat_tops (chat_id INTEGER PRIMARY KEY, vidid_data TEXT)
-# 'vidid_data' will store the JSON string of the dictionary 'vidid'
-
-async def get_top_chats() -> dict:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    results = {}
-    try:
-        cursor.execute("SELECT chat_id, vidid_data FROM chat_tops WHERE chat_id < 0")
-        records = cursor.fetchall()
-        for record in records:
-            chat_id = record['chat_id']
-            vidid_data = json.loads(record['vidid_data'])
-            total = 0
-            for i in vidid_data:
-                counts_ = vidid_data[i].get("spot", 0) # Use .get for safety
-                if counts_ > 0:
-                    total += counts_
-            if total > 0: # Only add if total is meaningful
-                results[chat_id] = total
-    except sqlite3.Error as e:
-        print(f"Error getting top chats: {e}")
-    finally:
-        conn.close()
-    return results
-
-
-async def get_global_tops() -> dict:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    results = {}
-    try:
-        cursor.execute("SELECT vidid_data FROM chat_tops WHERE chat_id < 0")
-        records = cursor.fetchall()
-        for record in records:
-            vidid_data = json.loads(record['vidid_data'])
-            for i in vidid_data:
-                counts_ = vidid_data[i].get("spot", 0)
-                title_ = vidid_data[i].get("title") # Use .get for safety
-                if counts_ > 0 and title_:
-                    if i not in results:
-                        results[i] = {"spot": counts_, "title": title_}
-                    else:
-                        spot = results[i]["spot"]
-                        count_ = spot + counts_
-                        results[i]["spot"] = count_
-    except sqlite3.Error as e:
-        print(f"Error getting global tops: {e}")
-    finally:
-        conn.close()
-    return results
+# Table: chat_tops (chat_id, vidid, spot, title) - one row per (chat, track)
+# Leaderboards are aggregated, ordered and limited inside SQLite; the returned
+# dicts are already sorted by play count, highest first.
+
+def _limit_clause(limit: int | None) -> str:
+    return f" LIMIT {int(limit)}" if limit else ""
+
+
+async def get_top_chats(limit: int | None = None) -> dict:
+    records = await sqldb.fetchall(
+        "SELECT chat_id, SUM(spot) AS total FROM chat_tops "
+        "WHERE chat_id < 0 AND spot > 0 GROUP BY chat_id ORDER BY total DESC"
+        + _limit_clause(limit)
+    )
+    return {record["chat_id"]: record["total"] for record in records}
+
+
+async def get_global_tops(limit: int | None = None) -> dict:
+    records = await sqldb.fetchall(
+        "SELECT vidid, SUM(spot) AS spot, MAX(title) AS title FROM chat_tops "
+        "WHERE chat_id < 0 AND spot > 0 AND title IS NOT NULL AND title != '' "
+        "GROUP BY vidid ORDER BY spot DESC"
+        + _limit_clause(limit)
+    )
+    return {
+        record["vidid"]: {"spot": record["spot"], "title": record["title"]}
+        for record in records
+    }
+
+
+async def get_tops_summary(chat_id: int | None = None) -> tuple[int, int]:
+    """Returns (distinct tracks, total plays) globally or for one chat."""
+    if chat_id is None:
+        # Grouping walks idx_chat_tops_vidid in order, unlike COUNT(DISTINCT)
+        record = await sqldb.fetchone(
+            "SELECT COUNT(*), SUM(total) FROM (SELECT SUM(spot) AS total FROM chat_tops "
+            "WHERE chat_id < 0 AND spot > 0 AND title IS NOT NULL AND title != '' "
+            "GROUP BY vidid)"
+        )
+    else:
+        record = await sqldb.fetchone(
+            "SELECT COUNT(*), SUM(spot) FROM chat_tops WHERE chat_id = ?", (chat_id,)
+        )
+    if not record:
+        return 0, 0
+    return record[0] or 0, record[1] or 0
 
 
-async def get_particulars(chat_id: int) -> dict[str, dict]: # Changed return type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    ids = {}
-    try:
-        cursor.execute("SELECT vidid_data FROM chat_tops WHERE chat_id = ?", (chat_id,))
-        record = cursor.fetchone()
-        if record and record['vidid_data']:
-            ids = json.loads(record['vidid_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching particulars for chat_id {chat_id}: {e}")
-    finally:
-        conn.close()
-    return ids
+async def get_particulars(chat_id: int, limit: int | None = None) -> dict[str, dict]: # Changed return type hint
+    records = await sqldb.fetchall(
+        "SELECT vidid, spot, title FROM chat_tops WHERE chat_id = ? ORDER BY spot DESC"
+        + _limit_clause(limit),
+        (chat_id,),
+    )
+    return {
+        record["vidid"]: {"spot": record["spot"], "title": record["title"]}
+        for record in records
+    }
 
 
 async def get_particular_top(chat_id: int, name: str) -> bool | dict:
-    ids = await get_particulars(chat_id)
-    return ids.get(name, False) # Using .get for consistency and safety
+    record = await sqldb.fetchone(
+        "SELECT spot, title FROM chat_tops WHERE chat_id = ? AND vidid = ?",
+        (chat_id, name),
+    )
+    return {"spot": record["spot"], "title": record["title"]} if record else False
 
 
 async def update_particular_top(chat_id: int, name: str, vidid: dict):
-    ids = await get_particulars(chat_id)
-    ids[name] = vidid # Update the specific video ID's data
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        vidid_json = json.dumps(ids)
-        cursor.execute(
-            "INSERT OR REPLACE INTO chat_tops (chat_id, vidid_data) VALUES (?, ?)",
-            (chat_id, vidid_json)
-        )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error updating particular top for chat_id {chat_id}, name {name}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT INTO chat_tops (chat_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(chat_id, vidid) DO UPDATE SET spot = excluded.spot, title = excluded.title",
+        (chat_id, name, vidid.get("spot", 0), vidid.get("title")),
+    )
+
+
+async def increment_particular_top(chat_id: int, name: str, title: str, count: int = 1):
+    # Atomic in SQLite, so concurrent plays of the same track can't lose a count
+    await sqldb.execute(
+        "INSERT INTO chat_tops (chat_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(chat_id, vidid) DO UPDATE SET spot = spot + excluded.spot, title = excluded.title",
+        (chat_id, name, count, title),
+    )
 
 
 # --- Top User DB Operations ---
-# Table: user_tops (chat_id INTEGER PRIMARY KEY, vidid_data TEXT)
-# Original used 'chat_id' for 'user_id' but queried for "$gt 0". Will rename table to user_tops
-# and use 'user_id' for clarity in SQLite table.
-
-async def get_userss(user_id: int) -> dict[str, dict]: # Renamed parameter and type hint
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    ids = {}
-    try:
-        cursor.execute("SELECT vidid_data FROM user_tops WHERE user_id = ?", (user_id,))
-        record = cursor.fetchone()
-        if record and record['vidid_data']:
-            ids = json.loads(record['vidid_data'])
-    except sqlite3.Error as e:
-        print(f"Error fetching users data for user_id {user_id}: {e}")
-    finally:
-        conn.close()
-    return ids
+# Table: user_tops (user_id, vidid, spot, title) - one row per (user, track)
+
+async def get_userss(user_id: int, limit: int | None = None) -> dict[str, dict]: # Renamed parameter and type hint
+    records = await sqldb.fetchall(
+        "SELECT vidid, spot, title FROM user_tops WHERE user_id = ? ORDER BY spot DESC"
+        + _limit_clause(limit),
+        (user_id,),
+    )
+    return {
+        record["vidid"]: {"spot": record["spot"], "title": record["title"]}
+        for record in records
+    }
 
 
 async def delete_userss(user_id: int) -> bool: # Renamed parameter
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    rows_deleted = 0
-    try:
-        cursor.execute("DELETE FROM user_tops WHERE user_id = ?", (user_id,))
-        conn.commit()
-        rows_deleted = cursor.rowcount
-    except sqlite3.Error as e:
-        print(f"Error deleting users data for user_id {user_id}: {e}")
-    finally:
-        conn.close()
+    rows_deleted = await sqldb.execute(
+        "DELETE FROM user_tops WHERE user_id = ?", (user_id,)
+    )
     return rows_deleted > 0
 
 
 async def get_user_top(user_id: int, name: str) -> bool | dict: # Renamed parameter
-    ids = await get_userss(user_id)
-    return ids.get(name, False)
+    record = await sqldb.fetchone(
+        "SELECT spot, title FROM user_tops WHERE user_id = ? AND vidid = ?",
+        (user_id, name),
+    )
+    return {"spot": record["spot"], "title": record["title"]} if record else False
 
 
 async def update_user_top(user_id: int, name: str, vidid: dict): # Renamed parameter
-    ids = await get_userss(user_id)
-    ids[name] = vidid
-    
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        vidid_json = json.dumps(ids)
-        cursor.execute(
-            "INSERT OR REPLACE INTO user_tops (user_id, vidid_data) VALUES (?, ?)",
-            (user_id, vidid_json)
+    await sqldb.execute(
+        "INSERT INTO user_tops (user_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(user_id, vidid) DO UPDATE SET spot = excluded.spot, title = excluded.title",
+        (user_id, name, vidid.get("spot", 0), vidid.get("title")),
+    )
+
+
+async def increment_user_top(user_id: int, name: str, title: str, count: int = 1):
+    await sqldb.execute(
+        "INSERT INTO user_tops (user_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(user_id, vidid) DO UPDATE SET spot = spot + excluded.spot, title = excluded.title",
+        (user_id, name, count, title),
+    )
+
+
+async def increment_tops(chat_rows: list[tuple], user_rows: list[tuple]) -> bool:
+    """Applies batched ``(id, vidid, count, title)`` increments in one transaction."""
+
+    def _increment(conn):
+        conn.executemany(
+            "INSERT INTO chat_tops (chat_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(chat_id, vidid) DO UPDATE SET spot = spot + excluded.spot, title = excluded.title",
+            chat_rows,
+        )
+        conn.executemany(
+            "INSERT INTO user_tops (user_id, vidid, spot, title) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(user_id, vidid) DO UPDATE SET spot = spot + excluded.spot, title = excluded.title",
+            user_rows,
         )
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error updating user top for user_id {user_id}, name {name}: {e}")
-    finally:
-        conn.close()
+        return True
 
+    return bool(await sqldb.run(_increment))
 
-async def get_topp_users() -> dict:
-    conn = get_db_connection()
-    cursor = conn.cursor()
+
+async def get_topp_users(limit: int | None = None) -> dict:
+    records = await sqldb.fetchall(
+        "SELECT user_id, SUM(spot) AS total FROM user_tops "
+        "WHERE user_id > 0 AND spot > 0 GROUP BY user_id ORDER BY total DESC"
+        + _limit_clause(limit)
+    )
+    return {record["user_id"]: record["total"] for record in records}
+
+
+# --- Leaderboard totals and snapshot ---
+# Used by core/leaderboard.py to look up exact totals for a batch of keys and to
+# persist its top-K boards. Table: leaderboard_snapshot (dimension, key, total, title)
+
+def _chunks(keys: list, size: int = 500):
+    for i in range(0, len(keys), size):
+        yield keys[i : i + size]
+
+
+async def get_track_totals(vidids: list[str]) -> dict[str, dict]:
     results = {}
-    try:
-        cursor.execute("SELECT user_id, vidid_data FROM user_tops WHERE user_id > 0")
-        records = cursor.fetchall()
+    for chunk in _chunks(list(vidids)):
+        marks = ", ".join("?" * len(chunk))
+        records = await sqldb.fetchall(
+            "SELECT vidid, SUM(spot) AS spot, MAX(title) AS title FROM chat_tops "
+            f"WHERE vidid IN ({marks}) AND chat_id < 0 AND spot > 0 "
+            "AND title IS NOT NULL AND title != '' GROUP BY vidid",
+            chunk,
+        )
         for record in records:
-            user_id = record['user_id']
-            vidid_data = json.loads(record['vidid_data'])
-            total = 0
-            for i in vidid_data:
-                counts_ = vidid_data[i].get("spot", 0)
-                if counts_ > 0:
-                    total += counts_
-            if total > 0:
-                results[user_id] = total
-    except sqlite3.Error as e:
-        print(f"Error getting top users: {e}")
-    finally:
-        conn.close()
+            results[record["vidid"]] = {"spot": record["spot"], "title": record["title"]}
+    return results
+
+
+async def get_chat_totals(chat_ids: list[int]) -> dict[int, int]:
+    results = {}
+    for chunk in _chunks(list(chat_ids)):
+        marks = ", ".join("?" * len(chunk))
+        records = await sqldb.fetchall(
+            "SELECT chat_id, SUM(spot) AS total FROM chat_tops "
+            f"WHERE chat_id IN ({marks}) AND spot > 0 GROUP BY chat_id",
+            chunk,
+        )
+        results.update({record["chat_id"]: record["total"] for record in records})
     return results
 
 
+async def get_user_totals(user_ids: list[int]) -> dict[int, int]:
+    results = {}
+    for chunk in _chunks(list(user_ids)):
+        marks = ", ".join("?" * len(chunk))
+        records = await sqldb.fetchall(
+            "SELECT user_id, SUM(spot) AS total FROM user_tops "
+            f"WHERE user_id IN ({marks}) AND spot > 0 GROUP BY user_id",
+            chunk,
+        )
+        results.update({record["user_id"]: record["total"] for record in records})
+    return results
+
+
+async def get_leaderboard_snapshot() -> list:
+    return await sqldb.fetchall(
+        "SELECT dimension, key, total, title FROM leaderboard_snapshot"
+    )
+
+
+async def save_leaderboard_snapshot(rows: list[tuple]):
+    """Replaces the stored snapshot with ``(dimension, key, total, title)`` rows."""
+
+    def _save(conn):
+        conn.execute("DELETE FROM leaderboard_snapshot")
+        conn.executemany(
+            "INSERT INTO leaderboard_snapshot (dimension, key, total, title) "
+            "VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    await sqldb.run(_save)
+
+
+# --- Media cache index ---
+# Used by core/mediacache.py so cached downloads survive restarts.
+# Table: media_cache (key TEXT PRIMARY KEY, path, size, last_access)
+
+async def get_media_cache_entries() -> list:
+    return await sqldb.fetchall(
+        "SELECT key, path, size, last_access FROM media_cache "
+        "ORDER BY last_access"
+    )
+
+
+async def save_media_cache_entry(key: str, path: str, size: int, last_access: float):
+    await sqldb.execute(
+        "INSERT INTO media_cache (key, path, size, last_access) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET path = excluded.path, "
+        "size = excluded.size, last_access = excluded.last_access",
+        (key, path, size, last_access),
+    )
+
+
+async def touch_media_cache_entries(rows: list[tuple[float, str]]):
+    """Saves (last_access, key) pairs of cache hits in one transaction."""
+    await sqldb.executemany(
+        "UPDATE media_cache SET last_access = ? WHERE key = ?", rows
+    )
+
+
+async def delete_media_cache_entries(keys: list[str]):
+    await sqldb.executemany(
+        "DELETE FROM media_cache WHERE key = ?", [(key,) for key in keys]
+    )
+
+
+# --- YouTube video metadata ---
+# Used by core/metadata.py so known videos survive restarts without a search.
+# Table: video_metadata (vidid TEXT PRIMARY KEY, title, duration_min, thumbnail, fetched_at)
+
+async def get_video_metadata(vidid: str, fetched_after: float):
+    return await sqldb.fetchone(
+        "SELECT vidid, title, duration_min, thumbnail FROM video_metadata "
+        "WHERE vidid = ? AND fetched_at > ?",
+        (vidid, fetched_after),
+    )
+
+
+async def save_video_metadata(
+    vidid: str, title: str, duration_min: str | None, thumbnail: str, fetched_at: float
+):
+    await sqldb.execute(
+        "INSERT OR REPLACE INTO video_metadata "
+        "(vidid, title, duration_min, thumbnail, fetched_at) VALUES (?, ?, ?, ?, ?)",
+        (vidid, title, duration_min, thumbnail, fetched_at),
+    )
+
+
+# --- Spotify matches ---
+# Used by platforms/spotify.py so a Spotify track is searched on YouTube once.
+# Table: spotify_matches (key TEXT PRIMARY KEY, vidid, matched_at)
+
+async def get_spotify_matches(keys: list[str], matched_after: float) -> dict:
+    matches = {}
+    # Stay below SQLite's limit of bound parameters per statement
+    for start in range(0, len(keys), 500):
+        chunk = keys[start : start + 500]
+        rows = await sqldb.fetchall(
+            "SELECT key, vidid FROM spotify_matches WHERE matched_at > ? "
+            f"AND key IN ({', '.join('?' * len(chunk))})",
+            (matched_after, *chunk),
+        )
+        matches.update((row["key"], row["vidid"]) for row in rows)
+    return matches
+
+
+async def save_spotify_matches(rows: list[tuple[str, str, float]]):
+    await sqldb.executemany(
+        "INSERT OR REPLACE INTO spotify_matches (key, vidid, matched_at) "
+        "VALUES (?, ?, ?)",
+        rows,
+    )
+
+
 # --- Gban Users (from blockeddb - global block) ---
 # Note: The original had 'gbansdb' and 'blockeddb'. 'gbansdb' was used for get/add/remove_gban_user,
 # while 'blockeddb' was used for get_banned_users/count, is_banned_user, add/remove_banned_user.
@@ -759,78 +648,29 @@ async def get_topp_users() -> dict:
 # Table: banned_users (user_id INTEGER PRIMARY KEY)
 
 async def get_banned_users() -> list[int]:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    results = []
-    try:
-        cursor.execute("SELECT user_id FROM banned_users WHERE user_id > 0")
-        records = cursor.fetchall()
-        for record in records:
-            results.append(record['user_id'])
-    except sqlite3.Error as e:
-        print(f"Error getting banned users: {e}")
-    finally:
-        conn.close()
-    return results
+    records = await sqldb.fetchall(
+        "SELECT user_id FROM banned_users WHERE user_id > 0"
+    )
+    return [record["user_id"] for record in records]
 
 
 async def get_banned_count() -> int:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    count = 0
-    try:
-        cursor.execute("SELECT COUNT(user_id) FROM banned_users WHERE user_id > 0")
-        record = cursor.fetchone()
-        if record:
-            count = record[0] # COUNT returns a single value in the first column
-    except sqlite3.Error as e:
-        print(f"Error getting banned count: {e}")
-    finally:
-        conn.close()
-    return count
+    return await sqldb.fetchval(
+        "SELECT COUNT(user_id) FROM banned_users WHERE user_id > 0", default=0
+    )
 
 
 async def is_banned_user(user_id: int) -> bool:
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    is_banned = False
-    try:
-        cursor.execute("SELECT user_id FROM banned_users WHERE user_id = ?", (user_id,))
-        record = cursor.fetchone()
-        if record:
-            is_banned = True
-    except sqlite3.Error as e:
-        print(f"Error checking banned user {user_id}: {e}")
-    finally:
-        conn.close()
-    return is_banned
+    return await sqldb.exists(
+        "SELECT 1 FROM banned_users WHERE user_id = ?", (user_id,)
+    )
 
 
 async def add_banned_user(user_id: int):
-    is_banned = await is_banned_user(user_id)
-    if is_banned:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("INSERT OR IGNORE INTO banned_users (user_id) VALUES (?)", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error adding banned user {user_id}: {e}")
-    finally:
-        conn.close()
+    await sqldb.execute(
+        "INSERT OR IGNORE INTO banned_users (user_id) VALUES (?)", (user_id,)
+    )
 
 
 async def remove_banned_user(user_id: int):
-    is_banned = await is_banned_user(user_id)
-    if not is_banned:
-        return
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM banned_users WHERE user_id = ?", (user_id,))
-        conn.commit()
-    except sqlite3.Error as e:
-        print(f"Error removing banned user {user_id}: {e}")
-    finally:
-        conn.close()
\ No newline at end of file
+    await sqldb.execute("DELETE FROM banned_users WHERE user_id = ?", (user_id,))
@@ -6,12 +6,10 @@ from strings import get_string
 from YukkiMusic import SUDOERS
 from YukkiMusic.utils.database import (
     get_authuser_names,
-    get_cmode,
-    get_lang,
+    get_chat_context,
     is_active_chat,
     is_commanddelete_on,
     is_maintenance,
-    is_nonadmin_chat,
 )
 
 from ..formatters import int_to_alpha
@@ -30,11 +28,8 @@ def AdminRightsCheck(mystic):
                 await message.delete()
             except Exception:
                 pass
-        try:
-            language = await get_lang(message.chat.id)
-            _ = get_string(language)
-        except Exception:
-            _ = get_string("en")
+        context = await get_chat_context(message.chat.id)
+        _ = get_string(context.lang)
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
                 [
@@ -48,7 +43,7 @@ def AdminRightsCheck(mystic):
             )
             return await message.reply_text(_["general_4"], reply_markup=upl)
         if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
+            chat_id = context.cmode
             if chat_id is None:
                 return await message.reply_text(_["setting_12"])
             try:
@@ -59,8 +54,7 @@ def AdminRightsCheck(mystic):
             chat_id = message.chat.id
         if not await is_active_chat(chat_id):
             return await message.reply_text(_["general_6"])
-        is_non_admin = await is_nonadmin_chat(message.chat.id)
-        if not is_non_admin:
+        if not context.nonadmin:
             if message.from_user.id not in SUDOERS:
                 admins = adminlist.get(message.chat.id)
                 if not admins:
@@ -87,11 +81,8 @@ def AdminActual(mystic):
             except Exception:
                 pass
 
-        try:
-            language = await get_lang(message.chat.id)
-            _ = get_string(language)
-        except Exception:
-            _ = get_string("en")
+        context = await get_chat_context(message.chat.id)
+        _ = get_string(context.lang)
 
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
@@ -135,11 +126,8 @@ def ActualAdminCB(mystic):
         # Import app locally within the wrapper where it's used
         from YukkiMusic import app
 
-        try:
-            language = await get_lang(query.message.chat.id)
-            _ = get_string(language)
-        except Exception:
-            _ = get_string("en")
+        context = await get_chat_context(query.message.chat.id)
+        _ = get_string(context.lang)
 
         if not await is_maintenance():
             if query.from_user.id not in SUDOERS:
@@ -151,8 +139,7 @@ def ActualAdminCB(mystic):
         if query.message.chat.type == ChatType.PRIVATE:
             return await mystic(client, query, _)
 
-        is_non_admin = await is_nonadmin_chat(query.message.chat.id)
-        if not is_non_admin:
+        if not context.nonadmin:
             try:
                 a = await app.get_chat_member( # Uses app
                     query.message.chat.id,
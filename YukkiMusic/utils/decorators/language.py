@@ -12,7 +12,7 @@ from pyrogram.enums import ChatType
 from strings import get_string
 from YukkiMusic.misc import SUDOERS
 from YukkiMusic.utils.database import (
-    get_lang,
+    get_chat_context,
     is_commanddelete_on,
     is_maintenance,
 )
@@ -20,11 +20,8 @@ from YukkiMusic.utils.database import (
 
 def language(mystic):
     async def wrapper(_, message, **kwargs):
-        try:
-            language = await get_lang(message.chat.id)
-            language = get_string(language)
-        except Exception:
-            language = get_string("en")
+        context = await get_chat_context(message.chat.id)
+        language = get_string(context.lang)
         if not await is_maintenance():
             if message.from_user.id not in SUDOERS:
                 if message.chat.type == ChatType.PRIVATE:
@@ -42,11 +39,8 @@ def language(mystic):
 
 def languageCB(mystic):
     async def wrapper(_, query, **kwargs):
-        try:
-            language = await get_lang(query.message.chat.id)
-            language = get_string(language)
-        except Exception:
-            language = get_string("en")
+        context = await get_chat_context(query.message.chat.id)
+        language = get_string(context.lang)
         if not await is_maintenance():
             if query.from_user.id not in SUDOERS:
                 if query.message.chat.type == ChatType.PRIVATE:
@@ -63,11 +57,8 @@ def languageCB(mystic):
 
 def LanguageStart(mystic):
     async def wrapper(_, message, **kwargs):
-        try:
-            language = await get_lang(message.chat.id)
-            language = get_string(language)
-        except Exception:
-            language = get_string("en")
+        context = await get_chat_context(message.chat.id)
+        language = get_string(context.lang)
         return await mystic(_, message, language)
 
     return wrapper
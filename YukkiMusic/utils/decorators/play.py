@@ -14,19 +14,15 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from config import PLAYLIST_IMG_URL, PRIVATE_BOT_MODE, adminlist
 from strings import get_string
 from YukkiMusic import app
-from YukkiMusic.core.call import Yukki
+from YukkiMusic.core.call import Yukki, participants
 from YukkiMusic.misc import SUDOERS
 from YukkiMusic.platforms import youtube
 from YukkiMusic.utils.database import (
     get_assistant,
-    get_cmode,
-    get_lang,
-    get_playmode,
-    get_playtype,
+    get_chat_context,
     is_active_chat,
     is_commanddelete_on,
     is_maintenance,
-    is_served_private_chat,
 )
 from YukkiMusic.utils.inline import botplaylist_markup
 
@@ -35,8 +31,9 @@ links = {}
 
 def PlayWrapper(command):
     async def wrapper(client, message):
-        language = await get_lang(message.chat.id)
-        _ = get_string(language)
+        # One cached lookup for every persistent setting of this chat
+        context = await get_chat_context(message.chat.id)
+        _ = get_string(context.lang)
         if message.sender_chat:
             upl = InlineKeyboardMarkup(
                 [
@@ -55,7 +52,7 @@ def PlayWrapper(command):
                 return
 
         if PRIVATE_BOT_MODE:
-            if not await is_served_private_chat(message.chat.id):
+            if not context.private:
                 await message.reply_text(
                     "**PRIVATE MUSIC BOT**\n\nOnly For Authorized chats from the owner ask my owner to allow your chat first."
                 )
@@ -88,7 +85,7 @@ def PlayWrapper(command):
                     reply_markup=InlineKeyboardMarkup(buttons),
                 )
         if message.command[0][0] == "c":
-            chat_id = await get_cmode(message.chat.id)
+            chat_id = context.cmode
             if chat_id is None:
                 return await message.reply_text(_["setting_12"])
             try:
@@ -108,9 +105,8 @@ def PlayWrapper(command):
         except Exception:
             pass
 
-        playmode = await get_playmode(message.chat.id)
-        playty = await get_playtype(message.chat.id)
-        if playty != "Everyone":
+        playmode = context.playmode
+        if context.playtype != "Everyone":
             if message.from_user.id not in SUDOERS:
                 admins = adminlist.get(message.chat.id)
                 if not admins:
@@ -133,16 +129,10 @@ def PlayWrapper(command):
             fplay = None
         if await is_active_chat(chat_id):
             userbot = await get_assistant(message.chat.id)
-            # Getting all members id that in voicechat
+            # Clear the queue if the assistant isn't in the voice chat anymore
             try:
-                call_participants_id = [
-                    member.chat.id
-                    async for member in userbot.get_call_members(chat_id)
-                    if member.chat
-                ]
-                # Checking if assistant id not in list so clear queues and remove active voice chat and process
-
-                if not call_participants_id or userbot.id not in call_participants_id:
+                await Yukki.sync_participants(chat_id)
+                if not participants.contains(chat_id, userbot.id):
                     await Yukki.stop_stream(chat_id)
             except ChannelPrivate:
                 pass
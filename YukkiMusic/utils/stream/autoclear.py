@@ -8,32 +8,18 @@
 # All rights reserved.
 #
 
-import os
+from collections import deque
 
-from config import autoclean
-from YukkiMusic.utils.decorators import asyncify
+from YukkiMusic.core.mediacache import media_cache
+from YukkiMusic.core.queue import Track
 
 
-@asyncify
-def auto_clean(popped):
-    def _auto_clean(popped_item):
-        try:
-            rem = popped_item["file"]
-            autoclean.remove(rem)
-            count = autoclean.count(rem)
-            if count == 0:
-                if "vid_" not in rem and "live_" not in rem and "index_" not in rem:
-                    try:
-                        os.remove(rem)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
-
-    if isinstance(popped, dict):
-        _auto_clean(popped)
-    elif isinstance(popped, list):
+async def auto_clean(popped):
+    """Releases the queue references of popped tracks, see ``MediaCache``."""
+    if isinstance(popped, (dict, Track)):
+        media_cache.release(popped["file"])
+    elif isinstance(popped, (list, deque)):
         for pop in popped:
-            _auto_clean(pop)
+            media_cache.release(pop["file"])
     else:
         raise ValueError("Expected popped to be a dict or list.")
@@ -9,9 +9,28 @@
 #
 
 
-from config import autoclean, chatstats, userstats
 from config.config import time_to_seconds
+from YukkiMusic.core.leaderboard import leaderboard
+from YukkiMusic.core.mediacache import media_cache
+from YukkiMusic.core.playstats import stats_flusher
+from YukkiMusic.core.queue import Track
 from YukkiMusic.misc import db
+from YukkiMusic.utils.exceptions import AssistantErr
+
+
+def _add_track(chat_id, track: Track, forceplay):
+    queue = db.get(chat_id)
+    if queue is None:
+        db[chat_id] = []
+        queue = db[chat_id]
+    if queue.full:
+        raise AssistantErr(
+            f"The queue of this chat is full, it can't hold more than {queue.limit} tracks."
+        )
+    if forceplay:
+        queue.appendleft(track)
+    else:
+        queue.append(track)
 
 
 async def put_queue(
@@ -32,36 +51,23 @@ async def put_queue(
         duration_in_seconds = time_to_seconds(duration) - 3
     except Exception:
         duration_in_seconds = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": duration_in_seconds,
-        "played": 0,
-        "url": url,
-    }
-    if forceplay:
-        if check := db.get(chat_id):
-            check.insert(0, put)
-        else:
-            db[chat_id] = []
-            db[chat_id].append(put)
-    else:
-        db[chat_id].append(put)
-    autoclean.append(file)
+    put = Track(
+        title,
+        duration,
+        stream,
+        user,
+        original_chat_id,
+        file,
+        vidid,
+        seconds=duration_in_seconds,
+        url=url,
+        user_id=user_id,
+    )
+    _add_track(chat_id, put, forceplay)
+    media_cache.acquire(file)
     vidid = "telegram" if vidid == "soundcloud" or "saavn" in vidid else vidid
-
-    to_append = {"vidid": vidid, "title": title}
-    if chat_id not in chatstats:
-        chatstats[chat_id] = []
-    chatstats[chat_id].append(to_append)
-    if user_id not in userstats:
-        userstats[user_id] = []
-    userstats[user_id].append(to_append)
+    stats_flusher.record(chat_id, user_id, vidid, title)
+    leaderboard.record(chat_id, user_id, vidid, title)
     return
 
 
@@ -76,22 +82,5 @@ async def put_queue_index(
     stream,
     forceplay: bool | str = None,
 ):
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": 0,
-        "played": 0,
-    }
-    if forceplay:
-        if check := db.get(chat_id):
-            check.insert(0, put)
-        else:
-            db[chat_id] = []
-            db[chat_id].append(put)
-    else:
-        db[chat_id].append(put)
+    put = Track(title, duration, stream, user, original_chat_id, file, vidid)
+    _add_track(chat_id, put, forceplay)
@@ -8,14 +8,18 @@
 # All rights reserved.
 #
 
+import asyncio
 import os
+import time
 import traceback
+from collections import deque
+from contextlib import aclosing
 from random import randint
 
 from pyrogram.types import InlineKeyboardMarkup
 
 import config
-from YukkiMusic import app
+from YukkiMusic import LOGGER, app
 from YukkiMusic.core.call import Yukki
 from YukkiMusic.misc import db
 from YukkiMusic.platforms import carbon, saavn, youtube
@@ -32,6 +36,107 @@ from YukkiMusic.utils.pastebin import Yukkibin
 from YukkiMusic.utils.stream.queue import put_queue, put_queue_index
 from YukkiMusic.utils.thumbnails import gen_qthumb, gen_thumb
 
+# Playlist entries looked up ahead of the one being queued
+PLAYLIST_LOOKAHEAD = 5
+# Seconds between edits of the status message while a playlist is queued
+PLAYLIST_EDIT_INTERVAL = 3
+
+# Playlist summaries being sent in the background
+_summaries = set()
+
+
+class PlaylistTimings:
+    """Time from a playlist play until its first track is playing."""
+
+    __slots__ = ("plays", "last_ms", "avg_ms")
+
+    def __init__(self):
+        self.plays = 0
+        self.last_ms = 0.0
+        self.avg_ms = 0.0
+
+    def record(self, started: float):
+        self.last_ms = (time.monotonic() - started) * 1000
+        self.plays += 1
+        self.avg_ms += (self.last_ms - self.avg_ms) / self.plays
+
+
+playlist_timings = PlaylistTimings()
+
+
+async def _resolve_playlist(entries, videoid: bool):
+    """Yields ``youtube.details`` of each entry in order, None where it fails.
+
+    Up to ``PLAYLIST_LOOKAHEAD`` lookups run while the caller queues or plays
+    the previous entry, so the first track starts as soon as its own lookup is
+    done. Lookups still running when the caller stops are cancelled.
+    """
+
+    async def details(search):
+        try:
+            return await youtube.details(search, videoid)
+        except Exception:
+            return None
+
+    entries = iter(entries)
+    pending = deque()
+    try:
+        for search in entries:
+            pending.append(asyncio.create_task(details(search)))
+            if len(pending) == PLAYLIST_LOOKAHEAD:
+                break
+        while pending:
+            result = await pending.popleft()
+            search = next(entries, None)
+            if search is not None:
+                pending.append(asyncio.create_task(details(search)))
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _show_progress(_, mystic, count: int, edited: float) -> float:
+    """Shows the queued count on the status message, throttled to one edit
+    per ``PLAYLIST_EDIT_INTERVAL``. Returns the time of the last edit.
+    """
+    now = time.monotonic()
+    if mystic is None or now - edited < PLAYLIST_EDIT_INTERVAL:
+        return edited
+    try:
+        await mystic.edit_text(_["playlist_26"].format(count))
+    except Exception:
+        pass
+    return now
+
+
+async def _send_summary(_, original_chat_id, msg, position):
+    try:
+        link = await Yukkibin(msg)
+        lines = msg.count("\n")
+        if lines >= 17:
+            car = os.linesep.join(msg.split(os.linesep)[:17])
+        else:
+            car = msg
+        img = await carbon.generate(car, randint(100, 10000000))
+        await app.send_photo(
+            original_chat_id,
+            photo=img,
+            caption=_["playlist_18"].format(link, position),
+            reply_markup=close_markup(_),
+        )
+    except Exception:
+        LOGGER(__name__).warning("Failed to send playlist summary.", exc_info=True)
+
+
+def _summarize(_, original_chat_id, msg, position):
+    """Sends the paste and carbon of a queued playlist in the background, so
+    neither service delays the play command.
+    """
+    task = asyncio.create_task(_send_summary(_, original_chat_id, msg, position))
+    _summaries.add(task)
+    task.add_done_callback(_summaries.discard)
+
 
 async def stream(
     _,
@@ -56,96 +161,88 @@ async def stream(
     if streamtype == "playlist":
         msg = f"{_['playlist_16']}\n\n"
         count = 0
-        for search in result:
-            if int(count) == config.PLAYLIST_FETCH_LIMIT:
-                continue
-            try:
-                (
-                    title,
-                    duration_min,
-                    duration_sec,
-                    thumbnail,
-                    vidid,
-                ) = await youtube.details(search, False if spotify else True)
-            except Exception:
-                continue
-            if str(duration_min) == "None":
-                continue
-            if duration_sec > config.DURATION_LIMIT:
-                continue
-            if await is_active_chat(chat_id):
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                )
-                position = len(db.get(chat_id)) - 1
-                count += 1
-                msg += f"{count}- {title[:70]}\n"
-                msg += f"{_['playlist_17']} {position}\n\n"
-            else:
-                if not forceplay:
-                    db[chat_id] = []
-                status = True if video else None
-                try:
-                    file_path, direct = await youtube.download(
-                        vidid, mystic, video=status, videoid=True
+        started = edited = time.monotonic()
+        async with aclosing(
+            _resolve_playlist(result, False if spotify else True)
+        ) as entries:
+            async for details in entries:
+                if (queue := db.get(chat_id)) is not None and queue.full:
+                    break
+                if details is None:
+                    continue
+                title, duration_min, duration_sec, thumbnail, vidid = details
+                if str(duration_min) == "None":
+                    continue
+                if duration_sec > config.DURATION_LIMIT:
+                    continue
+                if await is_active_chat(chat_id):
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        f"vid_{vidid}",
+                        title,
+                        duration_min,
+                        user_name,
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
                     )
-                except Exception:
-                    raise AssistantErr(_["play_16"])
-                await Yukki.join_call(
-                    chat_id, original_chat_id, file_path, video=status, image=thumbnail
-                )
-                await put_queue(
-                    chat_id,
-                    original_chat_id,
-                    file_path if direct else f"vid_{vidid}",
-                    title,
-                    duration_min,
-                    user_name,
-                    vidid,
-                    user_id,
-                    "video" if video else "audio",
-                    forceplay=forceplay,
-                )
-                img = await gen_thumb(vidid)
-                button = stream_markup(_, vidid, chat_id)
-                run = await app.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["stream_1"].format(
-                        title[:27],
-                        f"https://t.me/{app.username}?start=info_{vidid}",
+                    position = len(db.get(chat_id)) - 1
+                    count += 1
+                    msg += f"{count}- {title[:70]}\n"
+                    msg += f"{_['playlist_17']} {position}\n\n"
+                    edited = await _show_progress(_, mystic, count, edited)
+                else:
+                    if not forceplay:
+                        db[chat_id] = []
+                    status = True if video else None
+                    try:
+                        file_path, direct = await youtube.download(
+                            vidid, mystic, video=status, videoid=True
+                        )
+                    except Exception:
+                        raise AssistantErr(_["play_16"])
+                    await Yukki.join_call(
+                        chat_id,
+                        original_chat_id,
+                        file_path,
+                        video=status,
+                        image=thumbnail,
+                    )
+                    playlist_timings.record(started)
+                    await put_queue(
+                        chat_id,
+                        original_chat_id,
+                        file_path if direct else f"vid_{vidid}",
+                        title,
                         duration_min,
                         user_name,
-                    ),
-                    reply_markup=InlineKeyboardMarkup(button),
-                )
-                db[chat_id][0]["mystic"] = run
-                db[chat_id][0]["markup"] = "stream"
+                        vidid,
+                        user_id,
+                        "video" if video else "audio",
+                        forceplay=forceplay,
+                    )
+                    img = await gen_thumb(vidid)
+                    button = stream_markup(_, vidid, chat_id)
+                    run = await app.send_photo(
+                        original_chat_id,
+                        photo=img,
+                        caption=_["stream_1"].format(
+                            title[:27],
+                            f"https://t.me/{app.username}?start=info_{vidid}",
+                            duration_min,
+                            user_name,
+                        ),
+                        reply_markup=InlineKeyboardMarkup(button),
+                    )
+                    db[chat_id][0]["mystic"] = run
+                    db[chat_id][0]["markup"] = "stream"
+                # The limit counts queued tracks, not the one that starts playing
+                if count == config.PLAYLIST_FETCH_LIMIT:
+                    break
         if count == 0:
             return
-        else:
-            link = await Yukkibin(msg)
-            lines = msg.count("\n")
-            if lines >= 17:
-                car = os.linesep.join(msg.split(os.linesep)[:17])
-            else:
-                car = msg
-            img = await carbon.generate(car, randint(100, 10000000))
-            upl = close_markup(_)
-            return await app.send_photo(
-                original_chat_id,
-                photo=img,
-                caption=_["playlist_18"].format(link, position),
-                reply_markup=upl,
-            )
+        _summarize(_, original_chat_id, msg, position)
 
     elif streamtype == "youtube":
         link = result["link"]
@@ -304,9 +401,12 @@ async def stream(
         elif streamtype == "saavn_playlist":
             msg = f"{_['playlist_16']}\n\n"
             count = 0
+            started = edited = time.monotonic()
             for search in result:
                 if search["duration_sec"] == 0:
                     continue
+                if (queue := db.get(chat_id)) is not None and queue.full:
+                    break
                 title = search["title"]
                 duration_min = search["duration_min"]
                 duration_sec = search["duration_sec"]
@@ -330,13 +430,14 @@ async def stream(
                     count += 1
                     msg += f"{count}- {title[:70]}\n"
                     msg += f"{_['playlist_17']} {position}\n\n"
-
+                    edited = await _show_progress(_, mystic, count, edited)
                 else:
                     if not forceplay:
                         db[chat_id] = []
                     await Yukki.join_call(
                         chat_id, original_chat_id, file_path, video=None
                     )
+                    playlist_timings.record(started)
                     await put_queue(
                         chat_id,
                         original_chat_id,
@@ -363,21 +464,7 @@ async def stream(
                     db[chat_id][0]["markup"] = "tg"
             if count == 0:
                 return
-            else:
-                link = await Yukkibin(msg)
-                lines = msg.count("\n")
-                if lines >= 17:
-                    car = os.linesep.join(msg.split(os.linesep)[:17])
-                else:
-                    car = msg
-                img = await carbon.generate(car, randint(100, 10000000))
-                upl = close_markup(_)
-                return await app.send_photo(
-                    original_chat_id,
-                    photo=img,
-                    caption=_["playlist_18"].format(link, position),
-                    reply_markup=upl,
-                )
+            _summarize(_, original_chat_id, msg, position)
 
     elif streamtype == "soundcloud":
         file_path = result["filepath"]
@@ -10,7 +10,10 @@
 
 from py_yt import VideosSearch
 
+from YukkiMusic.core.singleflight import single_flight
 
+
+@single_flight
 async def gen_thumb(videoid, thumb=None):
     if thumb:
         return thumb
@@ -0,0 +1,124 @@
+"""Compares request latency with a new ``aiohttp`` session per call vs ``http``.
+
+Run from the repository root:
+
+    python benchmarks/http_latency.py [--url https://batbin.me/] [--requests 50]
+
+The "cold" variant opens a ``ClientSession`` for every request, like the old
+platform helpers did, so each one pays for DNS, TCP and TLS again. The "warm"
+variant sends the same requests through the shared :class:`HttpClient`, which
+keeps connections alive. Requests run ``--concurrency`` at a time. Without
+``--url`` a local HTTP server is used, that shows the connection overhead
+without TLS or network latency.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import statistics
+import sys
+import time
+
+import aiohttp
+from aiohttp import web
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_http_module():
+    # Load core/http.py on its own; importing the YukkiMusic package would
+    # start the whole bot.
+    spec = importlib.util.spec_from_file_location(
+        "yukki_http", os.path.join(ROOT, "YukkiMusic", "core", "http.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["yukki_http"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+async def local_server() -> tuple[web.AppRunner, str]:
+    async def hello(request):
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/", hello)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{port}/"
+
+
+async def cold(url: str):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            await response.read()
+
+
+async def warm(client, url: str):
+    async with client.get(url) as response:
+        await response.read()
+
+
+async def measure(request, total: int, concurrency: int):
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with slots:
+            start = time.perf_counter()
+            await request()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    began = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(total)])
+    return latencies, time.perf_counter() - began
+
+
+def p(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def report(name: str, latencies: list, elapsed: float):
+    print(
+        f"{name:<5} requests/s={len(latencies) / elapsed:8.1f}  "
+        f"p50={statistics.median(latencies):8.2f}ms  p99={p(latencies, 99):8.2f}ms  "
+        f"max={max(latencies):8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="defaults to a local HTTP server")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=5)
+    args = parser.parse_args()
+
+    runner = None
+    url = args.url
+    if url is None:
+        runner, url = await local_server()
+    module = load_http_module()
+    client = module.HttpClient()
+    try:
+        report(
+            "cold", *await measure(lambda: cold(url), args.requests, args.concurrency)
+        )
+        # Open the connections the measured requests reuse
+        await asyncio.gather(*[warm(client, url) for _ in range(args.concurrency)])
+        report(
+            "warm",
+            *await measure(lambda: warm(client, url), args.requests, args.concurrency),
+        )
+    finally:
+        await client.close()
+        if runner is not None:
+            await runner.cleanup()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
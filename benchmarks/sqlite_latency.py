@@ -0,0 +1,170 @@
+"""Compares handler latency for the old per-call connection helpers vs ``sqldb``.
+
+Run from the repository root:
+
+    python benchmarks/sqlite_latency.py [--handlers 2000] [--rate 500]
+
+A "handler" performs the same mix of lookups a ``/play`` does (language,
+play mode, play type, channel mode, served chat check plus one write). The
+"before" variant opens a fresh ``sqlite3`` connection per query and runs it
+on the event loop, exactly like the old database helpers; the "after" variant
+goes through the pooled, off-loop :class:`SQLiteEngine`. A ticker coroutine
+measures how long the loop stalls while the handlers run.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load(name: str, *parts: str):
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ROOT, "YukkiMusic", "core", *parts)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_sqlite_module(workdir: str):
+    # Load core/sqlite.py (and the migrations it needs) on their own;
+    # importing the YukkiMusic package would start the whole bot.
+    os.chdir(workdir)
+    _load("YukkiMusic.core.migrations", "migrations.py")
+    return _load("yukki_sqlite", "sqlite.py")
+
+
+def seed(path: str, chats: int):
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT OR REPLACE INTO language (chat_id, lang) VALUES (?, 'en')",
+        [(-i,) for i in range(1, chats)],
+    )
+    conn.executemany(
+        "INSERT OR REPLACE INTO served_chats (chat_id) VALUES (?)",
+        [(-i,) for i in range(1, chats)],
+    )
+    conn.commit()
+    conn.close()
+
+
+READS = [
+    "SELECT lang FROM language WHERE chat_id = ?",
+    "SELECT mode FROM playmode WHERE chat_id = ?",
+    "SELECT mode FROM playtype WHERE chat_id = ?",
+    "SELECT mode FROM channelplaymode WHERE chat_id = ?",
+    "SELECT 1 FROM served_chats WHERE chat_id = ?",
+]
+WRITE = (
+    "INSERT INTO queries (chat_id, mode) VALUES (98324, 1) "
+    "ON CONFLICT(chat_id) DO UPDATE SET mode = mode + 1"
+)
+
+
+async def before_handler(path: str, chat_id: int):
+    for sql in READS:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute(sql, (chat_id,)).fetchone()
+        conn.close()
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute(WRITE)
+    conn.commit()
+    conn.close()
+
+
+async def after_handler(engine, chat_id: int):
+    for sql in READS:
+        await engine.fetchone(sql, (chat_id,))
+    await engine.execute(WRITE)
+
+
+async def ticker(stop: asyncio.Event, stalls: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append((time.perf_counter() - start - 0.001) * 1000)
+
+
+async def measure(handler, total: int, rate: int, chats: int):
+    # Open-loop arrivals: handler i is due at ``began + i / rate`` and its
+    # latency is measured from that moment, so time spent waiting behind a
+    # blocked loop counts against it just like a real queued update would.
+    latencies = []
+    stalls = []
+    stop = asyncio.Event()
+
+    async def one(due: float):
+        await handler(-random.randint(1, chats))
+        latencies.append((time.perf_counter() - due) * 1000)
+
+    tick = asyncio.create_task(ticker(stop, stalls))
+    began = time.perf_counter()
+    tasks = []
+    for i in range(total):
+        due = began + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - began
+    stop.set()
+    await tick
+    return latencies, stalls, elapsed
+
+
+def p(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def report(name: str, latencies: list, stalls: list, elapsed: float):
+    print(
+        f"{name:<7} handlers/s={len(latencies) / elapsed:8.0f}  "
+        f"p50={statistics.median(latencies):7.2f}ms  p99={p(latencies, 99):7.2f}ms  "
+        f"loop-stall p99={p(stalls or [0], 99):7.2f}ms max={max(stalls or [0]):7.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--handlers", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=500, help="handlers per second")
+    parser.add_argument("--chats", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        module = load_sqlite_module(workdir)
+        seed(module.DB_FILE, args.chats)
+        path = os.path.join(workdir, module.DB_FILE)
+
+        results = await measure(
+            lambda chat_id: before_handler(path, chat_id),
+            args.handlers,
+            args.rate,
+            args.chats,
+        )
+        report("before", *results)
+
+        results = await measure(
+            lambda chat_id: after_handler(module.sqldb, chat_id),
+            args.handlers,
+            args.rate,
+            args.chats,
+        )
+        report("after", *results)
+        module.sqldb.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -12,7 +12,6 @@ import os as _os
 import random as _random
 
 import aiofiles as _aiofiles
-import aiohttp as _aiohttp
 
 from .config import *
 
@@ -21,24 +20,24 @@ async def fetch_cookies():
     if not COOKIE_LINK or not isinstance(COOKIE_LINK, list):  # noqa
         return None
 
+    # Imported here, the bot package itself imports config
+    from YukkiMusic.core.http import http as _http
+
     _os.makedirs("config/cookies", exist_ok=True)
 
-    async with _aiohttp.ClientSession() as session:
-        for i, link in enumerate(COOKIE_LINK, start=1):
-            paste_id = link.split("/")[-1]
-            raw_url = f"https://batbin.me/raw/{paste_id}"
-
-            async with session.get(raw_url) as response:
-                if response.status == 200:
-                    rc = await response.text()
-                    path = f"config/cookies/cookies_{i}.txt"
-                    async with _aiofiles.open(path, "w", encoding="utf-8") as f:
-                        await f.write(rc)
-                    print(f"Cookies {i} successfully written to {path}")
-                else:
-                    print(
-                        f"Failed to get the URL {link}. Status code: {response.status}"
-                    )
+    for i, link in enumerate(COOKIE_LINK, start=1):
+        paste_id = link.split("/")[-1]
+        raw_url = f"https://batbin.me/raw/{paste_id}"
+
+        async with _http.get(raw_url) as response:
+            if response.status == 200:
+                rc = await response.text()
+                path = f"config/cookies/cookies_{i}.txt"
+                async with _aiofiles.open(path, "w", encoding="utf-8") as f:
+                    await f.write(rc)
+                print(f"Cookies {i} successfully written to {path}")
+            else:
+                print(f"Failed to get the URL {link}. Status code: {response.status}")
 
 
 def cookies():
@@ -162,6 +162,26 @@ SERVER_PLAYLIST_LIMIT = int(getenv("SERVER_PLAYLIST_LIMIT", "25"))
 # MaximuM limit for fetching playlist's track from youtube, spotify, apple links.
 PLAYLIST_FETCH_LIMIT = int(getenv("PLAYLIST_FETCH_LIMIT", "25"))
 
+# Maximum number of tracks a single chat can have queued at once.
+QUEUE_LIMIT = int(getenv("QUEUE_LIMIT", "1000"))
+
+# Budget for progress bar edits across all chats (edits per second), and the
+# shortest time between two edits of the same chat's progress bar (seconds).
+PROGRESS_EDIT_RATE = float(getenv("PROGRESS_EDIT_RATE", "5"))
+PROGRESS_MIN_INTERVAL = float(getenv("PROGRESS_MIN_INTERVAL", "5"))
+
+# Start downloading the next queued track once the current one has played this
+# fraction of its duration (0 = as soon as it starts, 1 = never in advance).
+PREFETCH_AT = float(getenv("PREFETCH_AT", "0.5"))
+
+# Disk space (in MB) for downloaded tracks kept for repeat plays, least
+# recently played ones are deleted first.
+MEDIA_CACHE_SIZE = int(getenv("MEDIA_CACHE_SIZE", "2048"))
+
+# Worker processes that run yt-dlp, this many extractions or downloads run
+# at once.
+YTDLP_WORKERS = int(getenv("YTDLP_WORKERS", "2"))
+
 
 # Telegram audio  and video file size limit
 
@@ -200,11 +220,6 @@ LOG = 2
 LOG_FILE_NAME = "logs.txt"
 adminlist = {}
 lyrical = {}
-chatstats = {}
-userstats = {}
-clean = {}
-
-autoclean = []
 
 
 # Images